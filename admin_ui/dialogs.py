@@ -13,6 +13,21 @@ from admin_ui.widgets import WaveformWidget
 from extensions import db
 from musicquiz.models import Question
 from musicquiz.services.file_import_service import import_song_file, scan_mp3_folder
+from musicquiz.services.question_repository import get_question
+from musicquiz.services.question_service import get_question_details
+
+
+def _alias_editor(aliases, field):
+    """Prihvaćeni aliasi polja, jedan po retku."""
+    box = QtWidgets.QPlainTextEdit()
+    box.setPlainText("\n".join(aliases.get(field, [])))
+    box.setPlaceholderText("Jedan alias po retku")
+    box.setFixedHeight(60)
+    return box
+
+
+def _alias_lines(box):
+    return [line.strip() for line in box.toPlainText().splitlines() if line.strip()] if box else []
 
 
 class CreateQuizDialog(QtWidgets.QDialog):
@@ -281,8 +296,14 @@ class AudioQuestionEditorDialog(QtWidgets.QDialog):
         self._duration.setRange(5, 120)
         self._duration.setValue(float(data.get("duration", 30)))
 
+        aliases = data.get("aliases", {})
+        self._artist_aliases = _alias_editor(aliases, "artist")
+        self._title_aliases = _alias_editor(aliases, "title")
+
         layout.addRow("Izvodac", self._artist)
+        layout.addRow("Aliasi izvodaca", self._artist_aliases)
         layout.addRow("Naslov", self._title)
+        layout.addRow("Aliasi naslova", self._title_aliases)
         layout.addRow("Start", self._start)
         layout.addRow("Trajanje", self._duration)
 
@@ -507,11 +528,14 @@ class AudioQuestionEditorDialog(QtWidgets.QDialog):
 
         self._extra_q = None
         self._extra_a = None
+        self._extra_aliases = None
         if data["type"] == "simultaneous":
             self._extra_q = QtWidgets.QLineEdit(data.get("extra_q", ""))
             self._extra_a = QtWidgets.QLineEdit(data.get("extra_a", ""))
+            self._extra_aliases = _alias_editor(aliases, "extra")
             layout.addRow("Extra pitanje", self._extra_q)
             layout.addRow("Extra odgovor", self._extra_a)
+            layout.addRow("Aliasi extra odgovora", self._extra_aliases)
 
         self._buttons = QtWidgets.QDialogButtonBox(
             QtWidgets.QDialogButtonBox.Save | QtWidgets.QDialogButtonBox.Cancel
@@ -532,14 +556,22 @@ class AudioQuestionEditorDialog(QtWidgets.QDialog):
         new_extra_a = self._extra_a.text().strip() if self._extra_a else ""
         new_round = int(self._round_combo.currentText())
         new_position = int(self._position_spin.value())
+        new_aliases = {
+            "artist": _alias_lines(self._artist_aliases),
+            "title": _alias_lines(self._title_aliases),
+            "extra": _alias_lines(self._extra_aliases),
+        }
 
         def _update():
-            question = db.session.get(Question, self._data["id"])
+            question = get_question(self._data["id"])
             if not question:
                 return
             if question.round_number != new_round or question.position != new_position:
                 self._reposition_question(question, new_round, new_position)
             question.duration = new_duration
+            details = get_question_details(question)
+            if details:
+                details.set_aliases(new_aliases)
             if question.type == "audio" and question.song:
                 question.song.artist = new_artist
                 question.song.title = new_title
@@ -631,12 +663,15 @@ class TextQuestionEditorDialog(QtWidgets.QDialog):
         layout.addRow("Pitanje", self._question_text)
 
         self._answer_text = None
+        self._answer_aliases = None
         self._choices_box = None
         self._correct_spin = None
 
         if data["type"] == "text":
             self._answer_text = QtWidgets.QLineEdit(data.get("answer_text", ""))
+            self._answer_aliases = _alias_editor(data.get("aliases", {}), "title")
             layout.addRow("Tocan odgovor", self._answer_text)
+            layout.addRow("Aliasi odgovora", self._answer_aliases)
         else:
             self._choices_box = QtWidgets.QPlainTextEdit()
             choices = data.get("choices", [])
@@ -668,6 +703,7 @@ class TextQuestionEditorDialog(QtWidgets.QDialog):
         new_position = int(self._position_spin.value())
 
         new_answer = self._answer_text.text().strip() if self._answer_text else ""
+        new_answer_aliases = _alias_lines(self._answer_aliases)
         new_choices = []
         new_correct = 0
         if self._choices_box:
@@ -679,7 +715,7 @@ class TextQuestionEditorDialog(QtWidgets.QDialog):
             new_correct = max(0, int(self._correct_spin.value()) - 1) if self._correct_spin else 0
 
         def _update():
-            question = db.session.get(Question, self._data["id"])
+            question = get_question(self._data["id"])
             if not question:
                 return
             if question.round_number != new_round or question.position != new_position:
@@ -688,6 +724,7 @@ class TextQuestionEditorDialog(QtWidgets.QDialog):
             if question.type == "text" and question.text:
                 question.text.question_text = text
                 question.text.answer_text = new_answer
+                question.text.set_aliases({"title": new_answer_aliases})
             elif question.type == "text_multiple" and question.text_multiple:
                 question.text_multiple.question_text = text
                 question.text_multiple.set_choices(new_choices)
@@ -1,3 +1,4 @@
+import math
 import os
 
 from PySide6 import QtCore, QtGui, QtMultimedia, QtWidgets
@@ -7,6 +8,7 @@ from admin_ui.utils import ensure_videos_dir
 from config import Config
 from extensions import db
 from musicquiz.models import Answer, Question, Quiz
+from musicquiz.services.question_repository import questions_for_round
 from musicquiz.services.question_service import get_question_display
 
 
@@ -17,9 +19,16 @@ class _TimerRingWidget(QtWidgets.QWidget):
         self._total = None
         self._label = ""
         self._drain = False
+        # Rok faze (serversko vrijeme) - prsten se sam odbrojava prema clock()
+        self._deadline = None
+        self._clock = None
+        self._frame_timer = QtCore.QTimer(self)
+        self._frame_timer.setInterval(250)
+        self._frame_timer.timeout.connect(self._tick_deadline)
         self.setFixedSize(60, 60)
 
     def set_time(self, remaining, total, label=None, drain=None):
+        self._stop_deadline()
         self._remaining = remaining
         self._total = total
         if label is not None:
@@ -28,11 +37,39 @@ class _TimerRingWidget(QtWidgets.QWidget):
             self._drain = bool(drain)
         self.update()
 
+    def set_deadline(self, deadline, total, clock, label=None, drain=None):
+        """Odbrojava lokalno do deadline (clock() je serversko vrijeme u sekundama)."""
+        self._deadline = float(deadline)
+        self._clock = clock
+        self._total = total
+        if label is not None:
+            self._label = label
+        if drain is not None:
+            self._drain = bool(drain)
+        self._tick_deadline()
+        if self._deadline is not None and not self._frame_timer.isActive():
+            self._frame_timer.start()
+
     def set_idle(self):
+        self._stop_deadline()
         self._remaining = None
         self._total = None
         self.update()
 
+    def _stop_deadline(self):
+        self._deadline = None
+        if self._frame_timer.isActive():
+            self._frame_timer.stop()
+
+    def _tick_deadline(self):
+        if self._deadline is None:
+            return
+        left = max(0.0, self._deadline - self._clock())
+        self._remaining = int(math.ceil(left - 0.001))
+        if left <= 0:
+            self._stop_deadline()
+        self.update()
+
     def paintEvent(self, _event):
         painter = QtGui.QPainter(self)
         painter.setRenderHint(QtGui.QPainter.Antialiasing)
@@ -66,6 +103,8 @@ class _TimerRingWidget(QtWidgets.QWidget):
 
 
 class LiveTabMixin:
+    PHASE_TIMER_LABELS = {"countdown": "COUNTDOWN", "question": "TIME", "answer": "ANSWER"}
+
     def _graphics_path(self, name):
         base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
         return os.path.join(base_dir, "assets", "graphics", name)
@@ -126,6 +165,17 @@ class LiveTabMixin:
         self.pause_btn.setEnabled(False)
         top.addWidget(self.pause_btn)
 
+        self.skip_btn = QtWidgets.QPushButton("Skip")
+        self.skip_btn.setToolTip("Odmah zavrsi trenutnu fazu (odbrojavanje, pitanje ili prikaz odgovora)")
+        self.skip_btn.clicked.connect(self.skip_phase)
+        self.skip_btn.setEnabled(False)
+        top.addWidget(self.skip_btn)
+
+        self.abort_btn = QtWidgets.QPushButton("Stop Round")
+        self.abort_btn.clicked.connect(self.abort_round)
+        self.abort_btn.setEnabled(False)
+        top.addWidget(self.abort_btn)
+
         grading_group = QtWidgets.QGroupBox()
         grading_group.setProperty("panel", True)
         grading_group.setProperty("watermark", "list")
@@ -337,7 +387,7 @@ class LiveTabMixin:
         url = f"http://localhost:{self.port_input.value()}"
         self.last_connect_url = url
         try:
-            self.sio.connect(url, wait_timeout=5)
+            self.sio.connect(url, wait_timeout=5, auth={"launcher_token": self.launcher_token})
         except Exception as exc:
             self.signals.live_status.emit("Disconnected")
             self._store_log("socket", f"connect_failed:{url}:{exc}")
@@ -413,11 +463,7 @@ class LiveTabMixin:
             quiz = Quiz.query.filter_by(is_active=True).first()
             if not quiz:
                 return []
-            questions = Question.query.filter_by(
-                quiz_id=quiz.id,
-                round_number=round_num
-            ).order_by(Question.position).all()
-            return [get_question_display(q) for q in questions]
+            return [get_question_display(q) for q in questions_for_round(quiz.id, round_num)]
 
         questions = self.with_app(_fetch)
 
@@ -475,6 +521,19 @@ class LiveTabMixin:
         self.sio.emit("admin_toggle_pause", {"paused": not self.is_paused})
         self._store_log("ui", f"toggle_pause:{not self.is_paused}")
 
+    def skip_phase(self):
+        if self.safe_emit("admin_skip_phase", {}):
+            self._store_log("ui", "skip_phase")
+
+    def abort_round(self):
+        confirm = QtWidgets.QMessageBox.question(
+            self, "Live", "Prekinuti rundu? Runda se nece zavrsno bodovati."
+        )
+        if confirm != QtWidgets.QMessageBox.Yes:
+            return
+        if self.safe_emit("admin_abort_round", {}):
+            self._store_log("ui", "abort_round")
+
     def unlock_registrations(self):
         if not self.sio_connected:
             QtWidgets.QMessageBox.warning(self, "Live", "Niste spojeni na server.")
@@ -488,6 +547,8 @@ class LiveTabMixin:
         self.is_paused = paused
         self.pause_btn.setEnabled(self.sio_connected)
         self.pause_btn.setText("Resume" if paused else "Pause")
+        self.skip_btn.setEnabled(self.sio_connected)
+        self.abort_btn.setEnabled(self.sio_connected)
 
     def update_live_status(self, text):
         self.live_status_label.setText(text)
@@ -582,14 +643,19 @@ class LiveTabMixin:
         self.handle_live_media(data)
         self._store_log("socket", f"play_audio:{data.get('id')}")
 
-    def _on_timer_update_signal(self, data):
-        remaining = data.get("remaining")
-        total = data.get("total")
-        self._log_timer_update(remaining, total, data)
-        self._set_last_event("timer_update")
-        if getattr(self, "is_round_countdown", False):
+    def _on_quiz_phase_signal(self, data):
+        """Faza runde sa servera: prsten odbrojava lokalno do roka (pauza šalje novi rok)."""
+        state = data.get("state")
+        self._log_socket_event("quiz_phase", data)
+        self._set_last_event(f"quiz_phase:{state}")
+        label = self.PHASE_TIMER_LABELS.get(state)
+        if self.countdown_timer.isActive():
+            self.countdown_timer.stop()
+        self.is_round_countdown = state == "countdown"
+        if label is None:
+            self._clear_timer_display()
             return
-        self.update_live_timer(remaining, total, source="server", label="TIME")
+        self.update_live_deadline(data.get("deadline"), data.get("remaining"), data.get("duration"), label)
 
     def _on_tv_start_timer_signal(self, data):
         self._log_socket_event("tv_start_timer", data)
@@ -633,15 +699,6 @@ class LiveTabMixin:
         summary = self._summarize_payload(payload)
         self._store_log("socket", f"recv:{name}:{summary}")
 
-    def _log_timer_update(self, remaining, total, payload):
-        try:
-            remaining_val = int(float(remaining))
-        except (TypeError, ValueError):
-            return
-        if remaining_val <= 5:
-            summary = self._summarize_payload(payload)
-            self._store_log("socket", f"recv:timer_update:{summary}")
-
     def _summarize_payload(self, payload, max_len=200):
         if payload is None:
             return "None"
@@ -677,9 +734,18 @@ class LiveTabMixin:
             self.player_row_map[name] = row
 
     def update_leaderboard(self, data):
+        """Primjenjuje leaderboard_snapshot ({scores}) ili leaderboard_patch ({changes, removed}), kao screen.js."""
         if not data:
             return
-        for name, score in data.items():
+        if "scores" in data:
+            scores = data.get("scores") or {}
+            removed = [name for name in self.player_row_map if name not in scores]
+        else:
+            scores = data.get("changes") or {}
+            removed = data.get("removed") or []
+        for name in removed:
+            self._remove_player_row(name)
+        for name, score in scores.items():
             row = self.player_row_map.get(name)
             if row is None:
                 continue
@@ -687,10 +753,128 @@ class LiveTabMixin:
             if score_item:
                 score_item.setText(str(score))
 
-    def update_grading(self, rows):
-        self.grading_rows = rows or []
+    def _remove_player_row(self, name):
+        row = self.player_row_map.pop(name, None)
+        if row is None:
+            return
+        self.players_table.removeRow(row)
+        # Redovi ispod obrisanog pomaknuli su se za jedan prema gore
+        for other, other_row in self.player_row_map.items():
+            if other_row > row:
+                self.player_row_map[other] = other_row - 1
+
+    def update_grading(self, snapshot):
+        """Puni snapshot (admin_grading_snapshot) - jedino mjesto gdje se tablica gradi ispočetka."""
+        snapshot = snapshot or {}
+        self.grading_scope_round = snapshot.get("round")
+        self.grading_rows = {row.get("id"): row for row in snapshot.get("rows") or []}
         self.apply_grading_filter()
 
+    def apply_grading_delta(self, delta):
+        """Spaja admin_grading_delta u postojeću tablicu (bez ponovnog crtanja)."""
+        delta = delta or {}
+        filters = self._grading_filters()
+        for answer_id in delta.get("deletes") or []:
+            self.grading_rows.pop(answer_id, None)
+            self._remove_grading_table_row(answer_id)
+        for row in delta.get("upserts") or []:
+            scope = self.grading_scope_round
+            if scope is not None and row.get("round_number") != scope:
+                continue
+            answer_id = row.get("id")
+            previous = self.grading_rows.get(answer_id)
+            self.grading_rows[answer_id] = row
+            item = self.grading_items.get(answer_id)
+            matches = self._grading_row_matches(row, filters)
+            if item is not None and matches and previous and \
+                    self._grading_sort_key(previous) == self._grading_sort_key(row):
+                self._fill_grading_table_row(item.row(), row)
+                continue
+            self._remove_grading_table_row(answer_id)
+            if matches:
+                self._insert_grading_table_row(row)
+
+    def _grading_sort_key(self, row):
+        return (
+            row.get("round_number") or 0,
+            row.get("position") or 0,
+            str(row.get("player_name") or "").lower(),
+        )
+
+    def _grading_filters(self):
+        return {
+            "player": self.filter_player.text().strip().lower(),
+            "round": self.filter_round.text().strip().lower(),
+            "position": self.filter_position.text().strip().lower(),
+            "artist": self.filter_artist.text().strip().lower(),
+            "title": self.filter_title.text().strip().lower(),
+            "extra": "",
+        }
+
+    def _grading_row_matches(self, row, filters):
+        if filters["player"] and filters["player"] not in str(row.get("player_name", "")).lower():
+            return False
+        if filters["round"] and filters["round"] not in str(row.get("round_number", "")).lower():
+            return False
+        if filters["position"] and filters["position"] not in str(row.get("position", "")).lower():
+            return False
+        if filters["artist"] and filters["artist"] not in str(row.get("artist_guess", "")).lower():
+            return False
+        if filters["title"] and filters["title"] not in str(row.get("title_guess", "")).lower():
+            return False
+        return True
+
+    def _fill_grading_table_row(self, table_row, row):
+        def _format_points(value):
+            try:
+                num = float(value)
+            except (TypeError, ValueError):
+                num = 0.0
+            return f"{num:g}"
+
+        def _guess_with_points(guess, points):
+            text = str(guess or "")
+            return f"{text} ({_format_points(points)})".strip()
+
+        values = [
+            row.get("id"),
+            row.get("round_number"),
+            row.get("position"),
+            row.get("player_name"),
+            _guess_with_points(row.get("artist_guess"), row.get("artist_points")),
+            _guess_with_points(row.get("title_guess"), row.get("title_points")),
+        ]
+        for col, value in enumerate(values):
+            item = self.grading_table.item(table_row, col)
+            if item is None:
+                item = QtWidgets.QTableWidgetItem()
+                self.grading_table.setItem(table_row, col, item)
+                if col == 0:
+                    self.grading_items[row.get("id")] = item
+            item.setText(str(value))
+
+    def _insert_grading_table_row(self, row):
+        key = self._grading_sort_key(row)
+        table_row = self.grading_table.rowCount()
+        # Binarno traženje sortiranog mjesta (tablica je sortirana po istom ključu)
+        lo, hi = 0, self.grading_table.rowCount()
+        while lo < hi:
+            mid = (lo + hi) // 2
+            mid_item = self.grading_table.item(mid, 0)
+            mid_row = self.grading_rows.get(int(mid_item.text())) if mid_item else None
+            if mid_row is not None and self._grading_sort_key(mid_row) <= key:
+                lo = mid + 1
+            else:
+                hi = mid
+        table_row = lo
+        self.grading_table.insertRow(table_row)
+        self._fill_grading_table_row(table_row, row)
+
+    def _remove_grading_table_row(self, answer_id):
+        item = self.grading_items.pop(answer_id, None)
+        if item is not None and item.row() >= 0:
+            self.grading_table.removeRow(item.row())
+
     def set_score(self, value, score_type):
         row = self.grading_table.currentRow()
         if row < 0:
@@ -721,57 +905,16 @@ class LiveTabMixin:
             self.with_app(_update)
 
     def apply_grading_filter(self):
-        def _format_points(value):
-            try:
-                num = float(value)
-            except (TypeError, ValueError):
-                num = 0.0
-            return f"{num:g}"
-
-        def _guess_with_points(guess, points):
-            text = str(guess or "")
-            return f"{text} ({_format_points(points)})".strip()
-
-        filters = {
-            "player": self.filter_player.text().strip().lower(),
-            "round": self.filter_round.text().strip().lower(),
-            "position": self.filter_position.text().strip().lower(),
-            "artist": self.filter_artist.text().strip().lower(),
-            "title": self.filter_title.text().strip().lower(),
-            "extra": "",
-        }
+        filters = self._grading_filters()
         self.grading_table.setRowCount(0)
-        sorted_rows = sorted(
-            self.grading_rows,
-            key=lambda r: (
-                r.get("round_number") or 0,
-                r.get("position") or 0,
-                str(r.get("player_name") or "").lower(),
-            ),
-        )
+        self.grading_items = {}
+        sorted_rows = sorted(self.grading_rows.values(), key=self._grading_sort_key)
         for row in sorted_rows:
-            if filters["player"] and filters["player"] not in str(row.get("player_name", "")).lower():
-                continue
-            if filters["round"] and filters["round"] not in str(row.get("round_number", "")).lower():
-                continue
-            if filters["position"] and filters["position"] not in str(row.get("position", "")).lower():
-                continue
-            if filters["artist"] and filters["artist"] not in str(row.get("artist_guess", "")).lower():
-                continue
-            if filters["title"] and filters["title"] not in str(row.get("title_guess", "")).lower():
+            if not self._grading_row_matches(row, filters):
                 continue
-            values = [
-                row.get("id"),
-                row.get("round_number"),
-                row.get("position"),
-                row.get("player_name"),
-                _guess_with_points(row.get("artist_guess"), row.get("artist_points")),
-                _guess_with_points(row.get("title_guess"), row.get("title_points")),
-            ]
             table_row = self.grading_table.rowCount()
             self.grading_table.insertRow(table_row)
-            for col, value in enumerate(values):
-                self.grading_table.setItem(table_row, col, QtWidgets.QTableWidgetItem(str(value)))
+            self._fill_grading_table_row(table_row, row)
 
     def lock_player(self, name):
         if not self.sio_connected:
@@ -996,10 +1139,7 @@ class LiveTabMixin:
             if not quiz:
                 return []
 
-            questions = Question.query.filter_by(
-                quiz_id=quiz.id,
-                round_number=round_num
-            ).order_by(Question.position).all()
+            questions = questions_for_round(quiz.id, round_num)
 
             entries = []
             for q in questions:
@@ -1247,6 +1387,23 @@ class LiveTabMixin:
             if hasattr(self, "live_display_timer") and not self.live_display_timer.isActive():
                 self.live_display_timer.start()
 
+    def update_live_deadline(self, deadline, remaining, total, label="TIME"):
+        """Kao update_live_timer, ali prema roku faze; bez roka (pauza) prsten stoji na remaining."""
+        if deadline is None:
+            self.update_live_timer(remaining, total, source="server", label=label)
+            return
+        try:
+            total_val = max(1, int(float(total)))
+        except (TypeError, ValueError):
+            total_val = max(1, int(float(remaining or 1)))
+        self._live_timer_label = label
+        self._live_timer_drain = (label == "COUNTDOWN")
+        self.live_timer_total = total_val
+        if hasattr(self, "live_display_timer") and self.live_display_timer.isActive():
+            self.live_display_timer.stop()
+        if hasattr(self, "timer_ring"):
+            self.timer_ring.set_deadline(deadline, total_val, self.server_now, label, self._live_timer_drain)
+
     def _on_live_follow_toggled(self, checked):
         self.live_follow_server = bool(checked)
         if hasattr(self, "win_follow"):
@@ -22,7 +22,8 @@ from musicquiz.models import (
     Video,
 )
 from musicquiz.services.file_import_service import import_song_file, scan_mp3_folder
-from musicquiz.services.question_service import get_question_display
+from musicquiz.services.question_repository import get_question, questions_for_round
+from musicquiz.services.question_service import get_question_details, get_question_display
 
 
 class _RepoScanWorker(QtCore.QObject):
@@ -439,9 +440,7 @@ class SetupTabMixin:
         round_num = int(self.round_combo.currentText())
 
         def _fetch():
-            questions = Question.query.filter_by(quiz_id=quiz_id, round_number=round_num) \
-                .order_by(Question.position).all()
-            return [get_question_display(q) for q in questions]
+            return [get_question_display(q) for q in questions_for_round(quiz_id, round_num)]
 
         questions = self.with_app(_fetch)
         self.questions_list.clear()
@@ -585,6 +584,7 @@ class SetupTabMixin:
 
         self.with_app(_import)
         self.refresh_questions()
+        self._notify_questions_changed()
 
     def browse_file(self, target, qtype):
         if qtype == "video":
@@ -626,6 +626,7 @@ class SetupTabMixin:
 
         self.with_app(_create)
         self.refresh_questions()
+        self._notify_questions_changed()
 
     def create_multiple_question(self):
         quiz_id = self._get_active_quiz_id()
@@ -664,6 +665,7 @@ class SetupTabMixin:
 
         self.with_app(_create)
         self.refresh_questions()
+        self._notify_questions_changed()
 
     def create_video_question(self):
         quiz_id = self._get_active_quiz_id()
@@ -699,6 +701,7 @@ class SetupTabMixin:
 
         self.with_app(_create)
         self.refresh_questions()
+        self._notify_questions_changed()
 
     def create_sim_question(self):
         quiz_id = self._get_active_quiz_id()
@@ -736,6 +739,7 @@ class SetupTabMixin:
 
         self.with_app(_create)
         self.refresh_questions()
+        self._notify_questions_changed()
 
     def selected_question_id(self):
         item = self.questions_list.currentItem()
@@ -795,6 +799,7 @@ class SetupTabMixin:
 
         self.with_app(_move)
         self.refresh_questions()
+        self._notify_questions_changed()
         self._select_question_by_id(qid)
 
     def delete_question_by_id(self, qid):
@@ -802,13 +807,14 @@ class SetupTabMixin:
             return
 
         def _delete():
-            question = db.session.get(Question, qid)
+            question = get_question(qid)
             if question:
                 db.session.delete(question)
                 db.session.commit()
 
         self.with_app(_delete)
         self.refresh_questions()
+        self._notify_questions_changed(qid)
 
     def _build_question_item(self, data):
         card = QtWidgets.QFrame()
@@ -895,7 +901,7 @@ class SetupTabMixin:
             return
 
         def _fetch():
-            q = db.session.get(Question, qid)
+            q = get_question(qid)
             if not q:
                 return None
 
@@ -943,6 +949,10 @@ class SetupTabMixin:
                     "correct_index": int((q.text_multiple.correct_index or 0) + 1),
                 })
 
+            details = get_question_details(q)
+            if details:
+                data["aliases"] = details.get_aliases()
+
             return data
 
         data = self.with_app(_fetch)
@@ -956,7 +966,7 @@ class SetupTabMixin:
                 with_app=self.with_app,
                 get_round_count=self._get_round_count,
                 reposition_question=self._reposition_question,
-                on_saved=self._on_questions_changed,
+                on_saved=lambda: self._on_question_edited(qid),
                 prepare_animation=self._prepare_dialog_animation,
             )
         else:
@@ -966,7 +976,7 @@ class SetupTabMixin:
                 with_app=self.with_app,
                 get_round_count=self._get_round_count,
                 reposition_question=self._reposition_question,
-                on_saved=self._on_questions_changed,
+                on_saved=lambda: self._on_question_edited(qid),
                 prepare_animation=self._prepare_dialog_animation,
             )
         dialog.exec()
@@ -988,3 +998,18 @@ class SetupTabMixin:
     def _on_questions_changed(self):
         self._load_quizzes()
         self.refresh_questions()
+        self._notify_questions_changed()
+
+    def _on_question_edited(self, qid):
+        self._load_quizzes()
+        self.refresh_questions()
+        self._notify_questions_changed(qid)
+
+    def _notify_questions_changed(self, qid=None):
+        """
+        Server (zaseban proces) pamti prevedene runde (RoundPayloadCache), a uz
+        id i bodove po točnom odgovoru - javi mu svako dodavanje, brisanje,
+        premještanje i izmjenu pitanja.
+        """
+        if hasattr(self, "safe_emit"):
+            self.safe_emit("admin_question_updated", {"id": qid} if qid else {})
@@ -22,11 +22,12 @@ class UiSignals(QtCore.QObject):
     live_status = QtCore.Signal(str)
     players = QtCore.Signal(list)
     leaderboard = QtCore.Signal(dict)
-    grading = QtCore.Signal(list)
+    grading = QtCore.Signal(dict)
+    grading_delta = QtCore.Signal(dict)
     pause_state = QtCore.Signal(bool)
     round_countdown = QtCore.Signal(dict)
     play_audio = QtCore.Signal(dict)
-    timer_update = QtCore.Signal(dict)
+    quiz_phase = QtCore.Signal(dict)
     tv_start_timer = QtCore.Signal(dict)
     show_correct = QtCore.Signal(dict)
     round_finished = QtCore.Signal(dict)
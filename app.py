@@ -5,25 +5,48 @@ from extensions import db, socketio
 from musicquiz.routes import register_routes
 from musicquiz.sockets import register_sockets
 from musicquiz import models as models_module
+from musicquiz.services.schema_migrations import run_migrations
+from musicquiz.services.sqlite_profile import configure_engine, engine_options
+from musicquiz.services.score_ledger import rebuild_ledger, start_ledger_writer
+from musicquiz.services.answer_buffer import start_answer_writer
+from musicquiz.services.provisional_grading import start_provisional_grader
 import os
 
 BASE_DIR = os.path.abspath(os.path.dirname(__file__))
 
-def create_app():
+def create_app(server=True):
+    """
+    server=False: samo pristup bazi (PySide launcher pokreće server kao zaseban
+    proces). Migracije se rade u oba načina jer launcher koristi bazu prije
+    starta servera; writer lock, punjenje ledgera i pozadinske dretve smiju
+    postojati samo u procesu servera.
+    """
     app = Flask(
         __name__,
         template_folder=os.path.join(BASE_DIR, "musicquiz", "templates"),
         static_folder=os.path.join(BASE_DIR, "musicquiz", "static")
     )
     app.config.from_object(Config)
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = engine_options(
+        app.config["SQLALCHEMY_DATABASE_URI"], app.config.get("SQLALCHEMY_ENGINE_OPTIONS")
+    )
     db.init_app(app)
     socketio.init_app(app, cors_allowed_origins="*", async_mode="threading")
     with app.app_context():
+        # PRAGMA-e i writer lock prije prve konekcije
+        configure_engine(db.engine, serialize_writes=None if server else False)
         _ = models_module.__name__
         db.create_all()
-        print("Baza podataka i tablice su uspješno kreirani!")
+        run_migrations()
+        if server:
+            print("Baza podataka i tablice su uspješno kreirani!")
+            rebuild_ledger()
     register_routes(app)
     register_sockets(socketio)
+    if server:
+        start_ledger_writer(socketio, app)
+        start_answer_writer(socketio, app)
+        start_provisional_grader(socketio, app)
     return app
 
 if __name__ == "__main__":
@@ -10,6 +10,7 @@ class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
     # Optional engine options for better PostgreSQL behavior under concurrency
+    # (za SQLite ih create_app zamjenjuje profilom iz sqlite_profile.engine_options)
     DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
     DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
     SQLALCHEMY_ENGINE_OPTIONS = {
@@ -18,6 +19,54 @@ class Config:
         "max_overflow": DB_MAX_OVERFLOW,
     }
 
+    # Koliko često (sekunde) se bodovi iz memorije zapisuju u Player.score
+    SCORE_FLUSH_INTERVAL = float(os.getenv("SCORE_FLUSH_INTERVAL", 2.0))
+
+    # Prozor (ms) u kojem se promjene ljestvice spajaju u jedan leaderboard_patch
+    LEADERBOARD_COALESCE_MS = int(os.getenv("LEADERBOARD_COALESCE_MS", 250))
+
+    # Koliko često (ms) se predani odgovori iz memorije zapisuju u bazu
+    ANSWER_FLUSH_MS = int(os.getenv("ANSWER_FLUSH_MS", 200))
+
+    # Broj normaliziranih stringova (odgovori/točni odgovori) koje bodovanje pamti
+    NORMALIZE_CACHE_SIZE = int(os.getenv("NORMALIZE_CACHE_SIZE", 8192))
+
+    # Sličnost odgovora pri bodovanju: "difflib" (referentna) ili "indel" (LCS predfiltar, isti bodovi kao difflib)
+    SIMILARITY_BACKEND = os.getenv("SIMILARITY_BACKEND", "difflib")
+
+    # Za koliko pitanja (točnih odgovora) se pamte već izračunati bodovi pokušaja
+    GRADE_CACHE_QUESTIONS = int(os.getenv("GRADE_CACHE_QUESTIONS", 512))
+
+    # Process pool za finalize_round: broj procesa (0 = isključeno) i minimalan broj odgovora
+    GRADING_PROCESSES = int(os.getenv("GRADING_PROCESSES", 0))
+    GRADING_POOL_MIN_ANSWERS = int(os.getenv("GRADING_POOL_MIN_ANSWERS", 3000))
+
+    # Privremeno bodovanje pri predaji (pozadinska dretva); pri zaključavanju se boduju samo promijenjeni odgovori
+    PROVISIONAL_GRADING = os.getenv("PROVISIONAL_GRADING", "0").lower() in ("1", "true", "yes")
+
+    # Ručno dan 1.0 uči pokušaj kao prihvaćeni alias točnog odgovora (admin_update_score);
+    # zadano isključeno - admin ga može uključiti po izmjeni (learn_alias) ili ovdje za cijelu večer
+    LEARN_ALIASES = os.getenv("LEARN_ALIASES", "0").lower() in ("1", "true", "yes")
+
+    # SQLite profil (sqlite_profile): WAL journal, synchronous, busy_timeout (ms), cache (KiB) i mmap (bajtovi)
+    SQLITE_WAL = os.getenv("SQLITE_WAL", "1").lower() in ("1", "true", "yes")
+    SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", 5000))
+    SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", 20000))
+    SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", 256 * 1024 * 1024))
+
+    # Pisanja iz socket dretvi idu jedno po jedno kroz procesni lock (čekanje najviše ms)
+    SQLITE_SERIALIZE_WRITES = os.getenv("SQLITE_SERIALIZE_WRITES", "1").lower() in ("1", "true", "yes")
+    SQLITE_WRITE_LOCK_TIMEOUT_MS = int(os.getenv("SQLITE_WRITE_LOCK_TIMEOUT_MS", 10000))
+
+    # Token kojim se lokalni launcher prijavljuje kao admin na socketu (launcher ga generira pri startu servera);
+    # prazno = samo prijavljena web sesija je admin
+    LAUNCHER_TOKEN = os.getenv("MQ_LAUNCHER_TOKEN", "")
+
+    # Ključ za TV ekran (/screen?key=...): samo takav ekran ili admin sesija ulazi u sobu "screens",
+    # koja dobiva i odgovore tijekom pitanja; prazno = samo prijavljena admin sesija
+    SCREEN_TOKEN = os.getenv("MQ_SCREEN_TOKEN", "")
+
     BASE_DIR = os.path.abspath(os.path.dirname(__file__))
     SONGS_DIR = os.path.join(BASE_DIR, "songs")
     IMAGES_DIR = os.path.join(BASE_DIR, "images")
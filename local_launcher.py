@@ -1,7 +1,9 @@
 import os
+import secrets
 import subprocess
 import sys
 import threading
+import time
 import socketio
 from PySide6 import QtCore, QtGui, QtMultimedia, QtWidgets
 from PySide6.QtCore import QUrl, QSettings
@@ -24,9 +26,18 @@ class AdminLauncher(QtWidgets.QMainWindow, SetupTabMixin, LiveTabMixin, Database
         super().__init__()
         self.settings = QSettings("RockQuiz", "Admin")
         self.ui_mode = str(self.settings.value("ui/mode", "dark"))
-        self.app = create_app()
+        # Pristup bazi i migracije; writer lock i pozadinske dretve radi proces servera
+        self.app = create_app(server=False)
         self.sio = socketio.Client(reconnection=True)
+        # Admin prava na socketu: server pokrenut iz launchera prihvaća ovaj token
+        self.launcher_token = secrets.token_urlsafe(32)
+        # Ključ s kojim TV ekran (/screen?key=...) ulazi u sobu "screens"
+        self.screen_token = secrets.token_urlsafe(16)
         self.sio_connected = False
+        self.leaderboard_seq = 0
+        # Pomak sata servera (time_sync): server_now() = time.time() + offset
+        self.server_clock_offset = 0.0
+        self.server_clock_rtt = None
         self.force_paused = False
         self.is_paused = False
         self.registrations_open = False
@@ -35,7 +46,10 @@ class AdminLauncher(QtWidgets.QMainWindow, SetupTabMixin, LiveTabMixin, Database
         self.countdown_timer = QtCore.QTimer(self)
         self.countdown_timer.setInterval(1000)
         self.countdown_timer.timeout.connect(self._tick_countdown)
-        self.grading_rows = []
+        self.grading_rows = {}
+        self.grading_items = {}
+        self.grading_revision = 0
+        self.grading_scope_round = None
         self.player_row_map = {}
         self.player_status_cache = {}
         self.live_timer_remaining = None
@@ -86,8 +100,10 @@ class AdminLauncher(QtWidgets.QMainWindow, SetupTabMixin, LiveTabMixin, Database
             "admin_player_list_full",
             "admin_update_player_list",
             "admin_single_player_update",
-            "update_leaderboard",
-            "admin_receive_grading_data",
+            "leaderboard_snapshot",
+            "leaderboard_patch",
+            "admin_grading_snapshot",
+            "admin_grading_delta",
         }
 
         self.signals = UiSignals()
@@ -320,24 +336,50 @@ class AdminLauncher(QtWidgets.QMainWindow, SetupTabMixin, LiveTabMixin, Database
         self.signals.players.connect(self.update_players)
         self.signals.leaderboard.connect(self.update_leaderboard)
         self.signals.grading.connect(self.update_grading)
+        self.signals.grading_delta.connect(self.apply_grading_delta)
         self.signals.pause_state.connect(self.update_pause_button)
         if hasattr(self, "_on_quiz_pause_state_signal"):
             self.signals.pause_state.connect(self._on_quiz_pause_state_signal)
         self.signals.round_countdown.connect(self._on_round_countdown_signal)
         self.signals.play_audio.connect(self._on_play_audio_signal)
-        self.signals.timer_update.connect(self._on_timer_update_signal)
+        self.signals.quiz_phase.connect(self._on_quiz_phase_signal)
         self.signals.tv_start_timer.connect(self._on_tv_start_timer_signal)
         self.signals.show_correct.connect(self._on_show_correct_signal)
         self.signals.round_finished.connect(self._on_round_finished_signal)
         self.signals.single_player_update.connect(self._on_single_player_update_signal)
         self.signals.live_guard_blocked.connect(self._on_live_guard_blocked_signal)
 
+    def server_now(self):
+        return time.time() + self.server_clock_offset
+
+    def sync_server_clock(self, samples=5):
+        """time_sync handshake: pomak sata iz uzorka s najmanjim RTT-om."""
+        best = None
+        for _ in range(samples):
+            t0 = time.time()
+            try:
+                data = self.sio.call("time_sync", {"client_time": t0}, timeout=3)
+            except Exception:
+                continue
+            t1 = time.time()
+            if not data or data.get("server_time") is None:
+                continue
+            rtt = t1 - t0
+            if best is None or rtt < best[0]:
+                best = (rtt, float(data["server_time"]) - (t0 + t1) / 2.0)
+        if best is not None:
+            self.server_clock_rtt, self.server_clock_offset = best
+
     def _bind_socket_events(self):
         @self.sio.event
         def connect():
             self.sio_connected = True
             self.signals.live_status.emit("Connected")
+            self.sio.emit("admin_join")
             self.sio.emit("admin_live_arm", {"armed": True})
+            self.sio.emit("leaderboard_request_snapshot")
+            # sio.call čeka ack pa ne smije blokirati dretvu socket eventova
+            self.sio.start_background_task(self.sync_server_clock)
             self.server_starting = False
             QtCore.QTimer.singleShot(0, lambda: self._sync_server_buttons(True))
             QtCore.QTimer.singleShot(0, self.stop_connect_retry)
@@ -377,15 +419,42 @@ class AdminLauncher(QtWidgets.QMainWindow, SetupTabMixin, LiveTabMixin, Database
             self._log_socket_event("admin_update_player_list", players)
             self.signals.players.emit(players)
 
-        @self.sio.on("update_leaderboard")
-        def on_leaderboard(data):
-            self._log_socket_event("update_leaderboard", data)
+        @self.sio.on("leaderboard_snapshot")
+        def on_leaderboard_snapshot(data):
+            self._log_socket_event("leaderboard_snapshot", data)
+            self.leaderboard_seq = int((data or {}).get("seq") or 0)
+            self.signals.leaderboard.emit(data or {})
+
+        @self.sio.on("leaderboard_patch")
+        def on_leaderboard_patch(data):
+            self._log_socket_event("leaderboard_patch", data)
+            seq = int((data or {}).get("seq") or 0)
+            if seq <= self.leaderboard_seq:
+                return
+            if seq != self.leaderboard_seq + 1:
+                self.sio.emit("leaderboard_request_snapshot")
+                return
+            self.leaderboard_seq = seq
             self.signals.leaderboard.emit(data)
 
-        @self.sio.on("admin_receive_grading_data")
+        @self.sio.on("admin_grading_snapshot")
         def on_grading(data):
-            self._log_socket_event("admin_receive_grading_data", data)
-            self.signals.grading.emit(data)
+            self._log_socket_event("admin_grading_snapshot", data)
+            self.grading_revision = int((data or {}).get("revision") or 0)
+            self.signals.grading.emit(data or {})
+
+        @self.sio.on("admin_grading_delta")
+        def on_grading_delta(data):
+            self._log_socket_event("admin_grading_delta", data)
+            revision = int((data or {}).get("revision") or 0)
+            if revision <= self.grading_revision:
+                return
+            if revision != self.grading_revision + 1:
+                # Propuštena delta - zatraži novi snapshot za odabranu rundu
+                QtCore.QTimer.singleShot(0, self.refresh_live)
+                return
+            self.grading_revision = revision
+            self.signals.grading_delta.emit(data)
 
         @self.sio.on("admin_auto_run_ack")
         def on_auto_run_ack(data):
@@ -428,11 +497,13 @@ class AdminLauncher(QtWidgets.QMainWindow, SetupTabMixin, LiveTabMixin, Database
             QtCore.QTimer.singleShot(0, apply_pause)
 
 
-        @self.sio.on("timer_update")
-        def on_timer_update(data):
-            if data.get("phase") == "answer_display":
-                return
-            self.signals.timer_update.emit(data or {})
+        @self.sio.on("quiz_phase")
+        def on_quiz_phase(data):
+            self.signals.quiz_phase.emit(data or {})
+
+        @self.sio.on("quiz_state")
+        def on_quiz_state(data):
+            self.signals.quiz_phase.emit(data or {})
 
         @self.sio.on("tv_start_timer")
         def on_tv_timer(data):
@@ -535,6 +606,8 @@ class AdminLauncher(QtWidgets.QMainWindow, SetupTabMixin, LiveTabMixin, Database
         env["MQ_HOST"] = APP_HOST
         env["MQ_PORT"] = str(port)
         env["MQ_DEBUG"] = "0"
+        env["MQ_LAUNCHER_TOKEN"] = self.launcher_token
+        env["MQ_SCREEN_TOKEN"] = self.screen_token
 
         self.process = subprocess.Popen(
             [sys.executable, app_path],
@@ -651,7 +724,7 @@ class AdminLauncher(QtWidgets.QMainWindow, SetupTabMixin, LiveTabMixin, Database
 
     def _open_tv_screen(self):
         try:
-            url = "{0}/screen".format(self.address_text())
+            url = "{0}/screen?key={1}".format(self.address_text(), self.screen_token)
             QDesktopServices.openUrl(QUrl(url))
         except Exception:
             pass
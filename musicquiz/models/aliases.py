@@ -0,0 +1,47 @@
+import json
+from extensions import db
+
+ALIAS_FIELDS = ("artist", "title", "extra")
+
+
+class AcceptedAliasesMixin:
+    """
+    Prihvaćeni alternativni odgovori po polju ("artist", "title", "extra"),
+    npr. "B. Dugme" za "Bijelo Dugme". Spremaju se kao JSON, kao izbori u TextMultiple.
+    """
+    accepted_aliases = db.Column(db.Text, default="")
+
+    def get_aliases(self):
+        try:
+            aliases = json.loads(self.accepted_aliases) if self.accepted_aliases else {}
+        except Exception:
+            return {}
+        return {
+            field: [str(alias) for alias in aliases.get(field, []) if str(alias).strip()]
+            for field in ALIAS_FIELDS
+            if aliases.get(field)
+        }
+
+    def set_aliases(self, aliases):
+        cleaned = {}
+        for field in ALIAS_FIELDS:
+            values = []
+            for alias in (aliases or {}).get(field, []):
+                alias = str(alias).strip()
+                if alias and alias not in values:
+                    values.append(alias)
+            if values:
+                cleaned[field] = values
+        self.accepted_aliases = json.dumps(cleaned, ensure_ascii=False) if cleaned else ""
+
+    def add_alias(self, field, alias):
+        """Dodaje alias polju; False ako je prazan ili već postoji."""
+        alias = (alias or "").strip()
+        if field not in ALIAS_FIELDS or not alias:
+            return False
+        aliases = self.get_aliases()
+        if alias in aliases.get(field, []):
+            return False
+        aliases.setdefault(field, []).append(alias)
+        self.set_aliases(aliases)
+        return True
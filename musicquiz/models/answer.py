@@ -9,7 +9,7 @@ class Answer(db.Model):
     - Extra field (third answer field for simultaneous questions)
     """
     id = db.Column(db.Integer, primary_key=True)
-    player_name = db.Column(db.String(100), db.ForeignKey('player.name', ondelete='CASCADE'), nullable=False)
+    player_id = db.Column(db.Integer, db.ForeignKey('player.id', ondelete='CASCADE'), nullable=False)
     round_number = db.Column(db.Integer)
     question_id = db.Column(db.Integer, db.ForeignKey("question.id", ondelete="CASCADE"), nullable=False)
 
@@ -32,9 +32,9 @@ class Answer(db.Model):
     timestamp = db.Column(db.DateTime, server_default=db.func.now())  # Database timestamp
 
     __table_args__ = (
-        db.UniqueConstraint("player_name", "question_id", name="uq_answer_player_question"),
-        db.Index("ix_answer_round", "round_number"),
+        db.UniqueConstraint("player_id", "question_id", name="uq_answer_player_question"),
         db.Index("ix_answer_question", "question_id"),
-        db.Index("ix_answer_player", "player_name"),
+        # Bodovi po timu i rundi (aggregate_scores, verify); player_id sam pokriva i unique iznad
+        db.Index("ix_answer_player_round", "player_id", "round_number"),
     )
 
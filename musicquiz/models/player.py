@@ -3,7 +3,13 @@ import datetime
 
 class Player(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    name = db.Column(db.String(100), unique=True, nullable=False)
+    # Tim je prijava za jedan kviz; isti naziv sljedeći tjedan je novi red
+    quiz_id = db.Column(db.Integer, db.ForeignKey("quiz.id", ondelete="CASCADE"))
+    name = db.Column(db.String(100), nullable=False)
     pin = db.Column(db.String(4), nullable=False)
     score = db.Column(db.Float, default=0.0)
-    last_active = db.Column(db.DateTime, default=datetime.datetime.utcnow)
\ No newline at end of file
+    last_active = db.Column(db.DateTime, default=datetime.datetime.utcnow)
+
+    __table_args__ = (
+        db.UniqueConstraint("quiz_id", "name", name="uq_player_quiz_name"),
+    )
\ No newline at end of file
@@ -16,7 +16,6 @@ class Question(db.Model):
     simultaneous = db.relationship("SimultaneousQuestion", uselist=False, back_populates="question", cascade="all, delete-orphan")
 
     __table_args__ = (
+        # Pokriva i upite samo po quiz_id te (quiz_id, round_number) ORDER BY position
         db.UniqueConstraint("quiz_id", "round_number", "position", name="uq_question_quiz_round_position"),
-        db.Index("ix_question_quiz", "quiz_id"),
-        db.Index("ix_question_round", "round_number"),
     )
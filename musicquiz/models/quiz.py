@@ -6,4 +6,8 @@ class Quiz(db.Model):
     title = db.Column(db.String(100), nullable=False)
     event_date = db.Column(db.Date, default=datetime.date.today)    
     date_created = db.Column(db.DateTime, server_default=db.func.now())
-    is_active = db.Column(db.Boolean, default=False)
\ No newline at end of file
+    is_active = db.Column(db.Boolean, default=False)
+
+    __table_args__ = (
+        db.Index("ix_quiz_active", "is_active"),
+    )
\ No newline at end of file
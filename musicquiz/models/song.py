@@ -1,7 +1,8 @@
 from extensions import db
+from .aliases import AcceptedAliasesMixin
 
 
-class Song(db.Model):
+class Song(AcceptedAliasesMixin, db.Model):
     """Audio question details (linked to Question)."""
     id = db.Column(db.Integer, primary_key=True)
     question_id = db.Column(db.Integer, db.ForeignKey("question.id"), nullable=False, unique=True)
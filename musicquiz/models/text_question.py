@@ -1,7 +1,8 @@
 from extensions import db
+from .aliases import AcceptedAliasesMixin
 
 
-class TextQuestion(db.Model):
+class TextQuestion(AcceptedAliasesMixin, db.Model):
     """Text question details (linked to Question)."""
     id = db.Column(db.Integer, primary_key=True)
     question_id = db.Column(db.Integer, db.ForeignKey("question.id"), nullable=False, unique=True)
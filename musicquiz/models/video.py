@@ -1,7 +1,8 @@
 from extensions import db
+from .aliases import AcceptedAliasesMixin
 
 
-class Video(db.Model):
+class Video(AcceptedAliasesMixin, db.Model):
     """Video question details (linked to Question)."""
     id = db.Column(db.Integer, primary_key=True)
     question_id = db.Column(db.Integer, db.ForeignKey("question.id"), nullable=False, unique=True)
@@ -12,7 +12,7 @@ from flask import (
 
 from werkzeug.utils import secure_filename
 
-from extensions import db
+from extensions import db, socketio
 from musicquiz.models import (
     Quiz,
     Question,
@@ -24,7 +24,13 @@ from musicquiz.models import (
 )
 from musicquiz.services.quiz_service import get_active_quiz
 from musicquiz.services.deezer_service import query_deezer_metadata
+from musicquiz.services.question_repository import get_question, questions_for_quiz
 from musicquiz.services.question_service import get_question_display
+from musicquiz.services.grading_service import invalidate_grade_cache, learn_alias_from_override
+from musicquiz.services.round_payloads import invalidate_round_payloads
+from musicquiz.services.score_ledger import answer_total_points, rebuild_ledger, score_ledger
+from musicquiz.sockets.leaderboard_feed import leaderboard_feed
+from musicquiz.sockets.grading_feed import grading_feed
 from config import Config
 from sqlalchemy import func
 
@@ -44,11 +50,7 @@ def _validate_round(round_number):
 
 
 def _get_question_list(quiz_id):
-    questions = Question.query.filter_by(quiz_id=quiz_id).order_by(
-        Question.round_number,
-        Question.position
-    ).all()
-    return [get_question_display(q) for q in questions]
+    return [get_question_display(q) for q in questions_for_quiz(quiz_id)]
 
 
 # -------------------
@@ -106,6 +108,9 @@ def switch_quiz():
         return jsonify({'status': 'error', 'msg': 'Quiz not found'}), 404
     quiz.is_active = True
     db.session.commit()
+    # Ljestvica i bodovi su po kvizu - ledger se puni timovima novog kviza
+    rebuild_ledger()
+    leaderboard_feed.schedule(socketio)
     return jsonify({'status': 'ok'})
 
 
@@ -284,6 +289,7 @@ def import_external_song():
 
         db.session.add(s)
         db.session.commit()
+        invalidate_round_payloads()
 
         return jsonify({
             "status": "ok",
@@ -304,11 +310,21 @@ def remove_song():
     from musicquiz.models import Answer
 
     question_id = request.json.get("id")
-    Answer.query.filter_by(question_id=question_id).delete()
-    question = Question.query.get(question_id)
+    deleted_ids = [
+        answer_id for (answer_id,) in
+        db.session.query(Answer.id).filter(Answer.question_id == question_id).all()
+    ]
+    deleted_answers = Answer.query.filter_by(question_id=question_id).delete()
+    question = get_question(question_id)
     if question:
         db.session.delete(question)
     db.session.commit()
+    invalidate_grade_cache(question_id)
+    invalidate_round_payloads()
+    if deleted_answers:
+        rebuild_ledger()
+        leaderboard_feed.schedule(socketio)
+        grading_feed.publish(socketio, deletes=deleted_ids)
     return jsonify({"status": "ok"})
 
 
@@ -319,7 +335,7 @@ def remove_song():
 @login_required
 def update_song():
     data = request.json
-    question = Question.query.get(data.get("id"))
+    question = get_question(data.get("id"))
 
     if not question:
         return jsonify({"status": "error", "msg": "Question not found"}), 404
@@ -333,8 +349,12 @@ def update_song():
     song.title = data.get("title")
     song.start_time = float(data.get("start"))
     question.duration = float(data.get("duration"))
+    if "aliases" in data:
+        song.set_aliases(data.get("aliases"))
 
     db.session.commit()
+    invalidate_grade_cache(question.id)
+    invalidate_round_payloads()
     return jsonify({"status": "ok"})
 
 
@@ -361,15 +381,27 @@ def api_update_score():
         if not ans:
             return jsonify({"status": "error", "msg": "Answer not found"}), 404
 
+        points_before = answer_total_points(ans)
         if score_type == "artist":
             ans.artist_points = score_value
         elif score_type == "title":
             ans.title_points = score_value
         else:
             ans.extra_points = score_value
+        score_ledger.record_answer_change(ans, points_before)
+
+        alias_learned = False
+        if score_value == 1.0 and data.get("learn_alias", Config.LEARN_ALIASES):
+            question = get_question(ans.question_id)
+            guess = getattr(ans, f"{score_type}_guess", "") or ""
+            alias_learned = bool(question) and learn_alias_from_override(question, score_type, guess)
 
         db.session.commit()
-        return jsonify({"status": "ok"})
+        if alias_learned:
+            invalidate_round_payloads()
+        leaderboard_feed.schedule(socketio)
+        grading_feed.publish_answer_ids(socketio, [answer_id])
+        return jsonify({"status": "ok", "alias_learned": alias_learned})
 
     except Exception as e:
         return jsonify({"status": "error", "msg": str(e)}), 500
@@ -408,6 +440,7 @@ def reorder_songs():
             })
 
         db.session.commit()
+        invalidate_round_payloads()
         return jsonify({"status": "ok", "updated": updated})
 
     except Exception as e:
@@ -457,6 +490,7 @@ def create_text_question():
         )
         db.session.add(text_row)
         db.session.commit()
+        invalidate_round_payloads()
 
         return jsonify({
             "status": "ok",
@@ -507,6 +541,7 @@ def create_multiple_choice_question():
         text_row.set_choices(choices)
         db.session.add(text_row)
         db.session.commit()
+        invalidate_round_payloads()
 
         return jsonify({
             "status": "ok",
@@ -558,6 +593,7 @@ def create_video_question():
         )
         db.session.add(video)
         db.session.commit()
+        invalidate_round_payloads()
 
         return jsonify({
             "status": "ok",
@@ -616,6 +652,7 @@ def create_simultaneous_question():
         )
         db.session.add(simultaneous)
         db.session.commit()
+        invalidate_round_payloads()
 
         return jsonify({
             "status": "ok",
@@ -1,12 +1,20 @@
-from flask import Blueprint, render_template
+import hmac
+
+from flask import Blueprint, render_template, request, session
+
+from config import Config
 from musicquiz.services.quiz_service import get_active_quiz
 
 screen_bp = Blueprint("screen", __name__)
 
 @screen_bp.route("/screen")
 def screen():
+    # Ključ iz launchera otvara sobu "screens" socketu ove sesije (vidi screen_ready)
+    key = request.args.get("key")
+    if Config.SCREEN_TOKEN and key and hmac.compare_digest(str(key), Config.SCREEN_TOKEN):
+        session["screen_access"] = True
     q = get_active_quiz()
     return render_template(
         "screen.html",
         quiz={"info": {"title": q.title if q else "", "date": ""}}
-    )
\ No newline at end of file
+    )
@@ -0,0 +1,194 @@
+"""
+Write-behind spremnik za predane odgovore.
+
+player_submit_answer više ne radi SELECT + UPDATE + COMMIT po predaji.
+Odgovor se validira, sprema u memoriju (zadnji po (tim, pitanje)) i odmah
+potvrđuje igraču; pozadinska petlja svakih ANSWER_FLUSH_MS zapisuje sve
+pristigle odgovore s nekoliko bulk naredbi (jedan SELECT postojećih,
+jedan bulk UPDATE, jedan bulk INSERT, jedan COMMIT).
+
+Pri zaključavanju pitanja flush_answer_buffer(close_question_id=...)
+zapisuje sve i zatvara pitanje, pa bodovanje vidi svaki prihvaćeni odgovor,
+a zakašnjele predaje se odbijaju.
+"""
+import threading
+import time
+
+from sqlalchemy import insert, update
+
+from config import Config
+from extensions import db
+
+GUESS_FIELDS = ("artist_guess", "title_guess", "extra_guess", "choice_selected", "submission_time")
+
+
+def answer_fields(question_type, data, submission_time):
+    """Polja odgovora ovisno o tipu pitanja (isto pravilo kao prije u handleru)."""
+    question_type = question_type or "audio"
+    fields = {
+        "artist_guess": "",
+        "title_guess": "",
+        "extra_guess": "",
+        "choice_selected": -1,
+        "submission_time": float(submission_time),
+    }
+    if question_type in ["audio", "video"]:
+        fields["artist_guess"] = data.get("artist", "")
+        fields["title_guess"] = data.get("title", "")
+    elif question_type == "text":
+        fields["title_guess"] = data.get("title", "")
+    elif question_type == "text_multiple":
+        fields["choice_selected"] = int(data.get("choice", -1))
+    elif question_type == "simultaneous":
+        fields["artist_guess"] = data.get("artist", "")
+        fields["title_guess"] = data.get("title", "")
+        fields["extra_guess"] = data.get("extra", "")
+    return fields
+
+
+class AnswerBuffer:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._closed = set()
+        self._questions = {}
+
+    def question_meta(self, question_id):
+        """(tip, runda) pitanja; učitava se jednom po pitanju, ne po predaji."""
+        with self._lock:
+            meta = self._questions.get(question_id)
+        if meta is not None:
+            return meta
+        from musicquiz.models import Question
+
+        row = db.session.query(Question.type, Question.round_number).filter(Question.id == question_id).first()
+        if row is None:
+            return None
+        meta = (row.type or "audio", row.round_number)
+        with self._lock:
+            self._questions[question_id] = meta
+        return meta
+
+    def open_question(self, question_id, meta=None):
+        """meta: (tip, runda) ako je već poznat (prevedena runda) - predaje ga ne čitaju iz baze."""
+        with self._lock:
+            self._closed.discard(question_id)
+            if meta is not None:
+                self._questions[question_id] = meta
+
+    def submit(self, player_id, question_id, round_number, fields):
+        """Sprema zadnji odgovor tima; False ako je pitanje već zaključano."""
+        with self._lock:
+            if question_id in self._closed:
+                return False
+            self._pending[(player_id, question_id)] = dict(fields, round_number=round_number)
+            return True
+
+    def pending_count(self):
+        with self._lock:
+            return len(self._pending)
+
+    def drain(self, close_question_id=None):
+        with self._lock:
+            pending = self._pending
+            self._pending = {}
+            if close_question_id is not None:
+                self._closed.add(close_question_id)
+                self._questions.pop(close_question_id, None)
+            return pending
+
+    def requeue(self, pending):
+        """Neuspjeli flush: vrati odgovore, ali ne pregazi novije predaje."""
+        with self._lock:
+            for key, fields in pending.items():
+                self._pending.setdefault(key, fields)
+
+
+answer_buffer = AnswerBuffer()
+# Dva istovremena flusha (pozadinska petlja i zaključavanje) ne smiju oba umetnuti isti odgovor
+_flush_lock = threading.Lock()
+
+
+def flush_answer_buffer(close_question_id=None):
+    """Bulk upsert svih pristiglih odgovora. Vraća id-eve zapisanih odgovora. Treba app context."""
+    with _flush_lock:
+        return _flush_pending(answer_buffer.drain(close_question_id))
+
+
+def _flush_pending(pending):
+    from musicquiz.models import Answer, Player
+
+    if not pending:
+        return []
+
+    try:
+        question_ids = {question_id for _, question_id in pending}
+        # Timovi koji još postoje (jedan upit po primarnom ključu za sve timove)
+        player_ids = {
+            player_id for (player_id,) in db.session.query(Player.id).filter(
+                Player.id.in_({player_id for player_id, _ in pending})
+            ).all()
+        }
+        existing = {
+            (player_id, question_id): answer_id
+            for answer_id, player_id, question_id in db.session.query(
+                Answer.id, Answer.player_id, Answer.question_id
+            ).filter(
+                Answer.question_id.in_(question_ids),
+                Answer.player_id.in_(player_ids),
+            ).all()
+        }
+
+        updates = []
+        inserts = []
+        for (player_id, question_id), fields in pending.items():
+            if player_id not in player_ids:
+                # Tim je obrisan dok je odgovor čekao u spremniku
+                continue
+            values = {name: fields[name] for name in GUESS_FIELDS}
+            answer_id = existing.get((player_id, question_id))
+            if answer_id is not None:
+                updates.append(dict(values, id=answer_id))
+            else:
+                inserts.append(dict(
+                    values,
+                    player_id=player_id,
+                    question_id=question_id,
+                    round_number=fields["round_number"],
+                ))
+
+        answer_ids = [row["id"] for row in updates]
+        if updates:
+            db.session.execute(update(Answer), updates)
+        if inserts:
+            result = db.session.execute(insert(Answer).returning(Answer.id), inserts)
+            answer_ids.extend(result.scalars().all())
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        answer_buffer.requeue(pending)
+        raise
+    return answer_ids
+
+
+def start_answer_writer(socketio, app):
+    """Pozadinska petlja: flush svakih ANSWER_FLUSH_MS i grading delta adminima."""
+    interval = max(0.02, float(Config.ANSWER_FLUSH_MS) / 1000.0)
+
+    def _loop():
+        from musicquiz.sockets.grading_feed import grading_feed
+
+        while True:
+            time.sleep(interval)
+            if not answer_buffer.pending_count():
+                continue
+            with app.app_context():
+                try:
+                    answer_ids = flush_answer_buffer()
+                    grading_feed.publish_answer_ids(socketio, answer_ids)
+                except Exception as e:
+                    print(f"Warning: answer buffer flush failed: {str(e)}")
+                finally:
+                    db.session.remove()
+
+    socketio.start_background_task(_loop)
@@ -1,7 +1,15 @@
+from collections import OrderedDict
 from difflib import SequenceMatcher
+from functools import lru_cache
 import re
+import threading
 import unicodedata
 
+from config import Config
+from musicquiz.models.aliases import ALIAS_FIELDS
+from musicquiz.services.question_service import learn_accepted_alias
+from musicquiz.services.score_ledger import answer_total_points, score_ledger
+
 
 class _GradeTarget:
     def __init__(self, artist, title, duration, extra=""):
@@ -16,54 +24,206 @@ def _fold_accents(s):
     nfkd = unicodedata.normalize("NFKD", s)
     return "".join(ch for ch in nfkd if not unicodedata.combining(ch))
 
+# Normalizacija: regexi se kompiliraju jednom, a rezultati se pamte u LRU cacheu
+_RE_PARENS = re.compile(r"\(.*?\)")              # ukloni zagrade i sadržaj
+_RE_FEAT = re.compile(r"\b(feat|ft)\.?\b")       # feat./ft.
+_RE_JOINERS = re.compile(r"[&x∙•]")              # spajanja izvođača
+_RE_NON_ALNUM = re.compile(r"[^a-z0-9\s]")       # interpunkcija -> space
+_RE_SPACES = re.compile(r"\s+")                  # višestruke razmake
+_RE_ARTIST_SPLIT = re.compile(r"[,&/]")
+
+
+def _normalize_uncached(s):
+    s = s.lower().strip()
+    s = _RE_PARENS.sub("", s)
+    s = _RE_FEAT.sub("", s)
+    s = _RE_JOINERS.sub(" ", s)
+    s = _RE_NON_ALNUM.sub("", s)
+    s = _RE_SPACES.sub(" ", s)
+    if not s.isascii():
+        s = _fold_accents(s)                       # dijakritika -> base
+    return s.strip()
+
+
+_normalize_cached = lru_cache(maxsize=Config.NORMALIZE_CACHE_SIZE)(_normalize_uncached)
+
+
 def _normalize(s):
     if not s:
         return ""
-    s = s.lower().strip()
-    s = re.sub(r"\(.*?\)", "", s)              # ukloni zagrade i sadržaj
-    s = re.sub(r"\b(feat|ft)\.?\b", "", s)     # feat./ft.
-    s = re.sub(r"[&x∙•]", " ", s)              # spajanja izvođača
-    s = re.sub(r"[^a-z0-9\s]", "", s)        # interpunkcija -> space
-    s = re.sub(r"\s+", " ", s)                 # višestruke razmake
-    s = _fold_accents(s)                       # dijakritika -> base
-    return s.strip()
+    return _normalize_cached(s)
 
-def _sim(a, b):
-    a, b = _normalize(a), _normalize(b)
+
+def normalize_cache_stats():
+    """Statistika LRU cachea normalizacije (pogoci/promašaji)."""
+    info = _normalize_cached.cache_info()
+    lookups = info.hits + info.misses
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "size": info.currsize,
+        "maxsize": info.maxsize,
+        "hit_ratio": round(info.hits / lookups, 4) if lookups else 0.0,
+    }
+
+
+def clear_normalize_cache():
+    _normalize_cached.cache_clear()
+
+
+class DifflibSimilarity:
+    """Referentna sličnost: difflib.SequenceMatcher.ratio() (Ratcliff/Obershelp)."""
+
+    name = "difflib"
+
+    def ratio(self, a, b):
+        return SequenceMatcher(None, a, b).ratio()
+
+
+# Pragovi sličnosti (1.0, 0.5) po polju
+FIELD_THRESHOLDS = {"artist": (0.82, 0.55), "title": (0.84, 0.58), "extra": (0.84, 0.58)}
+# Ispod najnižeg praga za 0.5 svako polje dobiva 0 bodova (i uz bonus za podniz)
+_MIN_POINTS_SIM = min(half for _, half in FIELD_THRESHOLDS.values())
+
+
+class IndelSimilarity:
+    """
+    Brza sličnost: 2 * LCS / (len(a) + len(b)), tj. normalizirana Levenshtein
+    udaljenost samo s umetanjem/brisanjem. LCS se računa bit-paralelno
+    (Hyyrö) nad Python intovima - jedna operacija po znaku drugog stringa.
+
+    Podudaranja difflib-a su zajednički podniz, pa je ovaj omjer gornja
+    granica difflib omjera: ispod _MIN_POINTS_SIM oba daju 0 bodova i difflib
+    se preskače. Iznad te granice vraća se difflib omjer, pa su bodovi nakon
+    pragova identični referentnom backendu (ne samo približni). Jaro-Winkler i
+    NumPy nisu korišteni: JW ima drugu skalu (pragovi ne bi vrijedili), a
+    NumPy nije ovisnost projekta.
+    """
+
+    name = "indel"
+
+    def __init__(self):
+        self._reference = DifflibSimilarity()
+
+    def ratio(self, a, b):
+        upper = self.lcs_ratio(a, b)
+        if upper < _MIN_POINTS_SIM:
+            return upper
+        return self._reference.ratio(a, b)
+
+    @staticmethod
+    def lcs_ratio(a, b):
+        if len(a) < len(b):
+            a, b = b, a
+        masks = {}
+        bit = 1
+        for ch in a:
+            masks[ch] = masks.get(ch, 0) | bit
+            bit <<= 1
+        full = bit - 1
+        row = full
+        for ch in b:
+            matches = row & masks.get(ch, 0)
+            row = ((row + matches) | (row - matches)) & full
+        lcs = len(a) - bin(row).count("1")
+        return 2.0 * lcs / (len(a) + len(b))
+
+
+SIMILARITY_BACKENDS = {
+    DifflibSimilarity.name: DifflibSimilarity,
+    IndelSimilarity.name: IndelSimilarity,
+}
+
+
+def get_similarity_backend(name):
+    try:
+        return SIMILARITY_BACKENDS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown similarity backend: {name}")
+
+
+_similarity_backend = get_similarity_backend(Config.SIMILARITY_BACKEND)
+
+
+def set_similarity_backend(name):
+    """Mijenja backend za cijeli proces (npr. kalibracija ili benchmark)."""
+    global _similarity_backend
+    _similarity_backend = get_similarity_backend(name)
+    return _similarity_backend
+
+
+def current_similarity_backend():
+    return _similarity_backend
+
+
+def _sim_normalized(a, b, backend=None):
     if not a or not b:
         return 0.0
     if a == b:
         return 1.0
-    return SequenceMatcher(None, a, b).ratio()
+    return (backend or _similarity_backend).ratio(a, b)
 
-def _substring_bonus(a, b):
-    a, b = _normalize(a), _normalize(b)
+
+def _substring_bonus_normalized(a, b):
     return 0.5 if a and b and (a in b or b in a) else 0.0
 
-def auto_grade_answer(ans, song):
-    """Original text-based grading (no time bonus)."""
-    artist_sim = 0.0
-    title_sim = 0.0
 
-    # artist: lagano splitaj moguće kolaboracije
-    gold_artists = re.split(r"[,&/]", song.artist or "")
-    gold_artists = [x.strip() for x in gold_artists if x.strip()]
+def _sim(a, b):
+    return _sim_normalized(_normalize(a), _normalize(b))
+
+def _substring_bonus(a, b):
+    return _substring_bonus_normalized(_normalize(a), _normalize(b))
 
-    if ans.artist_guess:
-        best = 0.0
-        for ga in gold_artists or [""]:
-            sc = _sim(ans.artist_guess, ga)
-            if sc > best:
-                best = sc
-        artist_sim = best
+def _grading_targets(artist, title, extra, aliases):
+    """
+    {polje: [normalizirani točni odgovori i prihvaćeni aliasi]} - mete s kojima
+    se pokušaj uspoređuje i u auto_grade_answer i u QuestionGrader.
+    Izvođač se lagano splita na moguće kolaboracije.
+    """
+    gold_artists = [x.strip() for x in _RE_ARTIST_SPLIT.split(artist or "") if x.strip()]
+    golds = {
+        "artist": [_normalize(ga) for ga in gold_artists or [""]],
+        "title": [_normalize(title)],
+        "extra": [_normalize(extra) if extra else ""],
+    }
+    aliases = dict(aliases or ())
+    targets = {}
+    for field in ALIAS_FIELDS:
+        field_targets = list(golds[field])
+        for alias in aliases.get(field, ()):
+            alias = _normalize(alias)
+            if alias and alias not in field_targets:
+                field_targets.append(alias)
+        targets[field] = field_targets
+    return targets
+
+
+def _with_substring_bonus(sim, guess, gold):
+    if sim < 0.5:
+        return max(sim, _substring_bonus_normalized(guess, gold))
+    return sim
+
+
+def _match_points(field, guess, targets, backend=None):
+    """
+    Bodovi normaliziranog pokušaja: najbolja sličnost s bilo kojom metom polja
+    (točan odgovor ili alias). Naslov i extra dobivaju i bonus za podniz.
+    """
+    if field == "artist":
+        sim = max(_sim_normalized(guess, target, backend) for target in targets)
+    else:
+        sim = max(_with_substring_bonus(_sim_normalized(guess, target, backend), guess, target) for target in targets)
+    return _points(sim, *FIELD_THRESHOLDS[field])
 
-    if ans.title_guess:
-        title_sim = _sim(ans.title_guess, song.title)
-        if title_sim < 0.5:
-            title_sim = max(title_sim, _substring_bonus(ans.title_guess, song.title))
 
-    ans.artist_points = 1.0 if artist_sim >= 0.82 else (0.5 if artist_sim >= 0.55 else 0.0)
-    ans.title_points  = 1.0 if title_sim  >= 0.84 else (0.5 if title_sim  >= 0.58 else 0.0)
+def auto_grade_answer(ans, song):
+    """Original text-based grading (no time bonus); isto pravilo podudaranja kao QuestionGrader."""
+    aliases = _alias_spec(song)
+    targets = _grading_targets(song.artist, song.title, None, aliases)
+    ans.artist_points = _match_points("artist", _normalize(ans.artist_guess), targets["artist"]) \
+        if ans.artist_guess else 0.0
+    ans.title_points = _match_points("title", _normalize(ans.title_guess), targets["title"]) \
+        if ans.title_guess else 0.0
 
 
 def calculate_time_bonus(submission_time, total_duration):
@@ -128,41 +288,353 @@ def grade_multiple_choice_with_time(ans, correct_choice_index, duration):
     return base_points
 
 
-def grade_answer_for_question(ans, question):
-    if question.type == "text_multiple" and question.text_multiple:
-        correct_idx = int(question.text_multiple.correct_index or 0)
-        points = grade_multiple_choice_with_time(ans, correct_idx, float(question.duration or 0))
-        ans.artist_points = 0.0
-        ans.title_points = points
-        return
+def _points(sim, full, half):
+    return 1.0 if sim >= full else (0.5 if sim >= half else 0.0)
 
-    if question.type == "text" and question.text:
-        answer_text = question.text.answer_text or question.text.question_text
-        target = _GradeTarget("", answer_text, float(question.duration or 0))
-        auto_grade_answer(ans, target)
-        return
 
-    if question.type == "video" and question.video:
-        target = _GradeTarget(question.video.artist, question.video.title, float(question.duration or 0))
-        auto_grade_answer(ans, target)
-        return
+class GradeCache:
+    """
+    Memo bodova: (točan odgovor, polje, normalizirani pokušaj) -> bodovi.
+
+    Isti pokušaj ("azra") dvadeset timova, ponovljeno bodovanje i
+    finalize_round plaćaju izračun sličnosti samo jednom. Ključ sadrži sam
+    normalizirani točan odgovor i backend, pa izmjena odgovora (i iz drugog
+    procesa, npr. launcherovih dijaloga) automatski vodi na novi ključ;
+    invalidate_question() uz to odmah oslobađa stare unose.
+    """
+
+    def __init__(self, max_keys):
+        self.max_keys = max(1, int(max_keys))
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._keys_by_question = {}
+        self.hits = 0
+        self.misses = 0
+
+    def entries_for(self, question_id, answer_key):
+        with self._lock:
+            if question_id is not None:
+                old_key = self._keys_by_question.get(question_id)
+                if old_key is not None and old_key != answer_key:
+                    self._entries.pop(old_key, None)
+                self._keys_by_question[question_id] = answer_key
+            entries = self._entries.get(answer_key)
+            if entries is None:
+                entries = self._entries[answer_key] = {}
+                while len(self._entries) > self.max_keys:
+                    self._entries.popitem(last=False)
+            else:
+                self._entries.move_to_end(answer_key)
+            return entries
+
+    def invalidate_question(self, question_id):
+        with self._lock:
+            answer_key = self._keys_by_question.pop(question_id, None)
+            if answer_key is not None:
+                self._entries.pop(answer_key, None)
+
+    def record(self, hits, misses):
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_question.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "answer_keys": len(self._entries),
+                "entries": sum(len(entries) for entries in self._entries.values()),
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+grade_cache = GradeCache(Config.GRADE_CACHE_QUESTIONS)
+
+
+def invalidate_grade_cache(question_id):
+    """Pozvati nakon izmjene točnog odgovora pitanja (Song/Video/Text/Simultaneous)."""
+    grade_cache.invalidate_question(question_id)
+
+
+class QuestionGrader:
+    """
+    Bodovanje svih odgovora jednog pitanja.
+
+    Točni odgovori normaliziraju se (i izvođači razdvajaju) samo jednom, a
+    sličnost se računa jednom po različitom normaliziranom pokušaju - isti
+    odgovor deset timova boduje se jednim izračunom, a rezultat se pamti u
+    grade_cache i za sljedeća bodovanja. Mete i pravilo podudaranja
+    (_grading_targets, _match_points) dijeli s auto_grade_answer.
+
+    Prihvaćeni aliasi i sami točni odgovori čine indeks normaliziranih
+    stringova: pokušaj koji je u indeksu dobiva 1.0 bez računanja sličnosti,
+    a tek ostali se fuzzy uspoređuju s točnim odgovorom i aliasima.
+    """
 
+    def __init__(self, question, backend=None, spec=None):
+        self.question = question
+        if spec is None:
+            spec = answer_key_spec(question)
+        self._setup(spec, getattr(question, "id", None), backend)
+
+    @classmethod
+    def from_spec(cls, spec, backend=None):
+        """Grader bez ORM pitanja (npr. u radnom procesu process poola)."""
+        grader = cls.__new__(cls)
+        grader.question = None
+        grader._setup(spec, None, backend)
+        return grader
+
+    def _setup(self, spec, question_id, backend):
+        kind, duration, correct_idx, artist, title, extra, aliases = spec
+        self.backend = backend or _similarity_backend
+        self.duration = duration
+        self.kind = kind
+        self.correct_idx = correct_idx
+        self.has_extra = False
+        self.targets = {field: [] for field in ALIAS_FIELDS}
+        self.exact = {field: frozenset() for field in ALIAS_FIELDS}
+        self.hits = 0
+        self.misses = 0
+        self.exact_hits = 0
+        self.reused = 0
+        self._cache = {}
+        if kind != "text":
+            return
+
+        self.targets = _grading_targets(artist, title, extra, aliases)
+        self.has_extra = bool(extra)
+        for field in ALIAS_FIELDS:
+            self.exact[field] = frozenset(target for target in self.targets[field] if target)
+
+        answer_key = (self.backend.name,) + tuple(tuple(self.targets[field]) for field in ALIAS_FIELDS)
+        self._cache = grade_cache.entries_for(question_id, answer_key)
+
+    def _lookup(self, key):
+        if key[1] in self.exact[key[0]]:
+            self.exact_hits += 1
+            return 1.0
+        points = self._cache.get(key)
+        if points is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return points
+
+    def _field_points(self, field, raw_guess):
+        key = (field, _normalize(raw_guess or ""))
+        points = self._lookup(key)
+        if points is None:
+            points = self._cache[key] = _match_points(field, key[1], self.targets[field], self.backend)
+        return points
+
+    def is_exact(self, field, raw_guess):
+        """Je li pokušaj (normaliziran) točan odgovor ili prihvaćeni alias polja."""
+        return _normalize(raw_guess or "") in self.exact.get(field, ())
+
+    def artist_points(self, raw_guess):
+        if not raw_guess:
+            return 0.0
+        return self._field_points("artist", raw_guess)
+
+    def title_points(self, raw_guess):
+        if not raw_guess:
+            return 0.0
+        return self._field_points("title", raw_guess)
+
+    def extra_points(self, raw_guess):
+        return self._field_points("extra", raw_guess)
+
+    def points_for(self, artist_guess, title_guess, extra_guess, choice_selected, submission_time):
+        """(artist, title, extra) bodovi; extra je None ako se ne boduje, None za neocjenjivo pitanje."""
+        if self.kind == "choice":
+            points = 1.0 if choice_selected == self.correct_idx else 0.0
+            if points == 1.0 and submission_time >= 0:
+                points *= calculate_time_bonus(submission_time, self.duration)
+            return 0.0, points, None
+        if self.kind == "text":
+            return (
+                self.artist_points(artist_guess),
+                self.title_points(title_guess),
+                self.extra_points(extra_guess) if self.has_extra else None,
+            )
+        return None
+
+    def grade(self, ans):
+        """Postavlja bodove jednog odgovora (bez javljanja ledgeru)."""
+        points = self.points_for(*answer_guesses(ans))
+        if points is not None:
+            _apply_points(ans, points)
+
+
+def answer_guesses(ans):
+    """(artist, title, extra, choice, submission_time) - redoslijed argumenata points_for."""
+    return (ans.artist_guess, ans.title_guess, ans.extra_guess, ans.choice_selected, ans.submission_time)
+
+
+def _apply_points(ans, points):
+    artist_points, title_points, extra_points = points
+    ans.artist_points = artist_points
+    ans.title_points = title_points
+    if extra_points is not None:
+        ans.extra_points = extra_points
+
+
+def _alias_spec(details):
+    """Aliasi kao hashable torka ((polje, (alias, ...)), ...) - ide u spec i u radne procese."""
+    if not hasattr(details, "get_aliases"):
+        return ()
+    return tuple((field, tuple(values)) for field, values in sorted(details.get_aliases().items()))
+
+
+def answer_key_spec(question):
+    """
+    Kompaktan opis točnog odgovora: (vrsta, trajanje, točan izbor, izvođač, naslov, extra, aliasi).
+    Vrsta je "choice", "text" ili None (pitanje bez točnog odgovora se ne boduje).
+    """
+    duration = float(question.duration or 0)
+    if question.type == "text_multiple" and question.text_multiple:
+        return ("choice", duration, int(question.text_multiple.correct_index or 0), None, None, None, ())
+    if question.type == "text" and question.text:
+        text = question.text
+        return ("text", duration, None, "", text.answer_text or text.question_text, None, _alias_spec(text))
+    if question.type == "video" and question.video:
+        video = question.video
+        return ("text", duration, None, video.artist, video.title, None, _alias_spec(video))
     if question.type == "simultaneous" and question.simultaneous:
-        targets = _GradeTarget(
-            question.simultaneous.artist,
-            question.simultaneous.title,
-            float(question.duration or 0),
-            extra=question.simultaneous.extra_answer,
+        simultaneous = question.simultaneous
+        return (
+            "text", duration, None,
+            simultaneous.artist, simultaneous.title, simultaneous.extra_answer,
+            _alias_spec(simultaneous),
         )
-        auto_grade_answer(ans, targets)
-        if targets.extra:
-            extra_sim = _sim(ans.extra_guess or "", targets.extra)
-            if extra_sim < 0.5:
-                extra_sim = max(extra_sim, _substring_bonus(ans.extra_guess or "", targets.extra))
-            ans.extra_points = 1.0 if extra_sim >= 0.84 else (0.5 if extra_sim >= 0.58 else 0.0)
-        return
-
     if question.type == "audio" and question.song:
-        target = _GradeTarget(question.song.artist, question.song.title, float(question.duration or 0))
-        auto_grade_answer(ans, target)
+        song = question.song
+        return ("text", duration, None, song.artist, song.title, None, _alias_spec(song))
+    return (None, duration, None, None, None, None, ())
+
 
+def learn_alias_from_override(question, field, raw_guess):
+    """
+    Ručno dan 1.0: pokušaj koji nije već točan odgovor ni alias postaje
+    prihvaćeni alias polja (bez commita), pa ga iduće bodovanje prepoznaje
+    izravno. Vraća True ako je alias naučen.
+    """
+    if not _normalize(raw_guess or ""):
+        return False
+    if QuestionGrader(question).is_exact(field, raw_guess):
+        return False
+    return learn_accepted_alias(question, field, raw_guess)
+
+
+def grade_question(question, answers, provisional=None, spec=None):
+    """
+    Boduje sve odgovore jednog pitanja odjednom i javlja delte score ledgeru.
+    Bodovi se postavljaju na učitane odgovore; commit ih zapisuje jednim
+    batch UPDATE-om (samo stvarno promijenjeni redovi).
+
+    provisional: {player_id: (pokušaji, bodovi)} iz privremenog bodovanja pri
+    predaji; odgovor s istim pokušajima dobiva te bodove bez ponovnog bodovanja.
+    spec: gotov answer_key_spec (prevedena runda) - tada se veze pitanja ne čitaju.
+    """
+    grader = QuestionGrader(question, spec=spec)
+    for ans in answers:
+        points_before = answer_total_points(ans)
+        try:
+            graded = provisional.get(ans.player_id) if provisional else None
+            if graded is not None and graded[0] == answer_guesses(ans):
+                if graded[1] is not None:
+                    _apply_points(ans, graded[1])
+                grader.reused += 1
+            else:
+                grader.grade(ans)
+        except Exception as e:
+            print(f"Warning: Failed to auto-grade answer {ans.id} for question {question.id}: {str(e)}")
+            continue
+        score_ledger.record_answer_change(ans, points_before)
+    grade_cache.record(grader.hits, grader.misses)
+    return grader
+
+
+def grade_answer_for_question(ans, question):
+    """Grade one answer in place and report the point delta to the score ledger."""
+    grade_question(question, [ans])
+
+
+# --- Process pool za velike runde (finalize_round) ---
+
+_POOL_CHUNK_SIZE = 500
+_grading_pool = None
+_grading_pool_lock = threading.Lock()
+
+
+def use_process_pool(answer_count):
+    """Process pool samo ako je uključen (GRADING_PROCESSES > 0) i runda je dovoljno velika."""
+    return Config.GRADING_PROCESSES > 0 and answer_count >= Config.GRADING_POOL_MIN_ANSWERS
+
+
+def get_grading_pool():
+    global _grading_pool
+    with _grading_pool_lock:
+        if _grading_pool is None:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+
+            # spawn: server je višedretven (threading async mode), fork nije siguran
+            _grading_pool = ProcessPoolExecutor(
+                max_workers=Config.GRADING_PROCESSES,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _grading_pool
+
+
+def _grade_chunk(spec, backend_name, rows):
+    """Radni proces: [(answer_id, artist, title, extra, choice, submission_time)] -> [(answer_id, bodovi)]."""
+    grader = QuestionGrader.from_spec(spec, backend=get_similarity_backend(backend_name))
+    results = []
+    for answer_id, artist_guess, title_guess, extra_guess, choice_selected, submission_time in rows:
+        try:
+            points = grader.points_for(artist_guess, title_guess, extra_guess, choice_selected, submission_time)
+        except Exception as e:
+            print(f"Warning: Failed to auto-grade answer {answer_id}: {str(e)}")
+            continue
+        if points is not None:
+            results.append((answer_id, points))
+    return results
+
+
+def grade_questions_in_pool(question_map, answers_by_question, pool=None):
+    """
+    Boduje više pitanja u process poolu. Radnicima idu samo kompaktne torke
+    (id, pokušaji) i opis točnog odgovora; bodovi se primjenjuju tek kad su
+    svi dijelovi gotovi, pa neuspjeh poola ne ostavlja rundu napola bodovanu.
+    """
+    pool = pool or get_grading_pool()
+    backend_name = _similarity_backend.name
+    futures = []
+    for question_id, answers in answers_by_question.items():
+        spec = answer_key_spec(question_map[question_id])
+        if spec[0] is None:
+            continue
+        for start in range(0, len(answers), _POOL_CHUNK_SIZE):
+            rows = [(ans.id, *answer_guesses(ans)) for ans in answers[start:start + _POOL_CHUNK_SIZE]]
+            futures.append(pool.submit(_grade_chunk, spec, backend_name, rows))
+
+    results = [result for future in futures for result in future.result()]
+
+    answers_by_id = {ans.id: ans for answers in answers_by_question.values() for ans in answers}
+    for answer_id, points in results:
+        ans = answers_by_id[answer_id]
+        points_before = answer_total_points(ans)
+        _apply_points(ans, points)
+        score_ledger.record_answer_change(ans, points_before)
+    return len(results)
@@ -1,15 +1,16 @@
 live_player_status = {}
 
 def get_all_players_data():
-    from musicquiz.models import Player
+    from musicquiz.services.quiz_service import quiz_players_query
+    from musicquiz.services.score_ledger import score_ledger
 
-    players = Player.query.all()
+    players = quiz_players_query().all()
     data = []
 
     for p in players:
         data.append({
             "name": p.name,
-            "score": p.score,
+            "score": score_ledger.score_of(p.id, p.score),
             "status": live_player_status.get(p.name, "offline")
         })
 
@@ -0,0 +1,167 @@
+"""
+Privremeno bodovanje pri predaji (PROVISIONAL_GRADING).
+
+Svaka prihvaćena predaja se, osim u answer_buffer, stavlja i u red za
+bodovanje; pozadinska dretva (ne socket handler) boduje zadnji pokušaj
+svakog tima i pamti (pokušaji, bodovi). Pri zaključavanju grade_question
+za odgovor čiji su pokušaji isti kao privremeno bodovani samo prepiše
+bodove, a ponovno boduje samo odgovore promijenjene od tada - pa
+player_show_answer ide odmah nakon screen_show_correct.
+
+Privremeni bodovi vrijede samo za isti točan odgovor i backend; ako se
+točan odgovor izmijeni dok pitanje traje, pri zaključavanju se sve boduje
+iznova.
+"""
+import threading
+
+from config import Config
+from extensions import db
+from musicquiz.services.answer_buffer import GUESS_FIELDS
+from musicquiz.services.grading_service import (
+    QuestionGrader,
+    answer_key_spec,
+    current_similarity_backend,
+    grade_cache,
+)
+
+
+class ProvisionalGrader:
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._pending = {}
+        self._results = {}
+        self._specs = {}
+        self._closed = set()
+        self.graded = 0
+        self.reused = 0
+        self.regraded = 0
+
+    def open_question(self, question_id, spec=None):
+        """spec: answer_key_spec iz prevedene runde (pozadinska dretva ne čita pitanje iz baze)."""
+        with self._lock:
+            self._closed.discard(question_id)
+            self._results.pop(question_id, None)
+            self._specs.pop(question_id, None)
+            if spec is not None:
+                self._specs[question_id] = (current_similarity_backend(), spec)
+
+    def submit(self, player_id, question_id, fields):
+        """Zadnja predaja tima ide u red za bodovanje (ne blokira handler)."""
+        if not self.enabled:
+            return
+        guesses = tuple(fields[name] for name in GUESS_FIELDS)
+        with self._lock:
+            if question_id in self._closed:
+                return
+            self._pending[(player_id, question_id)] = guesses
+        self._wake.set()
+
+    def take(self, question_id, spec):
+        """
+        Zatvara pitanje i vraća {player_id: (pokušaji, bodovi)} za grade_question.
+        spec je trenutni answer_key_spec pitanja; prazno ako je točan odgovor
+        (ili backend) različit od onog kojim se bodovalo.
+        """
+        if not self.enabled:
+            return {}
+        with self._lock:
+            self._closed.add(question_id)
+            for key in [key for key in self._pending if key[1] == question_id]:
+                del self._pending[key]
+            results = self._results.pop(question_id, {})
+            graded_with = self._specs.pop(question_id, None)
+        if graded_with != (current_similarity_backend(), spec):
+            return {}
+        return results
+
+    def record(self, reused, regraded):
+        with self._lock:
+            self.reused += reused
+            self.regraded += regraded
+
+    def stats(self):
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "pending": len(self._pending),
+                "graded": self.graded,
+                "reused": self.reused,
+                "regraded": self.regraded,
+            }
+
+    def _drain(self):
+        with self._lock:
+            pending = self._pending
+            self._pending = {}
+            self._wake.clear()
+            return pending
+
+    def _spec_for(self, question_id):
+        with self._lock:
+            graded_with = self._specs.get(question_id)
+        if graded_with is not None:
+            return graded_with
+        from musicquiz.services.question_repository import get_question
+
+        question = get_question(question_id)
+        if question is None:
+            return None
+        graded_with = (current_similarity_backend(), answer_key_spec(question))
+        with self._lock:
+            self._specs.setdefault(question_id, graded_with)
+            return self._specs[question_id]
+
+    def grade_pending(self):
+        """Boduje sve predaje iz reda. Treba app context."""
+        pending = self._drain()
+        by_question = {}
+        for (player_id, question_id), guesses in pending.items():
+            by_question.setdefault(question_id, []).append((player_id, guesses))
+
+        for question_id, submissions in by_question.items():
+            graded_with = self._spec_for(question_id)
+            if graded_with is None:
+                continue
+            backend, spec = graded_with
+            if spec[0] is None:
+                continue
+            grader = QuestionGrader.from_spec(spec, backend=backend)
+            results = {}
+            for player_id, guesses in submissions:
+                # Zaključano pitanje boduje lock_question; ne otimaj mu GIL za rezultate koji se bacaju
+                if question_id in self._closed:
+                    break
+                try:
+                    results[player_id] = (guesses, grader.points_for(*guesses))
+                except Exception as e:
+                    print(f"Warning: provisional grading failed for {player_id}/{question_id}: {str(e)}")
+            grade_cache.record(grader.hits, grader.misses)
+            with self._lock:
+                if question_id in self._closed:
+                    continue
+                self._results.setdefault(question_id, {}).update(results)
+                self.graded += len(results)
+
+
+provisional_grader = ProvisionalGrader(enabled=Config.PROVISIONAL_GRADING)
+
+
+def start_provisional_grader(socketio, app):
+    """Pozadinska dretva za privremeno bodovanje (samo ako je PROVISIONAL_GRADING uključen)."""
+    if not provisional_grader.enabled:
+        return
+
+    def _loop():
+        while True:
+            provisional_grader._wake.wait()
+            with app.app_context():
+                try:
+                    provisional_grader.grade_pending()
+                except Exception as e:
+                    print(f"Warning: provisional grading failed: {str(e)}")
+                finally:
+                    db.session.remove()
+
+    socketio.start_background_task(_loop)
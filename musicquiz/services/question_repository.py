@@ -0,0 +1,61 @@
+"""
+Dohvat pitanja s vezama na sadržaj (Song/Video/TextQuestion/TextMultiple/
+SimultaneousQuestion) u istom upitu.
+
+Svaka veza je jedan-na-jedan, pa joinedload ne umnaža redove: lista od
+100 pitanja je jedan SELECT s LEFT OUTER JOIN-ovima umjesto 1 + 100
+lazy-load upita (get_question_display, get_question_answer_key,
+answer_key_spec... čitaju vezu svakog pitanja). Funkcije koje ne čitaju
+sadržaj (redoslijed, id-evi) i dalje koriste obični Question.query.
+"""
+from sqlalchemy.orm import joinedload
+
+from extensions import db
+from musicquiz.models import Question
+
+_DETAIL_RELATIONSHIPS = (
+    Question.song,
+    Question.video,
+    Question.text,
+    Question.text_multiple,
+    Question.simultaneous,
+)
+
+
+def with_details(query):
+    """Dodaje eager load svih veza sadržaja na upit nad Question."""
+    return query.options(*(joinedload(relationship) for relationship in _DETAIL_RELATIONSHIPS))
+
+
+def get_question(question_id):
+    """Jedno pitanje sa sadržajem ili None."""
+    if question_id is None:
+        return None
+    return db.session.get(
+        Question,
+        question_id,
+        options=[joinedload(relationship) for relationship in _DETAIL_RELATIONSHIPS],
+    )
+
+
+def questions_for_quiz(quiz_id):
+    """Sva pitanja kviza po rundi i poziciji."""
+    return with_details(Question.query.filter_by(quiz_id=quiz_id)) \
+        .order_by(Question.round_number, Question.position) \
+        .all()
+
+
+def questions_for_round(quiz_id, round_number):
+    """Pitanja jedne runde po poziciji."""
+    return with_details(Question.query.filter_by(quiz_id=quiz_id, round_number=round_number)) \
+        .order_by(Question.position) \
+        .all()
+
+
+def questions_by_id(question_ids):
+    """{id: pitanje} za zadane id-eve (nepostojeći se preskaču)."""
+    question_ids = list(question_ids)
+    if not question_ids:
+        return {}
+    questions = with_details(Question.query.filter(Question.id.in_(question_ids))).all()
+    return {question.id: question for question in questions}
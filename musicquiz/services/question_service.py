@@ -1,6 +1,37 @@
 from musicquiz.models import Question
 
 
+def get_question_details(question: Question):
+    """Model s točnim odgovorom i aliasima (Song/Video/SimultaneousQuestion/TextQuestion) ili None."""
+    if question.type == "audio":
+        return question.song
+    if question.type == "video":
+        return question.video
+    if question.type == "simultaneous":
+        return question.simultaneous
+    if question.type == "text":
+        return question.text
+    return None
+
+
+def get_question_aliases(question: Question):
+    details = get_question_details(question)
+    return details.get_aliases() if details else {}
+
+
+def learn_accepted_alias(question: Question, field, guess):
+    """
+    Ručno dan 1.0 -> pokušaj postaje prihvaćeni alias polja (bez commita).
+    Tekstualno pitanje ima samo jedno polje odgovora ("title"). Vraća True ako je alias dodan.
+    """
+    details = get_question_details(question)
+    if details is None or (question.type == "text" and field != "title"):
+        return False
+    if field == "extra" and question.type != "simultaneous":
+        return False
+    return details.add_alias(field, guess)
+
+
 def get_question_media(question: Question):
     if question.type == "video":
         video = question.video
@@ -104,6 +135,20 @@ def get_question_unlock_payload(question: Question):
     return payload
 
 
+def get_max_points(question: Question):
+    if not question:
+        return 0
+    if question.type in ["audio", "video"]:
+        return 2
+    if question.type in ["text", "text_multiple"]:
+        return 1
+    if question.type == "simultaneous":
+        if question.simultaneous and question.simultaneous.extra_answer:
+            return 3
+        return 2
+    return 0
+
+
 def get_question_answer_key(question: Question):
     if question.type == "audio" and question.song:
         return {
@@ -1,15 +1,53 @@
 from musicquiz.models import Quiz, Answer, Player
 from extensions import db
+from sqlalchemy import func
+
+
+def _answer_points_expr():
+    return (
+        func.coalesce(Answer.artist_points, 0.0)
+        + func.coalesce(Answer.title_points, 0.0)
+        + func.coalesce(Answer.extra_points, 0.0)
+    )
+
+
+def aggregate_scores(quiz_id=None):
+    """
+    Jedan GROUP BY prolaz preko odgovora timova jednog kviza (zadano aktivnog).
+    Počinje od timova kviza (uq_player_quiz_name), odgovori idu po ix_answer_player_round,
+    pa vrijeme ne ovisi o starim kvizovima u bazi.
+    Vraća ({player_id: ukupno}, {player_id: {runda: bodovi}}).
+    """
+    if quiz_id is None:
+        quiz_id = get_active_quiz_id()
+    rows = db.session.query(
+        Player.id,
+        Answer.round_number,
+        func.sum(_answer_points_expr()),
+    ).join(Answer, Answer.player_id == Player.id).filter(
+        Player.quiz_id == quiz_id
+    ).group_by(Player.id, Answer.round_number).all()
 
-def recompute_scores():
     totals = {}
-    for a in Answer.query.all():
-        pts = (a.artist_points or 0.0) + (a.title_points or 0.0) + (a.extra_points or 0.0)
-        totals[a.player_name] = totals.get(a.player_name, 0.0) + pts
-    for p in Player.query.all():
-        p.score = totals.get(p.name, 0.0)
-    db.session.commit()
-    return {p.name: p.score for p in Player.query.all()}
+    round_totals = {}
+    for player_id, round_number, pts in rows:
+        pts = float(pts or 0.0)
+        totals[player_id] = totals.get(player_id, 0.0) + pts
+        round_totals.setdefault(player_id, {})[round_number or 0] = pts
+    return totals, round_totals
+
 
 def get_active_quiz():
-    return Quiz.query.filter_by(is_active=True).first()
\ No newline at end of file
+    return Quiz.query.filter_by(is_active=True).first()
+
+
+def get_active_quiz_id():
+    """Id aktivnog kviza (None ako ga nema - tada timovi bez kviza)."""
+    return db.session.query(Quiz.id).filter_by(is_active=True).limit(1).scalar()
+
+
+def quiz_players_query(quiz_id=None):
+    """Timovi prijavljeni za kviz (zadano aktivni)."""
+    if quiz_id is None:
+        quiz_id = get_active_quiz_id()
+    return Player.query.filter(Player.quiz_id == quiz_id)
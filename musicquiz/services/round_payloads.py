@@ -0,0 +1,159 @@
+"""
+Prevedeni payloadi runde (round compiler).
+
+Pri početku automatske runde sva pitanja runde učitavaju se jednim upitom
+(s vezama na sadržaj, question_repository) i za svako se jednom slože
+play_audio i player_unlock_input payloadi, točan odgovor
+(screen_show_correct, player_show_answer, sažeci runde) i spec za bodovanje. Petlja runde
+(start, zaključavanje, sljedeće pitanje, sažetak) zato ne čita pitanja iz
+baze - čita samo odgovore timova.
+
+Izmjene pitanja (setup rute, admin_question_updated, naučeni aliasi) zovu
+invalidate_round_payloads(); sljedeći get() prevodi rundu iznova.
+"""
+import threading
+
+from musicquiz.services.grading_service import answer_key_spec
+from musicquiz.services.question_repository import questions_for_round
+from musicquiz.services.question_service import (
+    get_max_points,
+    get_question_answer_key,
+    get_question_display,
+    get_question_media,
+    get_question_unlock_payload,
+)
+
+
+class CompiledQuestion:
+    """Sve što petlja runde treba o jednom pitanju, bez ORM objekta."""
+
+    def __init__(self, question, index, total):
+        display = get_question_display(question)
+        media = get_question_media(question)
+        self.id = question.id
+        self.quiz_id = question.quiz_id
+        self.round_number = question.round_number
+        self.position = question.position
+        self.type = question.type
+        self.duration = question.duration
+        self.index = index
+        self.max_points = get_max_points(question)
+        self.choices = []
+        if question.type == "text_multiple" and question.text_multiple:
+            self.choices = question.text_multiple.get_choices()
+
+        self.answer_key = get_question_answer_key(question)
+        self.display_title = self.answer_key.get("title") or self.answer_key.get("choice") or ""
+        self.spec = answer_key_spec(question)
+
+        self.play = {
+            "url": media.get("url", ""),
+            "start": media.get("start", 0.0),
+            "duration": question.duration,
+            "id": question.id,
+            "question_index": index,
+            "total_questions": total,
+            "artist": display.get("artist", ""),
+            "title": display.get("title", ""),
+            "round": question.round_number,
+            "question_type": question.type,
+            "question_text": display.get("question_text", ""),
+            "extra_question": display.get("extra_question", ""),
+        }
+        self.unlock = get_question_unlock_payload(question)
+        self.summary = self._summary_row(display)
+
+    def _summary_row(self, display):
+        """Redak sažetka runde na TV-u."""
+        artist_label = display.get("artist", "")
+        title_label = display.get("title", "")
+        if self.type in ["text", "text_multiple"]:
+            artist_label = ""
+            title_label = self.display_title
+        elif self.type == "simultaneous":
+            artist_label = ""
+            title_label = self.answer_key.get("title", "")
+            extra = self.answer_key.get("extra") or ""
+            if extra:
+                title_label = f"{title_label} / {extra}"
+        return {
+            "artist": artist_label,
+            "title": title_label,
+            "question_position": display.get("order", 1),
+        }
+
+    @property
+    def answer_meta(self):
+        """(tip, runda) za answer_buffer.question_meta."""
+        return (self.type or "audio", self.round_number)
+
+
+class CompiledRound:
+    def __init__(self, quiz_id, round_number, questions):
+        self.quiz_id = quiz_id
+        self.round_number = round_number
+        self.questions = [
+            CompiledQuestion(question, index + 1, len(questions))
+            for index, question in enumerate(questions)
+        ]
+        self._by_id = {question.id: question for question in self.questions}
+        self._next = {
+            question.id: (self.questions[i + 1] if i + 1 < len(self.questions) else None)
+            for i, question in enumerate(self.questions)
+        }
+        self.summary = [question.summary for question in self.questions]
+
+    def get(self, question_id):
+        return self._by_id.get(question_id)
+
+    def next_after(self, question_id):
+        return self._next.get(question_id)
+
+
+def compile_round(quiz_id, round_number):
+    """Jedan upit za pitanja runde sa sadržajem (question_repository). Treba app context."""
+    return CompiledRound(quiz_id, round_number, questions_for_round(quiz_id, round_number))
+
+
+class RoundPayloadCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rounds = {}
+        self._generation = 0
+        self.compiles = 0
+
+    def compile(self, quiz_id, round_number):
+        """Prevodi rundu iznova (početak runde) i pamti rezultat."""
+        with self._lock:
+            generation = self._generation
+        compiled = compile_round(quiz_id, round_number)
+        with self._lock:
+            self.compiles += 1
+            # Izmjena tijekom prevođenja: ne pamti zastarjelu rundu
+            if generation == self._generation:
+                self._rounds[(quiz_id, round_number)] = compiled
+        return compiled
+
+    def get(self, quiz_id, round_number):
+        with self._lock:
+            compiled = self._rounds.get((quiz_id, round_number))
+        if compiled is not None:
+            return compiled
+        return self.compile(quiz_id, round_number)
+
+    def invalidate(self):
+        with self._lock:
+            self._rounds.clear()
+            self._generation += 1
+
+    def stats(self):
+        with self._lock:
+            return {"rounds": len(self._rounds), "compiles": self.compiles}
+
+
+round_payloads = RoundPayloadCache()
+
+
+def invalidate_round_payloads():
+    """Pozvati nakon izmjene pitanja (dodavanje, brisanje, redoslijed, točan odgovor)."""
+    round_payloads.invalidate()
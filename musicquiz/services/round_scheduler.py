@@ -0,0 +1,225 @@
+"""
+Raspored automatske runde: stanja i vremenska crta.
+
+Stanja: idle -> countdown -> question -> answer -> (question -> answer ...) -> idle.
+Svaka faza ima rok na monotonom satu (time.monotonic), pa dugačka runda
+ne "klizi" kao zbroj sleep(1) koraka. Čekanje je threading.Event.wait do
+roka ili do naredbe: pauza/nastavak, preskakanje faze i prekid runde
+bude petlju odmah, bez kašnjenja od pola sekunde do sekunde.
+
+Za vrijeme pauze rok faze se pomiče za trajanje pauze. snapshot() daje
+stanje za get_active_question_state i klijente koji se ponovno spajaju;
+started_at je "pomaknuti" početak (zidni sat), pa started_at + duration
+uvijek pokazuje stvarni kraj faze.
+
+Server ne šalje otkucaje: pri svakoj promjeni (nova faza, pauza, nastavak,
+kraj runde) zove se on_phase(snapshot) sa zidnim rokom faze (deadline), a
+klijenti odbrojavaju sami prema satu sinkroniziranom sa serverom (time_sync).
+"""
+import threading
+import time
+
+IDLE = "idle"
+COUNTDOWN = "countdown"
+QUESTION = "question"
+ANSWER = "answer"
+
+# Ishod wait_phase
+DONE = "done"
+SKIPPED = "skipped"
+ABORTED = "aborted"
+
+
+class RoundScheduler:
+    def __init__(self, clock=time.monotonic, wall_clock=time.time):
+        self._clock = clock
+        self._wall_clock = wall_clock
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._running = False
+        self._paused = False
+        self._paused_at = None
+        self._skip = False
+        self._abort = False
+        self._state = IDLE
+        self._round = None
+        self._question_id = None
+        self._duration = 0.0
+        self._deadline = None
+        self._pausable = True
+        # on_phase(snapshot) - poziva se izvan locka pri svakoj promjeni faze ili pauze
+        self.on_phase = None
+
+    # --- naredbe (socket handleri) ---
+
+    def begin(self, round_number):
+        """Zauzima raspored za novu rundu; False ako runda već traje."""
+        with self._lock:
+            if self._running:
+                return False
+            self._running = True
+            self._skip = False
+            self._abort = False
+            self._round = round_number
+            return True
+
+    def finish(self):
+        with self._lock:
+            self._running = False
+            self._state = IDLE
+            self._question_id = None
+            self._deadline = None
+            self._skip = False
+            self._abort = False
+            self._wake.set()
+        self._notify()
+
+    def pause(self):
+        with self._lock:
+            if self._paused:
+                return
+            self._paused = True
+            self._paused_at = self._clock()
+            running = self._running
+        self._wake.set()
+        if running:
+            self._notify()
+
+    def resume(self):
+        with self._lock:
+            if not self._paused:
+                return
+            paused_for = self._clock() - self._paused_at
+            if self._deadline is not None and self._pausable:
+                self._deadline += paused_for
+            self._paused = False
+            self._paused_at = None
+            running = self._running
+        self._wake.set()
+        if running:
+            self._notify()
+
+    def skip(self):
+        """Završava trenutnu fazu odmah (question -> zaključavanje, answer -> sljedeće pitanje)."""
+        with self._lock:
+            if not self._running:
+                return False
+            self._skip = True
+        self._wake.set()
+        return True
+
+    def abort(self):
+        with self._lock:
+            if not self._running:
+                return False
+            self._abort = True
+        self._wake.set()
+        return True
+
+    # --- petlja runde ---
+
+    @property
+    def running(self):
+        with self._lock:
+            return self._running
+
+    @property
+    def paused(self):
+        with self._lock:
+            return self._paused
+
+    @property
+    def aborted(self):
+        with self._lock:
+            return self._abort
+
+    def wait_while_paused(self):
+        """Prije početka pitanja: čeka nastavak. False ako je runda prekinuta."""
+        while True:
+            with self._lock:
+                if self._abort:
+                    return False
+                if not self._paused:
+                    return True
+                self._wake.clear()
+            self._wake.wait()
+
+    def wait_phase(self, state, duration, question_id=None, pausable=True):
+        """Ulazi u fazu (javlja on_phase) i čeka njezin rok. Vraća DONE, SKIPPED ili ABORTED."""
+        duration = max(0.0, float(duration or 0))
+        with self._lock:
+            now = self._clock()
+            self._state = state
+            self._duration = duration
+            self._question_id = question_id
+            self._deadline = now + duration
+            self._pausable = pausable
+            self._skip = False
+            if self._paused:
+                # Pauza iz prethodne faze ovoj fazi teče od njezina početka
+                self._paused_at = now
+        self._notify()
+
+        while True:
+            with self._lock:
+                if self._abort or self._skip or (self._deadline - self._clock() <= 0 and not self._holds()):
+                    result = ABORTED if self._abort else (SKIPPED if self._skip else DONE)
+                    self._skip = False
+                    self._deadline = None
+                    return result
+                timeout = None if self._holds() else max(0.0, self._deadline - self._clock())
+                self._wake.clear()
+            self._wake.wait(timeout)
+
+    def _holds(self):
+        """Pauzirana faza koja se može pauzirati stoji (rok se pomiče pri nastavku)."""
+        return self._paused and self._pausable
+
+    def remaining(self):
+        with self._lock:
+            return self._remaining_locked()
+
+    def _remaining_locked(self):
+        if self._deadline is None:
+            return 0.0
+        now = self._paused_at if self._holds() else self._clock()
+        return max(0.0, self._deadline - now)
+
+    def snapshot(self):
+        """
+        Stanje za reconnect / get_active_question_state / on_phase. deadline je
+        zidni kraj faze; None dok pauzirana faza stoji (tada vrijedi remaining).
+        """
+        with self._lock:
+            remaining = self._remaining_locked()
+            now = self._wall_clock()
+            started_at = None
+            deadline = None
+            if self._deadline is not None:
+                started_at = now + remaining - self._duration
+                if not self._holds():
+                    deadline = now + remaining
+            return {
+                "running": self._running,
+                "state": self._state,
+                "round": self._round,
+                "question_id": self._question_id,
+                "duration": self._duration,
+                "remaining": remaining,
+                "started_at": started_at,
+                "deadline": deadline,
+                "paused": self._paused,
+                "server_time": now,
+            }
+
+    def _notify(self):
+        listener = self.on_phase
+        if listener is None:
+            return
+        try:
+            listener(self.snapshot())
+        except Exception as e:
+            print(f"Warning: round phase listener failed: {str(e)}")
+
+
+round_scheduler = RoundScheduler()
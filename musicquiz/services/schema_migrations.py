@@ -0,0 +1,225 @@
+"""
+Male migracije sheme za postojeće baze.
+
+db.create_all() kreira samo tablice koje ne postoje; nove stupce (i
+indekse) na postojećim tablicama dodaje run_migrations() pri startu
+servera. Svaki korak je idempotentan - provjerava shemu prije izmjene -
+pa se sigurno pokreće pri svakom startu, na SQLiteu i PostgreSQL-u.
+"""
+from sqlalchemy import MetaData, inspect, text
+
+from extensions import db
+
+
+def table_columns(table):
+    return {column["name"] for column in inspect(db.session.connection()).get_columns(table)}
+
+
+def add_column(table, column, ddl):
+    """ALTER TABLE ... ADD COLUMN ako stupac ne postoji. Vraća True ako je dodan."""
+    if column in table_columns(table):
+        return False
+    db.session.execute(text(f'ALTER TABLE "{table}" ADD COLUMN "{column}" {ddl}'))
+    return True
+
+
+def table_indexes(table):
+    """{ime: (stupci)} za indekse i unique constrainte tablice."""
+    inspector = inspect(db.session.connection())
+    indexes = {index["name"]: tuple(index["column_names"]) for index in inspector.get_indexes(table)}
+    for constraint in inspector.get_unique_constraints(table):
+        indexes[constraint["name"] or f"unique_{len(indexes)}"] = tuple(constraint["column_names"])
+    return indexes
+
+
+def ensure_index(table, name, columns, unique=False):
+    """CREATE INDEX ako nijedan postojeći indeks nema te stupce kao prefiks. Vraća True ako je kreiran."""
+    columns = tuple(columns)
+    existing = table_indexes(table).values()
+    if unique and columns in existing or not unique and any(cols[:len(columns)] == columns for cols in existing):
+        return False
+    quoted = ", ".join(f'"{column}"' for column in columns)
+    kind = "UNIQUE INDEX" if unique else "INDEX"
+    db.session.execute(text(f'CREATE {kind} "{name}" ON "{table}" ({quoted})'))
+    return True
+
+
+def drop_index(table, name):
+    """DROP INDEX za indeks koji je zamijenjen drugim. Vraća True ako je obrisan."""
+    if name not in table_indexes(table):
+        return False
+    db.session.execute(text(f'DROP INDEX "{name}"'))
+    return True
+
+
+def _add_accepted_aliases():
+    """Prihvaćeni aliasi točnih odgovora (AcceptedAliasesMixin)."""
+    changed = False
+    for table in ("song", "video", "simultaneous_question", "text_question"):
+        changed |= add_column(table, "accepted_aliases", "TEXT DEFAULT ''")
+    return changed
+
+
+def rebuild_table_sqlite(model, source, expressions):
+    """
+    SQLite ne može obrisati stupac ni constraint koji ima FK ili indeks, pa se
+    tablica gradi iznova: nova tablica iz modela, INSERT ... SELECT iz stare
+    (source je FROM dio, expressions {stupac: SQL izraz}), zamjena imena.
+    Radi uz isključen PRAGMA foreign_keys (zadano), inače bi DROP kaskadirao.
+    """
+    table = model.__tablename__
+    new_table = f"{table}_new"
+    db.session.execute(text(f'DROP TABLE IF EXISTS "{new_table}"'))
+    for index in inspect(db.session.connection()).get_indexes(table):
+        db.session.execute(text(f'DROP INDEX IF EXISTS "{index["name"]}"'))
+    metadata = MetaData()
+    for referenced in {fk.column.table for fk in model.__table__.foreign_keys}:
+        referenced.to_metadata(metadata)
+    model.__table__.to_metadata(metadata, name=new_table).create(db.session.connection())
+
+    target = ", ".join(f'"{column}"' for column in expressions)
+    db.session.execute(text(
+        f'INSERT INTO "{new_table}" ({target}) SELECT {", ".join(expressions.values())} FROM {source}'
+    ))
+    db.session.execute(text(f'DROP TABLE "{table}"'))
+    db.session.execute(text(f'ALTER TABLE "{new_table}" RENAME TO "{table}"'))
+
+
+def _answer_player_id():
+    """Answer.player_name (FK na player.name) -> player_id (FK na player.id)."""
+    columns = table_columns("answer")
+    if "player_id" in columns or "player_name" not in columns:
+        return False
+    if db.engine.dialect.name == "sqlite":
+        from musicquiz.models import Answer
+
+        expressions = {
+            column.name: f'a."{column.name}"' for column in Answer.__table__.columns if column.name in columns
+        }
+        expressions["player_id"] = "p.id"
+        # Odgovori timova kojih više nema (stari zapisi bez FK provjere) se ne kopiraju
+        rebuild_table_sqlite(Answer, '"answer" a JOIN "player" p ON p.name = a.player_name', expressions)
+        return True
+    db.session.execute(text(
+        'ALTER TABLE "answer" ADD COLUMN "player_id" INTEGER REFERENCES "player" ("id") ON DELETE CASCADE'
+    ))
+    db.session.execute(text(
+        'UPDATE "answer" SET "player_id" = "player"."id" FROM "player" WHERE "player"."name" = "answer"."player_name"'
+    ))
+    db.session.execute(text('DELETE FROM "answer" WHERE "player_id" IS NULL'))
+    db.session.execute(text('ALTER TABLE "answer" ALTER COLUMN "player_id" SET NOT NULL'))
+    # Briše i indekse/constrainte koji uključuju player_name
+    db.session.execute(text('ALTER TABLE "answer" DROP COLUMN "player_name"'))
+    ensure_index("answer", "uq_answer_player_question", ("player_id", "question_id"), unique=True)
+    return True
+
+
+def _split_players_by_quiz():
+    """
+    Stari tim je mogao igrati više kvizova: prvi kviz zadržava red, za svaki
+    sljedeći nastaje kopija tima i njegovi odgovori iz tog kviza prelaze na nju.
+    Timovi bez odgovora idu u aktivni kviz; bodovi se preračunavaju po redu.
+    """
+    from musicquiz.services.quiz_service import get_active_quiz_id
+
+    pairs = db.session.execute(text(
+        'SELECT DISTINCT a.player_id, q.quiz_id FROM "answer" a JOIN "question" q ON q.id = a.question_id '
+        'ORDER BY a.player_id, q.quiz_id'
+    )).all()
+    assigned = set()
+    for player_id, quiz_id in pairs:
+        params = {"player_id": player_id, "quiz_id": quiz_id}
+        if player_id not in assigned:
+            assigned.add(player_id)
+            db.session.execute(text('UPDATE "player" SET "quiz_id" = :quiz_id WHERE "id" = :player_id'), params)
+            continue
+        db.session.execute(text(
+            'INSERT INTO "player" ("quiz_id", "name", "pin", "score", "last_active") '
+            'SELECT :quiz_id, "name", "pin", 0.0, "last_active" FROM "player" WHERE "id" = :player_id'
+        ), params)
+        db.session.execute(text(
+            'UPDATE "answer" SET "player_id" = ('
+            'SELECT copy.id FROM "player" copy JOIN "player" original ON original.name = copy.name '
+            'WHERE original.id = :player_id AND copy.quiz_id = :quiz_id) '
+            'WHERE "player_id" = :player_id AND "question_id" IN (SELECT "id" FROM "question" WHERE "quiz_id" = :quiz_id)'
+        ), params)
+
+    active_quiz_id = get_active_quiz_id()
+    if active_quiz_id is not None:
+        db.session.execute(
+            text('UPDATE "player" SET "quiz_id" = :quiz_id WHERE "quiz_id" IS NULL'), {"quiz_id": active_quiz_id}
+        )
+    db.session.execute(text(
+        'UPDATE "player" SET "score" = COALESCE((SELECT SUM(COALESCE(a.artist_points, 0) + '
+        'COALESCE(a.title_points, 0) + COALESCE(a.extra_points, 0)) FROM "answer" a WHERE a.player_id = "player"."id"), 0)'
+    ))
+
+
+def _player_quiz_id():
+    """Player dobiva quiz_id; naziv tima je jedinstven unutar kviza, ne u cijeloj bazi."""
+    columns = table_columns("player")
+    if "quiz_id" in columns:
+        return False
+    from musicquiz.models import Player
+
+    if db.engine.dialect.name == "sqlite":
+        expressions = {
+            column.name: f'"{column.name}"' for column in Player.__table__.columns if column.name in columns
+        }
+        rebuild_table_sqlite(Player, '"player"', expressions)
+    else:
+        db.session.execute(text(
+            'ALTER TABLE "player" ADD COLUMN "quiz_id" INTEGER REFERENCES "quiz" ("id") ON DELETE CASCADE'
+        ))
+        for constraint in inspect(db.session.connection()).get_unique_constraints("player"):
+            if constraint["column_names"] == ["name"]:
+                db.session.execute(text(f'ALTER TABLE "player" DROP CONSTRAINT "{constraint["name"]}"'))
+    _split_players_by_quiz()
+    ensure_index("player", "uq_player_quiz_name", ("quiz_id", "name"), unique=True)
+    return True
+
+
+def _composite_indexes():
+    """
+    Složeni indeksi za vruće upite; jednostupčani indeksi koje oni pokrivaju se brišu.
+
+    Starije baze možda nemaju uq_question_quiz_round_position (create_all ne
+    dodaje constrainte na postojeće tablice), pa se tada kreira običan indeks.
+    """
+    changed = ensure_index("question", "ix_question_quiz_round_position", ("quiz_id", "round_number", "position"))
+    changed |= ensure_index("answer", "ix_answer_player_round", ("player_id", "round_number"))
+    changed |= ensure_index("answer", "ix_answer_question", ("question_id",))
+    changed |= ensure_index("quiz", "ix_quiz_active", ("is_active",))
+    for table, name in (
+        ("question", "ix_question_quiz"),
+        ("question", "ix_question_round"),
+        ("answer", "ix_answer_player"),
+        ("answer", "ix_answer_round"),
+    ):
+        changed |= drop_index(table, name)
+    return changed
+
+
+# (ime, funkcija) redom kojim se primjenjuju; funkcija vraća True ako je nešto promijenila
+MIGRATIONS = [
+    ("accepted_aliases", _add_accepted_aliases),
+    ("answer_player_id", _answer_player_id),
+    ("player_quiz_id", _player_quiz_id),
+    ("composite_indexes", _composite_indexes),
+]
+
+
+def run_migrations():
+    """Primjenjuje sve migracije koje baza još nema. Treba app context (nakon db.create_all())."""
+    applied = []
+    for name, migrate in MIGRATIONS:
+        try:
+            if migrate():
+                applied.append(name)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            print(f"Warning: schema migration {name} failed: {str(e)}")
+    if applied:
+        print(f"Migracije sheme primijenjene: {', '.join(applied)}")
+    return applied
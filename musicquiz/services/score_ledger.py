@@ -0,0 +1,260 @@
+"""
+In-memory knjiga bodova (score ledger) za cijeli proces.
+
+Umjesto ponovnog zbrajanja cijele Answer tablice nakon svake promjene,
+bodovanje javlja samo razliku (delta) za jedan odgovor. Ledger drži, po player_id:
+- ukupne bodove i bodove po rundi za svakog igrača,
+- poredak u sortiranoj listi (bisect), pa je rang O(log n),
+- read-only pogled na ukupne bodove (MappingProxyType) koji se mijenja
+  zajedno s ledgerom, pa čitanje ljestvice ne kopira ništa.
+
+Player.score se u bazu zapisuje naknadno (write-behind) iz pozadinske
+petlje; puni preračun iz baze radi se samo pri startu ili na zahtjev.
+"""
+import bisect
+import threading
+import time
+from types import MappingProxyType
+
+from sqlalchemy import update
+
+from config import Config
+from extensions import db
+
+
+def answer_total_points(ans):
+    return float(ans.artist_points or 0.0) + float(ans.title_points or 0.0) + float(ans.extra_points or 0.0)
+
+
+class ScoreLedger:
+    """
+    Stanje je po player_id (ime tima nije ključ - isti naziv može igrati više
+    kvizova, a preimenovanje ne smije dirati bodove). Ljestvica za klijente je
+    {ime: bodovi}, pa ledger uz to drži i imena i njihov read-only pogled.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._totals = {}
+        self._rounds = {}
+        self._names = {}
+        self._board = {}
+        self._ranked = []
+        self._dirty = set()
+        self._view = MappingProxyType(self._board)
+        self._rounds_view = MappingProxyType(self._rounds)
+        self.loaded = False
+
+    # --- interno ---
+
+    def _rank_key(self, player_id):
+        return (-self._totals[player_id], self._names[player_id], player_id)
+
+    def _unrank(self, player_id):
+        key = self._rank_key(player_id)
+        idx = bisect.bisect_left(self._ranked, key)
+        if idx < len(self._ranked) and self._ranked[idx] == key:
+            del self._ranked[idx]
+
+    def _rank(self, player_id):
+        bisect.insort(self._ranked, self._rank_key(player_id))
+
+    def _touch(self, player_id):
+        self._dirty.add(player_id)
+
+    # --- punjenje ---
+
+    def load(self, totals, round_totals, names):
+        """Zamjenjuje cijelo stanje (start servera ili ručni preračun); names je {player_id: ime}."""
+        with self._lock:
+            self._names = dict(names)
+            self._totals = {player_id: float(totals.get(player_id, 0.0)) for player_id in self._names}
+            self._rounds = {
+                player_id: dict(round_totals.get(player_id, {}))
+                for player_id in self._names
+            }
+            self._board = {self._names[player_id]: score for player_id, score in self._totals.items()}
+            self._ranked = sorted(self._rank_key(player_id) for player_id in self._totals)
+            self._view = MappingProxyType(self._board)
+            self._rounds_view = MappingProxyType(self._rounds)
+            self._dirty.clear()
+            self.loaded = True
+
+    def ensure_player(self, player_id, name):
+        with self._lock:
+            if player_id in self._totals:
+                return
+            self._names[player_id] = name
+            self._totals[player_id] = 0.0
+            self._rounds[player_id] = {}
+            self._board[name] = 0.0
+            self._rank(player_id)
+
+    def remove_player(self, player_id):
+        with self._lock:
+            if player_id not in self._totals:
+                return
+            self._unrank(player_id)
+            self._board.pop(self._names[player_id], None)
+            del self._totals[player_id]
+            del self._names[player_id]
+            self._rounds.pop(player_id, None)
+            self._dirty.discard(player_id)
+
+    # --- promjene ---
+
+    def apply_delta(self, player_id, round_number, delta):
+        if not delta:
+            return
+        with self._lock:
+            if player_id not in self._totals:
+                # Tim kojeg ledger ne zna (nije iz aktivnog kviza) - bodovi su samo u bazi
+                return
+            self._unrank(player_id)
+            self._totals[player_id] += delta
+            self._board[self._names[player_id]] = self._totals[player_id]
+            self._rank(player_id)
+            rounds = self._rounds.setdefault(player_id, {})
+            round_key = round_number or 0
+            rounds[round_key] = rounds.get(round_key, 0.0) + delta
+            self._touch(player_id)
+
+    def record_answer_change(self, ans, points_before):
+        """Primijeni razliku bodova jednog odgovora (poziva se nakon promjene bodova)."""
+        self.apply_delta(ans.player_id, ans.round_number, answer_total_points(ans) - points_before)
+
+    # --- čitanje ---
+
+    def leaderboard(self):
+        """{ime: bodovi} kao živi read-only pogled, O(1). Za iteraciju iz druge dretve koristi leaderboard_copy()."""
+        return self._view
+
+    def leaderboard_copy(self):
+        """Kopija {ime: bodovi} pod lockom (sigurna za iteraciju dok se bodovi mijenjaju), O(n)."""
+        with self._lock:
+            return dict(self._board)
+
+    def totals_copy(self):
+        """Kopija {player_id: bodovi} pod lockom."""
+        with self._lock:
+            return dict(self._totals)
+
+    def ranking(self):
+        with self._lock:
+            return [(name, -neg_score) for neg_score, name, _ in self._ranked]
+
+    def rank_of(self, player_id):
+        """Rang igrača (1 = prvi); igrači s istim bodovima dijele rang."""
+        with self._lock:
+            if player_id not in self._totals:
+                return None
+            return bisect.bisect_left(self._ranked, (-self._totals[player_id],)) + 1
+
+    def score_of(self, player_id, default=0.0):
+        with self._lock:
+            return self._totals.get(player_id, default)
+
+    def name_of(self, player_id, default=None):
+        with self._lock:
+            return self._names.get(player_id, default)
+
+    def round_totals_view(self):
+        """{player_id: {runda: bodovi}} kao živi read-only pogled, O(1); unutarnje rječnike ne mijenjati."""
+        return self._rounds_view
+
+    def round_totals(self):
+        with self._lock:
+            return {player_id: dict(rounds) for player_id, rounds in self._rounds.items()}
+
+    def mark_dirty(self, player_ids):
+        with self._lock:
+            self._dirty.update(player_id for player_id in player_ids if player_id in self._totals)
+
+    def drain_dirty(self):
+        """{player_id: bodovi} promijenjenih od zadnjeg flusha."""
+        with self._lock:
+            dirty = {player_id: self._totals[player_id] for player_id in self._dirty if player_id in self._totals}
+            self._dirty.clear()
+            return dirty
+
+
+score_ledger = ScoreLedger()
+
+
+def rebuild_ledger():
+    """Puni preračun za aktivni kviz (start servera, promjena kviza ili na zahtjev). Treba app context."""
+    from musicquiz.models import Player
+    from musicquiz.services.quiz_service import aggregate_scores, get_active_quiz_id
+
+    quiz_id = get_active_quiz_id()
+    totals, round_totals = aggregate_scores(quiz_id)
+    names = dict(db.session.query(Player.id, Player.name).filter(Player.quiz_id == quiz_id).all())
+    score_ledger.load(totals, round_totals, names)
+    flush_ledger(all_players=True)
+    return score_ledger.leaderboard_copy()
+
+
+def verify_ledger():
+    """Uspoređuje ledger s punim preračunom iz baze; vraća listu odstupanja."""
+    from musicquiz.services.quiz_service import aggregate_scores
+
+    totals, _ = aggregate_scores()
+    ledger = score_ledger.totals_copy()
+    mismatches = []
+    for player_id in set(ledger) | set(totals):
+        expected = round(totals.get(player_id, 0.0), 4)
+        actual = round(ledger.get(player_id, 0.0), 4)
+        if expected != actual:
+            mismatches.append({
+                "name": score_ledger.name_of(player_id, str(player_id)),
+                "ledger": actual,
+                "database": expected,
+            })
+    return mismatches
+
+
+def flush_ledger(all_players=False):
+    """Write-behind: zapisuje promijenjene Player.score vrijednosti jednim bulk UPDATE-om."""
+    from musicquiz.models import Player
+
+    if all_players:
+        score_ledger.drain_dirty()
+        scores = score_ledger.totals_copy()
+    else:
+        scores = score_ledger.drain_dirty()
+    if not scores:
+        return 0
+
+    # Samo timovi koji još postoje (tim obrisan između delte i flusha se preskače)
+    rows = [
+        {"id": player_id, "score": scores[player_id]}
+        for (player_id,) in db.session.query(Player.id).filter(Player.id.in_(list(scores))).all()
+    ]
+    try:
+        if rows:
+            db.session.execute(update(Player), rows)
+        db.session.commit()
+    except Exception:
+        # Vrati ih u red za sljedeći flush
+        score_ledger.mark_dirty(scores.keys())
+        raise
+    return len(rows)
+
+
+def start_ledger_writer(socketio, app):
+    """Pozadinska petlja koja periodički perzistira bodove (SCORE_FLUSH_INTERVAL sekundi)."""
+    interval = max(0.1, float(Config.SCORE_FLUSH_INTERVAL))
+
+    def _loop():
+        while True:
+            time.sleep(interval)
+            with app.app_context():
+                try:
+                    flush_ledger()
+                except Exception as e:
+                    db.session.rollback()
+                    print(f"Warning: score ledger flush failed: {str(e)}")
+                finally:
+                    db.session.remove()
+
+    socketio.start_background_task(_loop)
@@ -0,0 +1,186 @@
+"""
+SQLite profil baze za večer kviza.
+
+Zadana baza je datoteka (sqlite:///kviz.db), a SQLALCHEMY_ENGINE_OPTIONS iz
+configa su pisane za PostgreSQL. Za SQLite create_app() koristi
+engine_options() i configure_engine():
+
+- svaka nova konekcija dobiva PRAGMA-e: WAL journal (čitanja ne čekaju
+  pisanje), synchronous=NORMAL (fsync samo pri checkpointu), busy_timeout,
+  cache_size, mmap_size i temp_store=MEMORY,
+- pisanja iz socket dretvi serijaliziraju se procesnim lockom (writer lock).
+
+Writer lock: pysqlite otvara transakciju tek prije prvog INSERT/UPDATE/DELETE,
+pa se lock uzima na prvoj DML naredbi i vlasnik mu je dretva koja ju je
+izvršila. Pušta ga ta ista dretva čim transakcija završi (after_commit /
+after_rollback sesije); vraćanje konekcije u pool ga pušta samo ako
+transakcija nije prošla kroz sesiju (Core konekcija) ili je konekciju
+zatvorio GC u drugoj dretvi. Dretve tako čekaju jedna drugu u Pythonu
+umjesto da se natječu za SQLite lock i nakon busy_timeouta dobiju
+"database is locked". Drugi procesi (launcher) i dalje čekaju busy_timeout.
+
+Lock skraćuje rep latencije (p95/p99) i ukupno vrijeme naleta, ali podiže
+p50 jer se commitovi čekaju u redu (tests/bench_sqlite_profile.py).
+"""
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from config import Config
+
+_DML_PREFIXES = ("INSERT", "UPDATE", "DELETE", "REPLACE")
+_WRITER_KEY = "mq_writer_lock"
+
+
+def is_sqlite(uri):
+    return (uri or "").startswith("sqlite")
+
+
+def engine_options(uri, options=None):
+    """Opcije enginea za zadani URI: za SQLite bez PostgreSQL-ovih opcija poola."""
+    options = dict(options or {})
+    if not is_sqlite(uri):
+        return options
+    options.pop("pool_pre_ping", None)
+    options.pop("max_overflow", None)
+    connect_args = dict(options.get("connect_args") or {})
+    # pysqlite timeout (sekunde) = busy handler prije nego što javi "database is locked"
+    connect_args.setdefault("timeout", Config.SQLITE_BUSY_TIMEOUT_MS / 1000.0)
+    # Konekcije iz poola koriste različite socket dretve
+    connect_args.setdefault("check_same_thread", False)
+    options["connect_args"] = connect_args
+    return options
+
+
+def sqlite_pragmas():
+    """[(pragma, vrijednost)] redom kojim se postavljaju na novu konekciju."""
+    pragmas = []
+    if Config.SQLITE_WAL:
+        pragmas.append(("journal_mode", "WAL"))
+    pragmas.extend([
+        ("synchronous", Config.SQLITE_SYNCHRONOUS),
+        ("busy_timeout", Config.SQLITE_BUSY_TIMEOUT_MS),
+        # Negativna vrijednost = KiB umjesto broja stranica
+        ("cache_size", -Config.SQLITE_CACHE_SIZE_KB),
+        ("mmap_size", Config.SQLITE_MMAP_SIZE),
+        ("temp_store", "MEMORY"),
+    ])
+    return pragmas
+
+
+class WriterLock:
+    """
+    Procesni lock pisanja za jednu transakciju; vlasnik je dretva koja je
+    prva pisala, a konekcija (connection_record.info) pamti da ga drži.
+    Običan Lock (ne RLock) da ga GC fallback smije pustiti iz druge dretve.
+    """
+
+    def __init__(self, timeout):
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._state_lock = threading.Lock()
+        self._owner = None
+        self._owner_info = None
+        self.acquired = 0
+        self.timeouts = 0
+        self.wait_seconds = 0.0
+
+    def acquire(self, info):
+        if self._owner == threading.get_ident():
+            return
+        start = time.perf_counter()
+        got = self._lock.acquire(timeout=self.timeout)
+        waited = time.perf_counter() - start
+        with self._stats_lock:
+            self.wait_seconds += waited
+            if got:
+                self.acquired += 1
+            else:
+                self.timeouts += 1
+        if got:
+            with self._state_lock:
+                self._owner = threading.get_ident()
+                self._owner_info = info
+                info[_WRITER_KEY] = True
+        else:
+            # Bez locka dalje odlučuje SQLite busy_timeout
+            print(f"Warning: writer lock not acquired in {self.timeout:.1f}s, writing without it")
+
+    def _release_if(self, owned):
+        with self._state_lock:
+            if self._owner is None or not owned():
+                return
+            self._owner_info.pop(_WRITER_KEY, None)
+            self._owner = None
+            self._owner_info = None
+            self._lock.release()
+
+    def release_owned(self):
+        """Kraj transakcije u dretvi vlasnika (commit ili rollback sesije)."""
+        self._release_if(lambda: self._owner == threading.get_ident())
+
+    def release(self, info):
+        """Konekcija se vraća u pool: pusti lock ako ga ona još drži (Core konekcija, GC)."""
+        if info.get(_WRITER_KEY):
+            self._release_if(lambda: self._owner_info is info)
+
+    def stats(self):
+        with self._stats_lock:
+            return {
+                "acquired": self.acquired,
+                "timeouts": self.timeouts,
+                "wait_ms": round(self.wait_seconds * 1000.0, 1),
+            }
+
+
+writer_lock = WriterLock(Config.SQLITE_WRITE_LOCK_TIMEOUT_MS / 1000.0)
+
+
+def _set_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in sqlite_pragmas():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if statement.lstrip()[:7].upper().startswith(_DML_PREFIXES):
+        writer_lock.acquire(conn.info)
+
+
+def _on_checkin(dbapi_connection, connection_record):
+    writer_lock.release(connection_record.info)
+
+
+def _on_transaction_end(session, *args):
+    writer_lock.release_owned()
+
+
+def configure_engine(engine, serialize_writes=None):
+    """PRAGMA-e na connect i (opcionalno) writer lock; za ne-SQLite baze ne radi ništa."""
+    if engine.dialect.name != "sqlite":
+        return False
+    if serialize_writes is None:
+        serialize_writes = Config.SQLITE_SERIALIZE_WRITES
+    event.listen(engine, "connect", _set_pragmas)
+    if serialize_writes:
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine.pool, "checkin", _on_checkin)
+        if not event.contains(Session, "after_commit", _on_transaction_end):
+            event.listen(Session, "after_commit", _on_transaction_end)
+            event.listen(Session, "after_rollback", _on_transaction_end)
+    return True
+
+
+def current_pragmas(engine):
+    """Stvarne vrijednosti PRAGMA-a na jednoj konekciji (provjera/benchmark)."""
+    values = {}
+    with engine.connect() as conn:
+        for name, _ in sqlite_pragmas():
+            values[name] = conn.exec_driver_sql(f"PRAGMA {name}").scalar()
+    return values
@@ -1,8 +1,10 @@
 from .admin_events import register_admin_events
+from .clock_events import register_clock_events
 from .player_events import register_player_events
 from .screen_events import register_screen_events
 
 def register_sockets(socketio):
     register_admin_events(socketio)
+    register_clock_events(socketio)
     register_player_events(socketio)
     register_screen_events(socketio)
\ No newline at end of file
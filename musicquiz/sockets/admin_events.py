@@ -1,16 +1,56 @@
+from config import Config
 from extensions import db, socketio
-from flask_socketio import emit
+from flask_socketio import emit, join_room
 from flask import current_app, request
 from musicquiz.models import Player, Question, Answer
-from musicquiz.services.quiz_service import get_active_quiz
+from musicquiz.services.quiz_service import get_active_quiz, quiz_players_query
 from musicquiz.services.player_status import get_all_players_data
-from musicquiz.services.grading_service import grade_answer_for_question
+from musicquiz.services.answer_buffer import answer_buffer, flush_answer_buffer
+from musicquiz.services.provisional_grading import provisional_grader
+from musicquiz.services.question_repository import get_question, questions_for_round
+from musicquiz.services.round_payloads import invalidate_round_payloads, round_payloads
+from musicquiz.services.round_scheduler import (
+    ABORTED,
+    ANSWER,
+    COUNTDOWN,
+    QUESTION,
+    round_scheduler,
+)
+from musicquiz.services.grading_service import (
+    grade_cache,
+    grade_question,
+    grade_questions_in_pool,
+    invalidate_grade_cache,
+    learn_alias_from_override,
+    normalize_cache_stats,
+    use_process_pool,
+)
+from musicquiz.services.score_ledger import (
+    answer_total_points,
+    flush_ledger,
+    rebuild_ledger,
+    score_ledger,
+    verify_ledger,
+)
 from musicquiz.services.question_service import (
-    get_question_answer_key,
-    get_question_display,
     get_question_media,
     get_question_unlock_payload,
 )
+from musicquiz.sockets.leaderboard_feed import leaderboard_feed
+from musicquiz.sockets.grading_feed import grading_feed, question_grading_rows
+from musicquiz.sockets.rooms import (
+    ADMINS,
+    EVERYONE,
+    PLAYERS,
+    SCREENS,
+    admin_required,
+    authenticate_launcher,
+    emit_stats,
+    emit_to,
+    emit_to_teams,
+    is_admin_client,
+    screen_required,
+)
 import time
 
 # Globalno stanje kviza
@@ -28,6 +68,18 @@ live_armed_clients = set()
 
 
 def get_active_question_state():
+    """Pitanje na koje se trenutno može odgovarati (automatska runda ili ručno pušteno pitanje)."""
+    scheduled = round_scheduler.snapshot()
+    if scheduled["running"]:
+        if scheduled["state"] != QUESTION or not scheduled["question_id"] or scheduled["remaining"] <= 0:
+            return None
+        return {
+            "question_id": scheduled["question_id"],
+            "started_at": scheduled["started_at"],
+            "duration": scheduled["duration"],
+            "remaining": scheduled["remaining"],
+        }
+
     if not quiz_settings.get("current_question_id"):
         return None
     if quiz_settings.get("current_question_phase") != "question":
@@ -57,346 +109,318 @@ def get_question_index(question):
     ).order_by(Question.position).all()
     return next((i + 1 for i, q in enumerate(questions) if q.id == question.id), 1)
 
-def get_max_points(question):
-    if not question:
-        return 0
-    if question.type in ["audio", "video"]:
-        return 2
-    if question.type in ["text", "text_multiple"]:
-        return 1
-    if question.type == "simultaneous":
-        if question.simultaneous and question.simultaneous.extra_answer:
-            return 3
-        return 2
-    return 0
-
 def calculate_and_broadcast_leaderboard():
-    """Centralna funkcija za izračun bodova i slanje ljestvice na TV."""
-    all_players = Player.query.all()
-    leaderboard = {}
-    
-    # Prvo ažuriramo bazu za svakog igrača
-    for p in all_players:
-        # Sumiramo sve bodove iz tablice Answer za tog igrača
-        pts = db.session.query(db.func.sum(Answer.artist_points + Answer.title_points + Answer.extra_points))\
-                .filter(Answer.player_name == p.name).scalar() or 0
-        p.score = float(pts)
-        leaderboard[p.name] = p.score
-    
-    db.session.commit()
-    socketio.emit("update_leaderboard", leaderboard)
-    return leaderboard
-
-def broadcast_grading_data():
-    """Prikuplja sve odgovore za trenutno aktivnu pjesmu i šalje ih adminu."""
-    quiz = get_active_quiz()
-    active_questions = Question.query.filter_by(quiz_id=quiz.id).all()
-    question_ids = [q.id for q in active_questions]
-    
-    answers = Answer.query.filter(Answer.question_id.in_(question_ids)).all()
-    
-    grading_payload = []
-    for ans in answers:
-        question = Question.query.get(ans.question_id)
-        grading_payload.append({
-            "id": ans.id,
-            "player_name": ans.player_name,
-            "artist_guess": ans.artist_guess,
-            "title_guess": ans.title_guess,
-            "extra_guess": ans.extra_guess,
-            "artist_points": float(ans.artist_points),
-            "title_points": float(ans.title_points),
-            "extra_points": float(ans.extra_points),
-            "question_id": ans.question_id,
-            "round_number": question.round_number if question else 0,
-            "position": question.position if question else 0,
-            "question_type": question.type if question else ""
-        })
-    
-    # Šaljemo samo adminima
-    socketio.emit("admin_receive_grading_data", grading_payload)
+    """
+    Centralna funkcija za slanje ljestvice na TV.
+    Bodovi dolaze iz score ledgera (delte), bez ponovnog zbrajanja Answer tablice;
+    klijentima ide samo razlika (leaderboard_patch), spojena unutar coalesce prozora.
+    Vraća read-only poglede (ljestvica, bodovi po rundi) bez kopiranja, da TV/admin
+    ne moraju ponovno pitati bazu.
+    """
+    leaderboard_feed.schedule(socketio)
+    return score_ledger.leaderboard(), score_ledger.round_totals_view()
 
 def finalize_round(round_num):
     """Završni auto-grade za cijelu rundu i finalno slanje ljestvice."""
     try:
+        # Odgovori koji još čekaju u spremniku moraju biti u bazi prije bodovanja
+        flush_answer_buffer()
         quiz = get_active_quiz()
-        questions = Question.query.filter_by(quiz_id=quiz.id, round_number=round_num).all()
+        questions = questions_for_round(quiz.id, round_num)
         question_map = {q.id: q for q in questions}
 
-        answers = Answer.query.filter_by(round_number=round_num).all()
+        # Po id-evima pitanja (ix_answer_question), ne po round_number - samo aktivni kviz
+        answers = Answer.query.filter(Answer.question_id.in_(list(question_map))).all() if question_map else []
+        answers_by_question = {}
         for ans in answers:
-            if ans.question_id in question_map:
-                try:
-                    grade_answer_for_question(ans, question_map[ans.question_id])
-                except Exception as e:
-                    print(f"Warning: Failed to auto-grade answer {ans.id}: {str(e)}")
+            answers_by_question.setdefault(ans.question_id, []).append(ans)
+
+        graded_in_pool = False
+        if use_process_pool(len(answers)):
+            try:
+                grade_questions_in_pool(question_map, answers_by_question)
+                graded_in_pool = True
+            except Exception as e:
+                print(f"Warning: process-pool grading failed, grading in-process: {str(e)}")
+
+        # Jedan batch po pitanju: točni odgovori se normaliziraju jednom
+        graded_rows = []
+        for question_id, question_answers in answers_by_question.items():
+            question = question_map[question_id]
+            if not graded_in_pool:
+                grade_question(question, question_answers)
+            graded_rows.extend(question_grading_rows(question, question_answers))
 
         db.session.commit()
+        flush_ledger()
         calculate_and_broadcast_leaderboard()
+        grading_feed.publish(socketio, upserts=graded_rows)
     except Exception as e:
         print(f"Error in finalize_round: {str(e)}")
 
+def player_answer_payloads(question, answers):
+    """[(player_id, player_show_answer payload)]; question je prevedeno pitanje (CompiledQuestion)."""
+    payloads = []
+    for ans in answers:
+        player_answer = {
+            "artist": ans.artist_guess or "",
+            "title": ans.title_guess or "",
+            "extra": getattr(ans, 'extra_guess', '') or "",
+            "choice": getattr(ans, 'choice_selected', -1) or -1
+        }
+        payloads.append((ans.player_id, {
+            "player_answer": player_answer,
+            "correct_answer": question.answer_key,
+            "artist_points": float(ans.artist_points or 0),
+            "title_points": float(ans.title_points or 0),
+            "extra_points": float(ans.extra_points or 0),
+            "max_points": question.max_points,
+            "choices": question.choices
+        }))
+    return payloads
+
+
+def round_summary_payloads(compiled, round_num):
+    """
+    [(player_id, player_show_round_summary payload)] za sve timove.
+
+    Jedan upit za sve odgovore runde (samo stupci, bez ORM objekata) grupiran
+    po timu u memoriji; točni odgovori dolaze iz prevedene runde. Timovi bez
+    odgovora dobivaju prazan sažetak.
+    """
+    by_player = {
+        player_id: []
+        for (player_id,) in db.session.query(Player.id).filter(Player.quiz_id == compiled.quiz_id).all()
+    }
+    rows = db.session.query(
+        Answer.player_id,
+        Answer.question_id,
+        Answer.artist_guess,
+        Answer.title_guess,
+        Answer.extra_guess,
+        Answer.artist_points,
+        Answer.title_points,
+        Answer.extra_points,
+    ).filter(Answer.question_id.in_([q.id for q in compiled.questions])).order_by(Answer.id).all()
+
+    # Dio sažetka koji ovisi samo o pitanju - jednom po pitanju, ne po odgovoru
+    keys = {
+        q.id: {
+            "question_position": q.position or 1,
+            "correct_artist": q.answer_key.get("artist", ""),
+            "correct_title": q.display_title,
+            "correct_extra": q.answer_key.get("extra", ""),
+            "max_points": q.max_points,
+            "question_type": q.type,
+        }
+        for q in compiled.questions
+    }
+    for player_id, question_id, artist_guess, title_guess, extra_guess, artist_points, title_points, extra_points in rows:
+        key = keys.get(question_id)
+        if key is None or player_id not in by_player:
+            continue
+        by_player[player_id].append(dict(
+            key,
+            artist_guess=artist_guess or "",
+            title_guess=title_guess or "",
+            extra_guess=extra_guess or "",
+            artist_points=float(artist_points or 0),
+            title_points=float(title_points or 0),
+            extra_points=float(extra_points or 0),
+        ))
+    return [
+        (player_id, {"round": round_num, "answers": answers})
+        for player_id, answers in by_player.items()
+    ]
+
 # --- GLAVNA LOGIKA KVIZA ---
 
-def auto_quiz_sequence(question_id, round_num, app):
-    """Automatska petlja: Pitanje -> Lock -> Rezultat -> Bodovanje -> Next."""
-    with app.app_context():
-        question = Question.query.get(question_id)
-        if not question:
-            return
+# Odbrojavanje prije runde (TV i mobiteli ga prikazuju sami) i prikaz točnog odgovora
+ROUND_COUNTDOWN_SECONDS = 30
+ANSWER_DISPLAY_SECONDS = 15
+
+# Funkcije faza primaju prevedeno pitanje (round_payloads) - bez čitanja pitanja iz baze
+
+def start_question(question, round_num):
+    """Faza question: pokreće pjesmu na TV-u i otključava unos timovima."""
+    # 1. EMITIRAJ POČETAK PJESME
+    started_at = time.time()
+    emit_to(socketio, "play_audio", dict(question.play, round=round_num), to=[SCREENS, ADMINS])
+
+    # Send unlockInput with question type details
+    unlock_payload = dict(question.unlock)
+    unlock_payload["question_started_at"] = started_at
+    unlock_payload["question_duration"] = question.duration
+
+    answer_buffer.open_question(question.id, meta=question.answer_meta)
+    provisional_grader.open_question(question.id, spec=question.spec)
+
+    emit_to(socketio, "player_unlock_input", unlock_payload, to=PLAYERS)
+    emit_to(socketio, "tv_start_timer", {"seconds": question.duration, "round": round_num}, to=[SCREENS, ADMINS])
+
+
+def lock_question(question, round_num):
+    """Faza answer: zaključava unos, prikazuje točan odgovor i boduje pitanje."""
+    # 2. ZAKLJUČAJ I PRIKAŽI TOČAN ODGOVOR
+    emit_to(socketio, "player_lock_input", to=PLAYERS)
+    emit_to(socketio, "round_locked", {"round": round_num}, to=ADMINS)
+    emit_to(socketio, "screen_show_correct", {
+        "id": question.id,
+        "artist": question.answer_key.get("artist", ""),
+        "title": question.display_title,
+        "round": round_num,
+        "duration": ANSWER_DISPLAY_SECONDS
+    }, to=[SCREENS, ADMINS])
+
+    # 3. POZADINSKO BODOVANJE DOK TRAJE PAUZA
+    # Prvo zapiši sve prihvaćene odgovore i zatvori pitanje za zakašnjele predaje
+    flush_answer_buffer(close_question_id=question.id)
+    provisional = provisional_grader.take(question.id, question.spec)
+    answers_to_grade = Answer.query.filter_by(question_id=question.id).all()
+    # Uz privremeno bodovanje ovdje se boduju samo odgovori promijenjeni nakon predaje
+    grader = grade_question(question, answers_to_grade, provisional=provisional, spec=question.spec)
+    if provisional_grader.enabled:
+        provisional_grader.record(grader.reused, len(answers_to_grade) - grader.reused)
+    graded_rows = question_grading_rows(question, answers_to_grade)
+    # Payloadi prije commita: nakon commita bi svaki odgovor bio ponovno učitan iz baze
+    answer_payloads = player_answer_payloads(question, answers_to_grade)
+    db.session.commit()
 
-        answer_display_seconds = 15
+    # Send individual grading to each player
+    emit_to_teams(socketio, "player_show_answer", answer_payloads)
 
-        idx = get_question_index(question)
+    # Osvježi ljestvicu uživo nakon svake pjesme
+    calculate_and_broadcast_leaderboard()
+    grading_feed.publish(socketio, upserts=graded_rows)
 
-        media = get_question_media(question)
-        media_url = media.get("url", "")
-        media_start = media.get("start", 0.0)
 
-        total_songs = Question.query.filter_by(
-            quiz_id=question.quiz_id,
-            round_number=round_num
-        ).count()
-        # 1. Ako je kviz pauziran prije početka pitanja, pričekaj nastavak
-        while quiz_settings.get("quiz_paused"):
-            time.sleep(0.2)
-
-        # 1. EMITIRAJ POČETAK PJESME
-        question_display = get_question_display(question)
-        started_at = time.time()
-        socketio.emit("play_audio", {
-            "url": media_url,
-            "start": media_start,
-            "duration": question.duration,
-            "id": question.id,
-            "question_index": idx,
-            "total_questions": total_songs,
-            "artist": question_display.get("artist", ""),
-            "title": question_display.get("title", ""),
-            "round": round_num,
-            "question_type": question.type,
-            "question_text": question_display.get("question_text", ""),
-            "extra_question": question_display.get("extra_question", ""),
-        })
+def next_question_in_round(question, round_num):
+    """Sljedeće pitanje runde iz prevedene runde (ponovno prevedene ako je setup izmijenjen)."""
+    return round_payloads.get(question.quiz_id, round_num).next_after(question.id)
 
-        # Send unlockInput with question type details
-        unlock_payload = get_question_unlock_payload(question)
-        unlock_payload["question_started_at"] = started_at
-        unlock_payload["question_duration"] = question.duration
 
-        quiz_settings["current_question_id"] = question.id
-        quiz_settings["current_question_started_at"] = unlock_payload["question_started_at"]
-        quiz_settings["current_question_duration"] = question.duration
-        quiz_settings["current_question_phase"] = "question"
+def abort_question(question, round_num):
+    """Prekid runde usred pitanja: zaključaj unos i zatvori pitanje, bez bodovanja i prikaza."""
+    emit_to(socketio, "player_lock_input", to=PLAYERS)
+    flush_answer_buffer(close_question_id=question.id)
+    provisional_grader.take(question.id, question.spec)
+    emit_to(socketio, "round_aborted", {"round": round_num, "question_id": question.id}, to=[SCREENS, ADMINS])
 
-        socketio.emit("player_unlock_input", unlock_payload)
-        socketio.emit("tv_start_timer", {"seconds": question.duration, "round": round_num})
-
-        # DINAMIČKO ČEKANJE (PJESMA)
-        elapsed = 0
-        while elapsed < question.duration:
-            if not quiz_settings["quiz_paused"]:
-                time.sleep(1)
-                elapsed += 1
-                # Slanje server-side timer update svakih sekundi
-                remaining = question.duration - elapsed
-                socketio.emit("timer_update", {
-                    "remaining": remaining,
-                    "total": question.duration,
-                    "question_id": question.id
-                })
-            else:
-                time.sleep(0.5) # Provjeravaj češće je li pauza gotova
-
-        # 2. ZAKLJUČAJ I PRIKAŽI TOČAN ODGOVOR
-        socketio.emit("player_lock_input")
-        quiz_settings["current_question_phase"] = "answer"
-        socketio.emit("round_locked", {"round": round_num})
-        answer_key = get_question_answer_key(question)
-        display_title = answer_key.get("title") or answer_key.get("choice") or ""
-        socketio.emit("screen_show_correct", {
-            "id": question.id,
-            "artist": answer_key.get("artist", ""),
-            "title": display_title,
-            "round": round_num,
-            "duration": 15
-        })
-        
-        # 3. POZADINSKO BODOVANJE DOK TRAJE PAUZA
-        answers_to_grade = Answer.query.filter_by(question_id=question_id).all()
-        for ans in answers_to_grade:
-            try:
-                grade_answer_for_question(ans, question)
-            except Exception as e:
-                print(f"Warning: Failed to auto-grade answer {ans.id} for question {question_id}: {str(e)}")
-        db.session.commit()
 
-        # Osvježi ljestvicu uživo nakon svake pjesme
-        calculate_and_broadcast_leaderboard()
-        broadcast_grading_data()
-
-        # Send individual grading to each player
-        for ans in answers_to_grade:
-            player_answer = {
-                "artist": ans.artist_guess or "",
-                "title": ans.title_guess or "",
-                "extra": getattr(ans, 'extra_guess', '') or "",
-                "choice": getattr(ans, 'choice_selected', -1) or -1
-            }
-            correct_answer = get_question_answer_key(question)
-            # Get multiple choice options if applicable
-            choices = []
-            if question.type == "text_multiple" and question.text_multiple:
-                choices = question.text_multiple.get_choices()
-
-            socketio.emit("player_show_answer", {
-                "player_answer": player_answer,
-                "correct_answer": correct_answer,
-                "artist_points": float(ans.artist_points or 0),
-                "title_points": float(ans.title_points or 0),
-                "extra_points": float(ans.extra_points or 0),
-                "max_points": get_max_points(question),
-                "choices": choices
-            }, room=ans.player_name)
-
-        # DINAMIČKO ČEKANJE (PRIKAZ ODGOVORA)
-        elapsed = 0
-        while elapsed < answer_display_seconds:
-            if not quiz_settings["quiz_paused"]:
-                time.sleep(1)
-                elapsed += 1
-                # Slanje server-side timer update svakih sekundi
-                remaining = answer_display_seconds - elapsed
-                socketio.emit("timer_update", {
-                    "remaining": remaining,
-                    "total": answer_display_seconds,
-                    "question_id": question.id,
-                    "phase": "answer_display"
-                })
-            else:
-                time.sleep(0.5)
+def finish_round(round_num):
+    """Kraj runde: završno bodovanje, sažetak na TV-u i osobni sažeci timovima."""
+    # Round is finished - show summary
+    finalize_round(round_num)
 
-        # 4. SLJEDEĆA PJESMA ILI KRAJ RUNDE
-        next_question = Question.query.filter(
-            Question.quiz_id == question.quiz_id,
-            Question.round_number == round_num,
-            Question.position > question.position
-        ).order_by(Question.position).first()
+    # Točni odgovori runde dolaze iz prevedene runde
+    quiz = get_active_quiz()
+    compiled = round_payloads.get(quiz.id, round_num)
 
-        if next_question:
-            auto_quiz_sequence(next_question.id, round_num, app)
-        else:
-            quiz_settings["current_question_id"] = None
-            quiz_settings["current_question_started_at"] = None
-            quiz_settings["current_question_duration"] = None
-            quiz_settings["current_question_phase"] = None
-            # Round is finished - show summary
-            finalize_round(round_num)
-
-            # Get all songs in this round
-            quiz = get_active_quiz()
-            questions_in_round = Question.query.filter_by(
-                quiz_id=quiz.id,
-                round_number=round_num
-            ).order_by(Question.position).all()
-
-            # Prepare round summary data for TV screen
-            round_summary = []
-            for q in questions_in_round:
-                answer_key = get_question_answer_key(q)
-                display = get_question_display(q)
-                artist_label = display.get("artist", "")
-                title_label = display.get("title", "")
-                if q.type in ["text", "text_multiple"]:
-                    artist_label = ""
-                    title_label = answer_key.get("title") or answer_key.get("choice") or ""
-                elif q.type == "simultaneous":
-                    artist_label = ""
-                    title_label = answer_key.get("title", "")
-                    extra = answer_key.get("extra") or ""
-                    if extra:
-                        title_label = f"{title_label} / {extra}"
-                round_summary.append({
-                    "artist": artist_label,
-                    "title": title_label,
-                    "question_position": display.get("order", 1)
-                })
-
-            # Emit to TV screen - show all correct answers
-            socketio.emit("screen_show_round_summary", {
-                "round": round_num,
-                "songs": round_summary
-            })
-
-            # Emit to each player their final answers for the round
-            all_players = Player.query.all()
-            for player in all_players:
-                player_answers = Answer.query.filter_by(player_name=player.name, round_number=round_num).all()
-                player_round_answers = []
-                for ans in player_answers:
-                    q = Question.query.get(ans.question_id)
-                    if q:
-                        answer_key = get_question_answer_key(q)
-                        display_title = answer_key.get("title") or answer_key.get("choice") or ""
-                        player_round_answers.append({
-                            "question_position": q.position or 1,
-                            "artist_guess": ans.artist_guess or "",
-                            "title_guess": ans.title_guess or "",
-                            "extra_guess": ans.extra_guess or "",
-                            "correct_artist": answer_key.get("artist", ""),
-                            "correct_title": display_title,
-                            "correct_extra": answer_key.get("extra", ""),
-                            "artist_points": float(ans.artist_points or 0),
-                            "title_points": float(ans.title_points or 0),
-                            "extra_points": float(ans.extra_points or 0),
-                            "max_points": get_max_points(q),
-                            "question_type": q.type
-                        })
-
-                socketio.emit("player_show_round_summary", {
-                    "round": round_num,
-                    "answers": player_round_answers
-                }, room=player.name)
-
-            socketio.emit("admin_round_finished", {"round": round_num})
-
-def auto_quiz_sequence_with_countdown(question_id, round_num, app, socketio_instance):
-    """Wrapper for auto_quiz_sequence with 30-second pre-round countdown."""
-    import time
-    # Countdown already happening on frontend, wait for it to finish
-    time.sleep(30)
-    # Then start the quiz sequence
-    auto_quiz_sequence(question_id, round_num, app)
+    # Emit to TV screen - show all correct answers
+    emit_to(socketio, "screen_show_round_summary", {
+        "round": round_num,
+        "songs": compiled.summary
+    }, to=SCREENS)
+
+    # Emit to each player their final answers for the round
+    emit_to_teams(socketio, "player_show_round_summary", round_summary_payloads(compiled, round_num))
+
+    emit_to(socketio, "admin_round_finished", {"round": round_num}, to=ADMINS)
+
+
+def emit_phase(state):
+    """
+    quiz_phase: rok faze umjesto otkucaja svake sekunde - TV, admin i launcher
+    odbrojavaju lokalno. Timovi dobivaju samo odbrojavanje prije runde.
+    """
+    to = EVERYONE if state.get("state") == COUNTDOWN else [SCREENS, ADMINS]
+    emit_to(socketio, "quiz_phase", state, to=to)
+
+
+round_scheduler.on_phase = emit_phase
+
+
+def _refresh_compiled(question, round_num):
+    """Setup izmijenjen tijekom runde - svježe prevedeno pitanje (bez upita ako nije)."""
+    return round_payloads.get(question.quiz_id, round_num).get(question.id) or question
+
+
+def run_round(question_id, round_num, app, countdown_seconds=ROUND_COUNTDOWN_SECONDS):
+    """
+    Automatska runda: countdown -> (question -> answer) za svako pitanje -> kraj runde.
+    Iterativna petlja nad round_schedulerom (pozvati nakon round_scheduler.begin()).
+    Runda se prevodi jednom na početku (round_payloads), a petlja čita samo odgovore.
+    """
+    with app.app_context():
+        try:
+            first = Question.query.get(question_id)
+            if first is None:
+                return
+            question = round_payloads.compile(first.quiz_id, round_num).get(first.id)
+            if question is None:
+                print(f"Warning: question {question_id} is not in round {round_num}")
+                return
+
+            if countdown_seconds:
+                if round_scheduler.wait_phase(COUNTDOWN, countdown_seconds, pausable=False) == ABORTED:
+                    return
+
+            while question is not None:
+                # Ako je kviz pauziran prije početka pitanja, pričekaj nastavak
+                if not round_scheduler.wait_while_paused():
+                    return
+
+                question = _refresh_compiled(question, round_num)
+                start_question(question, round_num)
+                outcome = round_scheduler.wait_phase(QUESTION, question.duration, question.id)
+                if outcome == ABORTED:
+                    abort_question(question, round_num)
+                    return
+
+                question = _refresh_compiled(question, round_num)
+                lock_question(question, round_num)
+                outcome = round_scheduler.wait_phase(ANSWER, ANSWER_DISPLAY_SECONDS, question.id)
+                if outcome == ABORTED:
+                    return
+
+                question = next_question_in_round(question, round_num)
+
+            finish_round(round_num)
+        except Exception as e:
+            print(f"Error in run_round: {str(e)}")
+        finally:
+            round_scheduler.finish()
 
 # --- SOCKET EVENTS ---
 
 def register_admin_events(socketio):
     @socketio.on("admin_start_auto_run")
+    @admin_required
     def handle_auto_run(data):
+        round_num = data.get("round", 1)
+        # Jedna runda u isto vrijeme - ponovljeni klik ne pokreće drugu petlju
+        started = round_scheduler.begin(round_num)
         emit("admin_auto_run_ack", {
-            "status": "ok",
-            "round": data.get("round", 1),
+            "status": "ok" if started else "busy",
+            "round": round_num,
             "id": data.get("id")
         })
+        if not started:
+            return
         app = current_app._get_current_object()
-        round_num = data.get("round", 1)
         quiz_settings["quiz_started"] = True
+        quiz_settings["current_question_id"] = None
 
         # Broadcast 30-second countdown before round starts
-        socketio.emit("round_countdown_start", {"round": round_num})
+        emit_to(socketio, "round_countdown_start", {"round": round_num}, to=EVERYONE)
 
-        # Start quiz after 30 second countdown
-        socketio.start_background_task(
-            auto_quiz_sequence_with_countdown,
-            data.get("id"),
-            round_num,
-            app,
-            socketio
-        )
+        # Runda kreće nakon odbrojavanja (faza countdown u round_scheduleru)
+        socketio.start_background_task(run_round, data.get("id"), round_num, app)
 
     @socketio.on("admin_play_song")
+    @admin_required
     def handle_single_play(data):
-        question = Question.query.get(data["id"])
+        question = get_question(data["id"])
         if not question:
             return
         idx = get_question_index(question)
@@ -409,6 +433,8 @@ def register_admin_events(socketio):
         unlock_payload["question_started_at"] = time.time()
         unlock_payload["question_duration"] = question.duration
 
+        answer_buffer.open_question(question.id)
+        provisional_grader.open_question(question.id)
         quiz_settings["current_question_id"] = question.id
         quiz_settings["current_question_started_at"] = unlock_payload["question_started_at"]
         quiz_settings["current_question_duration"] = question.duration
@@ -427,25 +453,62 @@ def register_admin_events(socketio):
         })
         emit("player_unlock_input", unlock_payload)
         emit("tv_start_timer", {"seconds": question.duration, "round": question.round_number})
+        # Ručno pušteno pitanje nije u round_scheduleru - rok se šalje jednom
+        started_at = unlock_payload["question_started_at"]
+        emit("quiz_phase", {
+            "running": False,
+            "state": QUESTION,
+            "round": question.round_number,
+            "question_id": question.id,
+            "duration": question.duration,
+            "remaining": question.duration,
+            "started_at": started_at,
+            "deadline": started_at + question.duration,
+            "paused": quiz_settings["quiz_paused"],
+            "server_time": time.time(),
+        })
 
     @socketio.on("admin_toggle_pause")
+    @admin_required
     def handle_toggle_pause(data):
         # Atomska operacija - postavi novu vrijednost
         new_pause_state = data.get("paused", False)
         quiz_settings["quiz_paused"] = new_pause_state
+        if new_pause_state:
+            round_scheduler.pause()
+        else:
+            round_scheduler.resume()
 
-        # Obavijesti sve (Admina, TV, Igrače) da je kviz pauziran/nastavljen
-        socketio.emit("quiz_pause_state", {
+        # Obavijesti admine i TV da je kviz pauziran/nastavljen
+        emit_to(socketio, "quiz_pause_state", {
             "paused": quiz_settings["quiz_paused"],
             "timestamp": time.time()  # Dodaj timestamp za sinkronizaciju
-        })
+        }, to=[SCREENS, ADMINS])
+
+    @socketio.on("admin_skip_phase")
+    @admin_required
+    def handle_skip_phase(data=None):
+        """Odmah završava trenutnu fazu runde (odbrojavanje, pitanje ili prikaz odgovora)."""
+        round_scheduler.skip()
+
+    @socketio.on("admin_abort_round")
+    @admin_required
+    def handle_abort_round(data=None):
+        """Prekida automatsku rundu bez završnog bodovanja (može se ponovno pokrenuti)."""
+        round_scheduler.abort()
+
+    @socketio.on("request_quiz_state")
+    def handle_quiz_state_request(data=None):
+        emit("quiz_state", round_scheduler.snapshot(), to=request.sid)
 
     @socketio.on("admin_finalize_round")
+    @admin_required
     def handle_manual_finalize(data):
         round_num = data.get("round")
         finalize_round(round_num)
 
     @socketio.on("admin_live_arm")
+    @admin_required
     def handle_live_arm(data):
         armed = bool(data.get("armed"))
         if armed:
@@ -454,52 +517,38 @@ def register_admin_events(socketio):
             live_armed_clients.discard(request.sid)
         emit("admin_live_arm_ack", {"armed": armed})
 
+    @socketio.on("connect")
+    def handle_connect(auth=None):
+        """Launcher se prijavljuje tokenom u auth payloadu; ostali klijenti spajaju se bez njega."""
+        authenticate_launcher(auth)
+
     @socketio.on("disconnect")
     def handle_disconnect():
         live_armed_clients.discard(request.sid)
 
     @socketio.on("admin_get_grading_data")
+    @admin_required
     def handle_get_grading():
-        broadcast_grading_data()
+        """Puni snapshot svih odgovora aktivnog kviza (samo tražitelju)."""
+        quiz = get_active_quiz()
+        if not quiz:
+            return
+        emit("admin_grading_snapshot", grading_feed.snapshot(quiz.id))
 
     @socketio.on("admin_request_grading")
+    @admin_required
     def handle_request_grading(data):
-        """Šalje grading podatke filtirane po rundi."""
+        """Šalje grading snapshot filtriran po rundi; dalje stižu samo delte."""
         round_num = data.get("round", 1)
         quiz = get_active_quiz()
         if not quiz:
             return
 
-        # Dohvati sve pjesme za ovu rundu i kviz
-        questions = Question.query.filter_by(quiz_id=quiz.id, round_number=round_num).all()
-        question_ids = [q.id for q in questions]
-
-        # Dohvati sve odgovore za te pjesme
-        answers = Answer.query.filter(Answer.question_id.in_(question_ids)).all()
-
-        grading_payload = []
-        question_map = {q.id: q for q in questions}
-        for ans in answers:
-            question = question_map.get(ans.question_id)
-            grading_payload.append({
-                "id": ans.id,
-                "player_name": ans.player_name,
-                "artist_guess": ans.artist_guess,
-                "title_guess": ans.title_guess,
-                "extra_guess": ans.extra_guess,
-                "artist_points": float(ans.artist_points),
-                "title_points": float(ans.title_points),
-                "extra_points": float(ans.extra_points),
-                "question_id": ans.question_id,
-                "round_number": question.round_number if question else 0,
-                "position": question.position if question else 0,
-                "question_type": question.type if question else "",
-            })
-
         # Šalje samo tražitelju (adminu)
-        emit("admin_receive_grading_data", grading_payload)
+        emit("admin_grading_snapshot", grading_feed.snapshot(quiz.id, round_num))
 
     @socketio.on("admin_update_score")
+    @admin_required
     def handle_score_update(data):
         try:
             # Validacija ulaza
@@ -522,52 +571,143 @@ def register_admin_events(socketio):
                 print(f"Answer not found: {answer_id}")
                 return
 
+            points_before = answer_total_points(ans)
             if score_type == "artist":
                 ans.artist_points = score_value
             elif score_type == "title":
                 ans.title_points = score_value
             else:
                 ans.extra_points = score_value
+            score_ledger.record_answer_change(ans, points_before)
+            question = get_question(ans.question_id)
+            updated_rows = question_grading_rows(question, [ans]) if question else []
+
+            # Ručni 1.0 za poznati drugačiji zapis -> alias, iduće bodovanje ga prepoznaje samo
+            learned_alias = None
+            if question and score_value == 1.0 and data.get("learn_alias", Config.LEARN_ALIASES):
+                guess = getattr(ans, f"{score_type}_guess", "") or ""
+                if learn_alias_from_override(question, score_type, guess):
+                    learned_alias = guess.strip()
 
             db.session.commit()
+            if learned_alias:
+                invalidate_round_payloads()
+                emit_to(socketio, "admin_alias_learned", {
+                    "question_id": question.id,
+                    "field": score_type,
+                    "alias": learned_alias,
+                }, to=ADMINS)
             # Nakon ručne promjene bodova, odmah osvježi TV
             calculate_and_broadcast_leaderboard()
-            broadcast_grading_data()
+            grading_feed.publish(socketio, upserts=updated_rows)
         except Exception as e:
             print(f"Error in handle_score_update: {str(e)}")
 
     @socketio.on("admin_delete_player")
+    @admin_required
     def handle_delete_player(data):
         player_name = data.get("player_name")
-        player = Player.query.filter_by(name=player_name).first()
+        player = quiz_players_query().filter_by(name=player_name).first()
         if player:
-            Answer.query.filter_by(player_name=player_name).delete()
+            deleted_ids = [
+                answer_id for (answer_id,) in
+                db.session.query(Answer.id).filter(Answer.player_id == player.id).all()
+            ]
+            Answer.query.filter_by(player_id=player.id).delete()
             db.session.delete(player)
             db.session.commit()
+            score_ledger.remove_player(player.id)
+            grading_feed.publish(socketio, deletes=deleted_ids)
 
-            socketio.emit("admin_update_player_list", get_all_players_data())
+            emit_to(socketio, "admin_update_player_list", get_all_players_data(), to=ADMINS)
             calculate_and_broadcast_leaderboard()
 
     @socketio.on("admin_lock_player")
+    @admin_required
     def handle_lock_player(data):
         """Zaključava igrača od daljnjeg unosa odgovora."""
         player_name = data.get("player_name")
-        player = Player.query.filter_by(name=player_name).first()
+        player = quiz_players_query().filter_by(name=player_name).first()
         if player:
             # Označi sve buduće odgovore kao zaključane za tog igrača
             # Ili možeš dodati polje "locked" u Player model ako trebaš
             print(f"Player {player_name} locked for remainder of quiz")
-            socketio.emit("admin_update_player_list", get_all_players_data())
+            emit_to(socketio, "admin_update_player_list", get_all_players_data(), to=ADMINS)
+
+    @socketio.on("admin_verify_scores")
+    @admin_required
+    def handle_verify_scores(data=None):
+        """Provjera ledgera naspram punog preračuna iz baze (opcionalno i popravak)."""
+        mismatches = verify_ledger()
+        repaired = False
+        if mismatches and (data or {}).get("repair"):
+            rebuild_ledger()
+            calculate_and_broadcast_leaderboard()
+            repaired = True
+        emit("admin_score_check", {
+            "ok": not mismatches,
+            "mismatches": mismatches,
+            "repaired": repaired,
+        })
 
     @socketio.on("admin_get_players")
+    @admin_required
     def handle_get_players():
         emit("admin_player_list_full", get_all_players_data())
-        
+
+    @socketio.on("admin_join")
+    def handle_admin_join(data=None):
+        """Admin klijent ulazi u sobu "admins" (grading, lista igrača, kontrola kviza)."""
+        allowed = is_admin_client()
+        if allowed:
+            join_room(ADMINS)
+        emit("admin_join_ack", {"ok": allowed})
+        if allowed:
+            emit("quiz_state", round_scheduler.snapshot())
+
+    @socketio.on("admin_get_emit_stats")
+    @admin_required
+    def handle_get_emit_stats(data=None):
+        """Bajtovi po eventu: stvarno poslano naspram broadcasta svim klijentima."""
+        stats = emit_stats.snapshot()
+        if (data or {}).get("reset"):
+            emit_stats.reset()
+        emit("admin_emit_stats", stats)
+
+    @socketio.on("admin_get_grading_stats")
+    @admin_required
+    def handle_get_grading_stats(data=None):
+        """Statistika cacheva bodovanja (normalizacija, memo bodova)."""
+        emit("admin_grading_stats", {
+            "normalize": normalize_cache_stats(),
+            "grades": grade_cache.stats(),
+            "provisional": provisional_grader.stats(),
+        })
+
+    @socketio.on("admin_question_updated")
+    @admin_required
+    def handle_question_updated(data):
+        """Točan odgovor je izmijenjen (npr. u launcherovom editoru) - zaboravi stare bodove i payloade."""
+        question_id = (data or {}).get("id")
+        if question_id is not None:
+            invalidate_grade_cache(int(question_id))
+        invalidate_round_payloads()
+
     @socketio.on("screen_ready")
+    @screen_required
     def handle_screen_ready():
-        calculate_and_broadcast_leaderboard()
+        """Soba "screens" dobiva izvođača i naslov već uz play_audio - samo za TV ekran s ključem ili admina."""
+        join_room(SCREENS)
+        emit("leaderboard_snapshot", leaderboard_feed.snapshot())
+        emit("quiz_state", round_scheduler.snapshot())
+
+    @socketio.on("leaderboard_request_snapshot")
+    def handle_leaderboard_snapshot_request(data=None):
+        """Klijent je primijetio rupu u seq (ili se tek spojio) - pošalji puno stanje."""
+        emit("leaderboard_snapshot", leaderboard_feed.snapshot())
 
     @socketio.on("admin_toggle_registrations")
+    @admin_required
     def handle_toggle_reg(data):
         quiz_settings["registrations_open"] = data.get("open", False)
         
@@ -579,9 +719,9 @@ def register_admin_events(socketio):
             # Možeš i hardkodirati ako server ima fiksni IP
             url = f"http://{ip_address}:5000/player"
             
-            socketio.emit("screen_show_welcome", {
+            emit_to(socketio, "screen_show_welcome", {
                 "message": "Molim da se spojite na Wi-Fi, prijavite na kviz i slobodno nešto popijete",
                 "url": url
-            })
+            }, to=SCREENS)
         else:
-            socketio.emit("screen_hide_welcome")
\ No newline at end of file
+            emit_to(socketio, "screen_hide_welcome", to=SCREENS)
\ No newline at end of file
@@ -0,0 +1,19 @@
+"""
+Sinkronizacija sata klijenata sa serverom.
+
+Klijent šalje time_sync sa svojim vremenom slanja (t0) i u acku dobiva
+server_time. Kad ack stigne (t1): rtt = t1 - t0, a pomak sata
+offset = server_time - (t0 + t1) / 2. Od nekoliko uzoraka vrijedi onaj s
+najmanjim rtt-om. S tim pomakom klijent sam odbrojava do roka iz quiz_phase.
+"""
+import time
+
+
+def register_clock_events(socketio):
+    @socketio.on("time_sync")
+    def handle_time_sync(data=None):
+        # Povratna vrijednost ide klijentu kao ack (bez emitiranja)
+        return {
+            "client_time": (data or {}).get("client_time"),
+            "server_time": time.time(),
+        }
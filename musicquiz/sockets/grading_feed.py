@@ -0,0 +1,112 @@
+"""
+Inkrementalni grading feed za admine.
+
+- "admin_grading_snapshot" {revision, round, rows}: puno stanje, šalje se adminu
+  na zahtjev (admin_request_grading / admin_get_grading_data).
+- "admin_grading_delta" {revision, upserts: [row], deletes: [answer_id]}: samo
+  promijenjeni odgovori, ključ je answer.id.
+
+Svaka delta povećava revision za 1; admin koji primijeti rupu traži novi snapshot.
+Redovi nose apsolutne vrijednosti pa je ponovna primjena iste delte bezopasna.
+"""
+import threading
+
+from extensions import db
+from musicquiz.models import Answer, Player, Question
+from musicquiz.sockets.rooms import ADMINS, emit_to
+
+
+def grading_row(ans, round_number, position, question_type, player_name):
+    return {
+        "id": ans.id,
+        "player_name": player_name,
+        "artist_guess": ans.artist_guess,
+        "title_guess": ans.title_guess,
+        "extra_guess": ans.extra_guess,
+        "artist_points": float(ans.artist_points or 0),
+        "title_points": float(ans.title_points or 0),
+        "extra_points": float(ans.extra_points or 0),
+        "question_id": ans.question_id,
+        "round_number": round_number or 0,
+        "position": position or 0,
+        "question_type": question_type or "",
+    }
+
+
+def question_grading_rows(question, answers):
+    """
+    Redovi za odgovore jednog pitanja (pitanje je već učitano); imena timova
+    dolaze jednim upitom po primarnom ključu za sve odgovore.
+    """
+    if not answers:
+        return []
+    names = dict(
+        db.session.query(Player.id, Player.name).filter(Player.id.in_({ans.player_id for ans in answers})).all()
+    )
+    return [
+        grading_row(ans, question.round_number, question.position, question.type, names.get(ans.player_id, ""))
+        for ans in answers
+    ]
+
+
+def get_grading_payload(quiz_id, round_num=None, answer_ids=None):
+    """Svi odgovori kviza (ili jedne runde / zadanih id-eva) s podacima o pitanju - jedan JOIN upit."""
+    # Samo stupci (bez ORM objekata) - za tisuće odgovora to je većina uštede
+    query = db.session.query(
+        Answer.id,
+        Player.name.label("player_name"),
+        Answer.artist_guess,
+        Answer.title_guess,
+        Answer.extra_guess,
+        Answer.artist_points,
+        Answer.title_points,
+        Answer.extra_points,
+        Answer.question_id,
+        Question.round_number.label("question_round"),
+        Question.position,
+        Question.type,
+    ).join(Question, Answer.question_id == Question.id).join(Player, Answer.player_id == Player.id)
+    if quiz_id is not None:
+        query = query.filter(Question.quiz_id == quiz_id)
+    if round_num is not None:
+        query = query.filter(Question.round_number == round_num)
+    if answer_ids is not None:
+        query = query.filter(Answer.id.in_(list(answer_ids)))
+    return [grading_row(row, row.question_round, row.position, row.type, row.player_name) for row in query.all()]
+
+
+class GradingFeed:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._revision = 0
+
+    def snapshot(self, quiz_id, round_num=None):
+        with self._lock:
+            revision = self._revision
+        return {
+            "revision": revision,
+            "round": round_num,
+            "rows": get_grading_payload(quiz_id, round_num),
+        }
+
+    def publish(self, socketio, upserts=(), deletes=()):
+        upserts = list(upserts)
+        deletes = list(deletes)
+        if not upserts and not deletes:
+            return None
+        with self._lock:
+            self._revision += 1
+            delta = {"revision": self._revision, "upserts": upserts, "deletes": deletes}
+            # Emit pod lockom da delte ne mogu izaći izvan redoslijeda
+            emit_to(socketio, "admin_grading_delta", delta, to=ADMINS)
+        return delta
+
+    def publish_answer_ids(self, socketio, answer_ids):
+        """Upsert za odgovore kojima nemamo učitano pitanje (npr. HTTP ruta)."""
+        answer_ids = list(answer_ids)
+        if not answer_ids:
+            return None
+        return self.publish(socketio, upserts=get_grading_payload(None, answer_ids=answer_ids))
+
+
+grading_feed = GradingFeed()
@@ -0,0 +1,72 @@
+"""
+Verzionirani leaderboard protokol.
+
+Umjesto cijelog {ime: bodovi} rječnika na svaku promjenu, server šalje:
+- "leaderboard_patch"    {seq, changes: {ime: bodovi}, removed: [ime]}
+- "leaderboard_snapshot" {seq, scores: {ime: bodovi}} (na zahtjev / pri spajanju)
+
+Promjene unutar LEADERBOARD_COALESCE_MS prozora spajaju se u jedan emit.
+Klijent koji primijeti rupu u seq šalje "leaderboard_request_snapshot".
+"""
+import threading
+import time
+
+from config import Config
+from musicquiz.services.score_ledger import score_ledger
+from musicquiz.sockets.rooms import EVERYONE, emit_to
+
+
+class LeaderboardFeed:
+    def __init__(self, window_ms):
+        self.window = max(0.0, float(window_ms) / 1000.0)
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._sent = {}
+        self._flush_pending = False
+
+    def schedule(self, socketio):
+        """Zabilježi da se ljestvica promijenila; emit ide najkasnije za `window` sekundi."""
+        if self.window <= 0:
+            self.flush(socketio)
+            return
+        with self._lock:
+            if self._flush_pending:
+                return
+            self._flush_pending = True
+        socketio.start_background_task(self._delayed_flush, socketio)
+
+    def _delayed_flush(self, socketio):
+        time.sleep(self.window)
+        self.flush(socketio)
+
+    def flush(self, socketio):
+        """Pošalji razliku između zadnjeg poslanog i trenutnog stanja ledgera."""
+        with self._lock:
+            self._flush_pending = False
+            current = score_ledger.leaderboard_copy()
+            changes = {
+                name: score
+                for name, score in current.items()
+                if name not in self._sent or self._sent[name] != score
+            }
+            removed = [name for name in self._sent if name not in current]
+            if not changes and not removed:
+                return None
+            self._seq += 1
+            self._sent = current
+            patch = {"seq": self._seq, "changes": changes, "removed": removed}
+            # Emit pod lockom da patchevi ne mogu izaći izvan redoslijeda
+            emit_to(socketio, "leaderboard_patch", patch, to=EVERYONE)
+        return patch
+
+    def snapshot(self):
+        """
+        Puno stanje za klijenta, označeno zadnjim poslanim seq.
+        Patchevi nose apsolutne bodove, pa je svježiji snapshot siguran za primjenu
+        sljedećeg patcha (seq + 1).
+        """
+        with self._lock:
+            return {"seq": self._seq, "scores": score_ledger.leaderboard_copy()}
+
+
+leaderboard_feed = LeaderboardFeed(Config.LEADERBOARD_COALESCE_MS)
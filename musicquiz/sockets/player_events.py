@@ -1,14 +1,40 @@
 from extensions import db
 import time
-from flask_socketio import emit, join_room
-from musicquiz.models import Player, Answer, Question
+from flask_socketio import emit
+from musicquiz.models import Player
 from musicquiz.sockets.admin_events import quiz_settings, get_active_question_state
-from flask import request
+from musicquiz.services.answer_buffer import answer_buffer, answer_fields
+from musicquiz.services.provisional_grading import provisional_grader
+from musicquiz.services.question_repository import get_question
+from musicquiz.services.quiz_service import get_active_quiz_id
+from musicquiz.services.round_scheduler import COUNTDOWN, round_scheduler
+from musicquiz.services.score_ledger import score_ledger
+from musicquiz.sockets.leaderboard_feed import leaderboard_feed
+from musicquiz.sockets.rooms import ADMINS, emit_to, join_player_rooms, team_room
+from flask import request, session
 
 def register_player_events(socketio):
 
+    # Zaključani timovi po player_id; socket nakon prijave pamti player_id u sesiji
     locked_players = set()
 
+    def _send_active_question(active_state):
+        """Pitanje je u tijeku: otključaj unos s pravim početkom (uz pomak zbog pauze)."""
+        question = get_question(active_state["question_id"])
+        if question:
+            from musicquiz.services.question_service import get_question_unlock_payload
+            payload = get_question_unlock_payload(question)
+            payload["question_started_at"] = active_state["started_at"]
+            payload["question_duration"] = active_state["duration"]
+            payload["resume"] = True
+            emit("player_unlock_input", payload, to=request.sid)
+
+    def _send_round_countdown():
+        """Odbrojavanje prije runde je u tijeku: pošalji rok da ga tim prikaže."""
+        phase = round_scheduler.snapshot()
+        if phase["running"] and phase["state"] == COUNTDOWN:
+            emit("quiz_phase", phase, to=request.sid)
+
     # ---------------------------
     # PLAYER JOIN
     # ---------------------------
@@ -21,14 +47,15 @@ def register_player_events(socketio):
         name = data["name"]
         pin = data.get("pin", "0000")
 
-        if name in locked_players:
+        quiz_id = get_active_quiz_id()
+        player = Player.query.filter_by(quiz_id=quiz_id, name=name).first()
+
+        if player and player.id in locked_players:
             emit("join_error", {"msg": "Vaš tim je zaključan za ovaj kviz."}, to=request.sid)
             return
 
-        player = Player.query.filter_by(name=name).first()
-
         if not player:
-            player = Player(name=name, pin=pin)
+            player = Player(quiz_id=quiz_id, name=name, pin=pin)
             db.session.add(player)
         else:
             if player.pin != pin:
@@ -41,27 +68,44 @@ def register_player_events(socketio):
         from musicquiz.services.player_status import live_player_status
         live_player_status[name] = "active"
 
-        join_room(name)
+        session["player_id"] = player.id
+        join_player_rooms(player.id)
         emit("join_success", {"name": name}, to=request.sid)
 
-        all_players = Player.query.all()
-        leaderboard = {p.name: p.score for p in all_players}
-        
-        # Koristimo socketio.emit (bez to=) da ode svim klijentima, uključujući TV Screen
-        socketio.emit("update_leaderboard", leaderboard)
+        # Novi tim ide svima kao leaderboard_patch, a igrač odmah dobiva puno stanje
+        score_ledger.ensure_player(player.id, name)
+        leaderboard_feed.schedule(socketio)
+        emit("leaderboard_snapshot", leaderboard_feed.snapshot(), to=request.sid)
 
         # Update admin
         from musicquiz.services.player_status import get_all_players_data
-        socketio.emit("admin_update_player_list", get_all_players_data())
+        emit_to(socketio, "admin_update_player_list", get_all_players_data(), to=ADMINS)
+
+        if active_state:
+            _send_active_question(active_state)
+        else:
+            _send_round_countdown()
 
+    # ---------------------------
+    # PLAYER REJOIN (ponovno spajanje socketa)
+    # ---------------------------
+    @socketio.on("player_rejoin")
+    def handle_rejoin(data):
+        """Nakon prekida veze novi socket mora ponovno ući u sobe tima (bez ponovne prijave)."""
+        name = (data or {}).get("name")
+        if not name:
+            return
+        player = Player.query.filter_by(quiz_id=get_active_quiz_id(), name=name).first()
+        if not player or player.id in locked_players or player.pin != data.get("pin", "0000"):
+            return
+        session["player_id"] = player.id
+        join_player_rooms(player.id)
+        # Veza je pukla usred pitanja - vrati unos s preostalim vremenom
+        active_state = get_active_question_state()
         if active_state:
-            question = Question.query.get(active_state["question_id"])
-            if question:
-                from musicquiz.services.question_service import get_question_unlock_payload
-                payload = get_question_unlock_payload(question)
-                payload["question_started_at"] = active_state["started_at"]
-                payload["question_duration"] = active_state["duration"]
-                emit("player_unlock_input", payload, to=request.sid)
+            _send_active_question(active_state)
+        else:
+            _send_round_countdown()
 
     # ---------------------------
     # PLAYER ACTIVITY UPDATE
@@ -74,9 +118,11 @@ def register_player_events(socketio):
         from musicquiz.services.player_status import live_player_status
         live_player_status[name] = status
 
-        emit(
+        emit_to(
+            socketio,
             "admin_single_player_update",
-            {"name": name, "status": status}
+            {"name": name, "status": status},
+            to=ADMINS,
         )
 
     # ---------------------------
@@ -84,13 +130,11 @@ def register_player_events(socketio):
     # ---------------------------
     @socketio.on("player_submit_answer")
     def handle_player_answer(data):
-        player_name = data["player_name"]
-        if player_name in locked_players:
+        # Tim je onaj kojim se socket prijavio, ne ime iz payloada
+        player_id = session.get("player_id")
+        if player_id is None or player_id in locked_players:
             return
         question_id = data["question_id"]
-        question = Question.query.get(question_id)
-        if not question:
-            return
 
         active_state = get_active_question_state()
         if not active_state or active_state.get("question_id") != question_id:
@@ -100,59 +144,33 @@ def register_player_events(socketio):
         if submission_time > active_state.get("duration", 0):
             return
 
-        ans = Answer.query.filter_by(
-            player_name=player_name,
-            question_id=question_id
-        ).first()
-
-        if not ans:
-            # Create new answer record
-            ans = Answer(
-                player_name=player_name,
-                question_id=question_id
-            )
-            ans.round_number = question.round_number
-            db.session.add(ans)
-
-        # Store submission time (in seconds)
-        ans.submission_time = float(submission_time)
-
-        # Update fields based on question type
-        question_type = question.type or "audio"
-        ans.artist_guess = ""
-        ans.title_guess = ""
-        ans.extra_guess = ""
-        ans.choice_selected = -1
-
-        if question_type in ["audio", "video"]:
-            ans.artist_guess = data.get("artist", "")
-            ans.title_guess = data.get("title", "")
-        elif question_type == "text":
-            ans.title_guess = data.get("title", "")
-        elif question_type == "text_multiple":
-            ans.choice_selected = int(data.get("choice", -1))
-        elif question_type == "simultaneous":
-            ans.artist_guess = data.get("artist", "")
-            ans.title_guess = data.get("title", "")
-            ans.extra_guess = data.get("extra", "")
-
-        db.session.commit()
+        meta = answer_buffer.question_meta(question_id)
+        if not meta:
+            return
+        question_type, round_number = meta
 
-        # Broadcast updated grading data to admin immediately
-        from musicquiz.sockets.admin_events import broadcast_grading_data
-        broadcast_grading_data()
+        # Odgovor ide u memorijski spremnik; u bazu ga zapisuje pozadinski flush
+        # (i flush pri zaključavanju), a admin dobiva grading deltu nakon flusha
+        fields = answer_fields(question_type, data, submission_time)
+        accepted = answer_buffer.submit(player_id, question_id, round_number, fields)
+        if accepted:
+            # Uz PROVISIONAL_GRADING boduje se odmah u pozadini, ne u ovom handleru
+            provisional_grader.submit(player_id, question_id, fields)
+        emit("answer_ack", {"question_id": question_id, "accepted": accepted}, to=request.sid)
 
     # ---------------------------
     # PLAYER CHEAT DETECTED
     # ---------------------------
     @socketio.on("player_cheat_detected")
     def handle_player_cheat(data):
-        player_name = data.get("player_name")
-        if not player_name:
+        player_id = session.get("player_id")
+        if player_id is None:
             return
-        locked_players.add(player_name)
+        locked_players.add(player_id)
+        player_name = score_ledger.name_of(player_id, (data or {}).get("player_name"))
 
         from musicquiz.services.player_status import live_player_status, get_all_players_data
-        live_player_status[player_name] = "locked"
-        socketio.emit("admin_update_player_list", get_all_players_data())
-        emit("player_lock_input", room=player_name)
\ No newline at end of file
+        if player_name:
+            live_player_status[player_name] = "locked"
+        emit_to(socketio, "admin_update_player_list", get_all_players_data(), to=ADMINS)
+        emit_to(socketio, "player_lock_input", to=team_room(player_id))
\ No newline at end of file
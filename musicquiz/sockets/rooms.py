@@ -0,0 +1,178 @@
+"""
+Socket.IO sobe po ulogama i brojač poslanih bajtova po eventu.
+
+- "admins"  - admin web sučelje (prijavljena sesija) i lokalni launcher (launcher token)
+- "screens" - TV ekrani (screen_ready; /screen otvoren s ključem ili admin sesija)
+- "players" - svi prijavljeni timovi
+- "team:<player_id>" - jedan tim (osobni rezultati, zaključavanje); po id-u,
+  jer isti naziv tima može postojati u više kvizova
+
+Sve emitiranje prema više klijenata ide kroz emit_to(), koji za svaki event
+bilježi veličinu payloada, broj primatelja i koliko bi koštao broadcast
+svim spojenim klijentima - tako se vidi koliko je fan-out smanjen.
+Osobni payloadi za mnogo timova (sažetak runde, player_show_answer) idu
+kroz emit_to_teams(), koji broj spojenih klijenata računa jednom po seriji.
+"""
+import hmac
+import json
+import threading
+from functools import wraps
+
+from flask import request, session
+from flask_socketio import join_room
+
+from config import Config
+
+ADMINS = "admins"
+SCREENS = "screens"
+PLAYERS = "players"
+EVERYONE = [ADMINS, SCREENS, PLAYERS]
+
+
+def team_room(player_id):
+    return f"team:{player_id}"
+
+
+def authenticate_launcher(auth):
+    """
+    Pri spajanju socketa: launcher šalje auth {"launcher_token": ...}.
+    Adresa klijenta se ne gleda - iza lokalnog reverse proxyja svi bi bili loopback.
+    """
+    token = (auth or {}).get("launcher_token") if isinstance(auth, dict) else None
+    if Config.LAUNCHER_TOKEN and token and hmac.compare_digest(str(token), Config.LAUNCHER_TOKEN):
+        session["launcher_admin"] = True
+
+
+def is_admin_client():
+    """Admin je prijavljena web sesija ili launcher koji se spojio s ispravnim tokenom."""
+    return bool(session.get("logged_in") or session.get("launcher_admin"))
+
+
+def admin_required(handler):
+    """Socket handler koji ne-admin klijent tiho ne može pokrenuti (kao login_required za rute)."""
+    @wraps(handler)
+    def wrapper(*args, **kwargs):
+        if not is_admin_client():
+            return None
+        return handler(*args, **kwargs)
+    return wrapper
+
+
+def is_screen_client():
+    """TV ekran je stranica /screen otvorena s ispravnim ključem (SCREEN_TOKEN) ili admin."""
+    return bool(session.get("screen_access")) or is_admin_client()
+
+
+def screen_required(handler):
+    """Kao admin_required, za evente TV ekrana."""
+    @wraps(handler)
+    def wrapper(*args, **kwargs):
+        if not is_screen_client():
+            return None
+        return handler(*args, **kwargs)
+    return wrapper
+
+
+def join_player_rooms(player_id):
+    join_room(PLAYERS)
+    join_room(team_room(player_id))
+
+
+def _room_size(socketio, room):
+    manager = socketio.server.manager
+    return sum(1 for _ in manager.get_participants("/", room))
+
+
+def _payload_bytes(data):
+    if data is None:
+        return 0
+    return len(json.dumps(data, separators=(",", ":"), default=str).encode("utf-8"))
+
+
+class EmitStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._events = {}
+
+    def record(self, event, payload_bytes, recipients, connected):
+        with self._lock:
+            stats = self._events.setdefault(event, {
+                "count": 0,
+                "payload_bytes": 0,
+                "recipients": 0,
+                "bytes_sent": 0,
+                "bytes_if_broadcast": 0,
+            })
+            stats["count"] += 1
+            stats["payload_bytes"] += payload_bytes
+            stats["recipients"] += recipients
+            stats["bytes_sent"] += payload_bytes * recipients
+            stats["bytes_if_broadcast"] += payload_bytes * connected
+
+    def snapshot(self):
+        with self._lock:
+            events = {event: dict(stats) for event, stats in self._events.items()}
+        sent = sum(s["bytes_sent"] for s in events.values())
+        broadcast = sum(s["bytes_if_broadcast"] for s in events.values())
+        return {
+            "events": events,
+            "bytes_sent": sent,
+            "bytes_if_broadcast": broadcast,
+            "saved_ratio": round(1.0 - sent / broadcast, 4) if broadcast else 0.0,
+        }
+
+    def reset(self):
+        with self._lock:
+            self._events.clear()
+
+
+emit_stats = EmitStats()
+
+
+def emit_to(socketio, event, data=None, to=None):
+    """socketio.emit prema sobi/sobama uz bilježenje bajtova po eventu."""
+    if to is None:
+        raise ValueError("emit_to requires a room; use socketio.emit for broadcasts")
+    try:
+        rooms = [to] if isinstance(to, str) else list(to)
+        recipients = len({
+            sid
+            for room in rooms
+            for sid, _ in socketio.server.manager.get_participants("/", room)
+        })
+        emit_stats.record(event, _payload_bytes(data), recipients, _room_size(socketio, None))
+    except Exception as e:
+        print(f"Warning: emit stats failed for {event}: {str(e)}")
+    if data is None:
+        socketio.emit(event, to=to)
+    else:
+        socketio.emit(event, data, to=to)
+
+
+def emit_to_teams(socketio, event, payloads):
+    """
+    Osobni payload svakom timu: payloads je [(player_id, payload)].
+
+    emit_to() po timu za svaki poziv prebrojava sve spojene klijente, pa bi
+    200 timova značilo 200 x 200 prolaza. Ovdje se broj spojenih računa
+    jednom, a timovima bez spojenog klijenta (tim nije online) se ne šalje.
+    """
+    manager = socketio.server.manager
+    try:
+        connected = _room_size(socketio, None)
+    except Exception as e:
+        print(f"Warning: emit stats failed for {event}: {str(e)}")
+        connected = 0
+    sent = 0
+    for player_id, data in payloads:
+        room = team_room(player_id)
+        recipients = sum(1 for _ in manager.get_participants("/", room))
+        if not recipients:
+            continue
+        try:
+            emit_stats.record(event, _payload_bytes(data), recipients, connected)
+        except Exception as e:
+            print(f"Warning: emit stats failed for {event}: {str(e)}")
+        socketio.emit(event, data, to=room)
+        sent += 1
+    return sent
@@ -199,62 +199,128 @@ function renderPlayerList(players) {
     });
 }
 
-// Store data globally for filtering
-let gradingData = [];
+// Grading stanje: snapshot + delte po answer.id (vidi sockets/grading_feed.py)
+const gradingById = {};
+let gradingRevision = 0;
+let gradingScopeRound = null;
+
+function gradingSortKey(row) {
+    return [row.round_number || 0, row.position || 0, (row.player_name || '').toLowerCase()];
+}
+
+function compareGradingRows(a, b) {
+    const ka = gradingSortKey(a);
+    const kb = gradingSortKey(b);
+    if (ka[0] !== kb[0]) return ka[0] - kb[0];
+    if (ka[1] !== kb[1]) return ka[1] - kb[1];
+    return ka[2].localeCompare(kb[2]);
+}
+
+function fillGradingRow(tr, row) {
+    tr.dataset.tim = row.player_name.toLowerCase();
+    tr.dataset.runda = row.round_number || '';
+    tr.dataset.pozicija = row.position || '';
+    tr.dataset.izvodjac = (row.artist_guess || '').toLowerCase();
+    tr.dataset.naslov = (row.title_guess || '').toLowerCase();
+    tr.dataset.dodatno = (row.extra_guess || '').toLowerCase();
+    const extraApplicable = row.question_type === 'simultaneous';
+    tr.innerHTML = `
+        <td class="ps-3">
+            <div class="fw-bold text-info">${row.player_name}</div>
+            <small class="text-secondary">ID: ${row.question_id}</small>
+        </td>
+        <td class="text-center">
+            <span class="badge bg-warning text-dark">${row.round_number || '-'}</span>
+        </td>
+        <td class="text-center">
+            <span class="badge bg-info text-dark">${row.position || '-'}</span>
+        </td>
+        <td>
+            <div class="text-white small mb-1">Izvođač: <strong>${row.artist_guess || '-'}</strong></div>
+            ${generateScoreBtns(row.id, 'artist', row.artist_points)}
+        </td>
+        <td>
+            <div class="text-white small mb-1">Naslov: <strong>${row.title_guess || '-'}</strong></div>
+            ${generateScoreBtns(row.id, 'title', row.title_points)}
+        </td>
+        <td>
+            <div class="text-white small mb-1">Dodatno: <strong>${row.extra_guess || '-'}</strong></div>
+            ${generateScoreBtns(row.id, 'extra', row.extra_points, !extraApplicable)}
+        </td>
+    `;
+}
+
+function createGradingRow(row) {
+    const tr = document.createElement('tr');
+    tr.id = `grading-row-${row.id}`;
+    tr.className = 'align-middle border-bottom border-secondary grading-row';
+    fillGradingRow(tr, row);
+    return tr;
+}
+
+function renderGradingSnapshot(data) {
+    gradingRevision = data.revision || 0;
+    gradingScopeRound = data.round ?? null;
+    Object.keys(gradingById).forEach(id => delete gradingById[id]);
+    const rows = data.rows || [];
+    rows.forEach(row => { gradingById[row.id] = row; });
 
-function renderGradingTableServerShape(data) {
-    gradingData = data || []; // Store for filtering
     const tbody = document.getElementById('gradingBody');
     if (!tbody) return;
     tbody.innerHTML = "";
 
-    if (!data || data.length === 0) {
-        tbody.innerHTML = '<tr><td colspan="6" class="p-4 text-center text-muted">Čekam prve odgovore...</td></tr>';
+    if (rows.length === 0) {
+        tbody.innerHTML = '<tr id="grading-empty"><td colspan="6" class="p-4 text-center text-muted">Čekam prve odgovore...</td></tr>';
         return;
     }
 
     // Sortiranje: prvo po rundi, pa po poziciji, pa po imenu igrača
-    data.sort((a, b) => {
-        if (a.round_number !== b.round_number) return a.round_number - b.round_number;
-        if (a.position !== b.position) return a.position - b.position;
-        return a.player_name.localeCompare(b.player_name);
+    rows.sort(compareGradingRows).forEach(row => tbody.appendChild(createGradingRow(row)));
+    LIVE.filterTable();
+}
+
+function upsertGradingRow(tbody, row) {
+    const existing = document.getElementById(`grading-row-${row.id}`);
+    const previous = gradingById[row.id];
+    gradingById[row.id] = row;
+
+    if (existing && previous && compareGradingRows(previous, row) === 0) {
+        fillGradingRow(existing, row);
+        return existing;
+    }
+    if (existing) existing.remove();
+
+    // Umetni na sortirano mjesto bez ponovnog crtanja tablice
+    const tr = createGradingRow(row);
+    const before = Array.from(tbody.querySelectorAll('.grading-row')).find(el => {
+        const other = gradingById[el.id.replace('grading-row-', '')];
+        return other && compareGradingRows(row, other) < 0;
     });
+    tbody.insertBefore(tr, before || null);
+    return tr;
+}
 
-    data.forEach(row => {
-        const tr = document.createElement('tr');
-        tr.className = 'align-middle border-bottom border-secondary grading-row';
-        tr.dataset.tim = row.player_name.toLowerCase();
-        tr.dataset.runda = row.round_number || '';
-        tr.dataset.pozicija = row.position || '';
-        tr.dataset.izvodjac = (row.artist_guess || '').toLowerCase();
-        tr.dataset.naslov = (row.title_guess || '').toLowerCase();
-        tr.dataset.dodatno = (row.extra_guess || '').toLowerCase();
-        const extraApplicable = row.question_type === 'simultaneous';
-        tr.innerHTML = `
-            <td class="ps-3">
-                <div class="fw-bold text-info">${row.player_name}</div>
-                <small class="text-secondary">ID: ${row.question_id}</small>
-            </td>
-            <td class="text-center">
-                <span class="badge bg-warning text-dark">${row.round_number || '-'}</span>
-            </td>
-            <td class="text-center">
-                <span class="badge bg-info text-dark">${row.position || '-'}</span>
-            </td>
-            <td>
-                <div class="text-white small mb-1">Izvođač: <strong>${row.artist_guess || '-'}</strong></div>
-                ${generateScoreBtns(row.id, 'artist', row.artist_points)}
-            </td>
-            <td>
-                <div class="text-white small mb-1">Naslov: <strong>${row.title_guess || '-'}</strong></div>
-                ${generateScoreBtns(row.id, 'title', row.title_points)}
-            </td>
-            <td>
-                <div class="text-white small mb-1">Dodatno: <strong>${row.extra_guess || '-'}</strong></div>
-                ${generateScoreBtns(row.id, 'extra', row.extra_points, !extraApplicable)}
-            </td>
-        `;
-        tbody.appendChild(tr);
+function applyGradingDelta(data) {
+    if (data.revision <= gradingRevision) return;
+    if (data.revision !== gradingRevision + 1) {
+        // Propuštena delta - zatraži puni snapshot
+        socket.emit('admin_request_grading', { round: currentRound });
+        return;
+    }
+    gradingRevision = data.revision;
+
+    const tbody = document.getElementById('gradingBody');
+    if (!tbody) return;
+    document.getElementById('grading-empty')?.remove();
+
+    (data.deletes || []).forEach(id => {
+        delete gradingById[id];
+        document.getElementById(`grading-row-${id}`)?.remove();
+    });
+    (data.upserts || []).forEach(row => {
+        if (gradingScopeRound !== null && row.round_number !== gradingScopeRound) return;
+        const tr = upsertGradingRow(tbody, row);
+        LIVE.filterRow(tr);
     });
 }
 
@@ -476,9 +542,11 @@ socket.on('admin_single_player_update', (d) => {
 });
 
 // Podaci za ocjenjivanje (Grading)
-socket.on('admin_receive_grading_data', (data) => {
-    renderGradingTableServerShape(data);
-});
+// Soba "admins" - grading delte, lista igrača i kontrola kviza idu samo adminima
+socket.on('connect', () => socket.emit('admin_join'));
+
+socket.on('admin_grading_snapshot', (data) => renderGradingSnapshot(data));
+socket.on('admin_grading_delta', (data) => applyGradingDelta(data));
 
 socket.on('admin_round_finished', (data) => {
     const finishedRound = data.round || currentRound;
@@ -536,34 +604,24 @@ LIVE.lockPlayer = function(playerName) {
     }
 };
 
+function currentGradingFilters() {
+    const value = (id) => (document.getElementById(id)?.value || '').toLowerCase();
+    return {
+        tim: value('filterTim'),
+        runda: value('filterRunda'),
+        pozicija: value('filterPozicija'),
+        izvodjac: value('filterIzvodjac'),
+        naslov: value('filterNaslov'),
+        dodatno: value('filterDodatno'),
+    };
+}
+
+LIVE.filterRow = function(row, filters = currentGradingFilters()) {
+    const matches = Object.keys(filters).every(key => (row.dataset[key] || '').includes(filters[key]));
+    row.style.display = matches ? '' : 'none';
+};
+
 LIVE.filterTable = function() {
-    const filterTim = document.getElementById('filterTim').value.toLowerCase();
-    const filterRunda = document.getElementById('filterRunda').value.toLowerCase();
-    const filterPozicija = document.getElementById('filterPozicija').value.toLowerCase();
-    const filterIzvodjac = document.getElementById('filterIzvodjac').value.toLowerCase();
-    const filterNaslov = document.getElementById('filterNaslov').value.toLowerCase();
-    const filterDodatno = document.getElementById('filterDodatno').value.toLowerCase();
-
-    const rows = document.querySelectorAll('.grading-row');
-    rows.forEach(row => {
-        const tim = row.dataset.tim || '';
-        const runda = row.dataset.runda || '';
-        const pozicija = row.dataset.pozicija || '';
-        const izvodjac = row.dataset.izvodjac || '';
-        const naslov = row.dataset.naslov || '';
-        const dodatno = row.dataset.dodatno || '';
-
-        const matchTim = tim.includes(filterTim);
-        const matchRunda = runda.includes(filterRunda);
-        const matchPozicija = pozicija.includes(filterPozicija);
-        const matchIzvodjac = izvodjac.includes(filterIzvodjac);
-        const matchNaslov = naslov.includes(filterNaslov);
-        const matchDodatno = dodatno.includes(filterDodatno);
-
-        if (matchTim && matchRunda && matchPozicija && matchIzvodjac && matchNaslov && matchDodatno) {
-            row.style.display = '';
-        } else {
-            row.style.display = 'none';
-        }
-    });
-};
\ No newline at end of file
+    const filters = currentGradingFilters();
+    document.querySelectorAll('.grading-row').forEach(row => LIVE.filterRow(row, filters));
+};
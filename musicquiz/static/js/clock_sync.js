@@ -0,0 +1,57 @@
+// Sinkronizacija sata sa serverom (time_sync) - zajedničko za TV i igrače.
+// offset = server_time - (t0 + t1) / 2; od nekoliko uzoraka vrijedi onaj s najmanjim RTT-om.
+// ClockSync.now() je "serversko" vrijeme u sekundama, pa se rokovi iz quiz_phase
+// (deadline) odbrojavaju lokalno bez otkucaja sa servera.
+const ClockSync = (() => {
+    const SAMPLES = 5;
+    const SAMPLE_TIMEOUT_MS = 3000;
+    const RESYNC_MS = 5 * 60 * 1000;
+
+    let offset = 0;
+    let rtt = null;
+    let resyncTimer = null;
+
+    function sample(socket) {
+        return new Promise((resolve) => {
+            const t0 = Date.now() / 1000;
+            socket.timeout(SAMPLE_TIMEOUT_MS).emit('time_sync', { client_time: t0 }, (err, data) => {
+                const t1 = Date.now() / 1000;
+                if (err || !data || typeof data.server_time !== 'number') {
+                    resolve(null);
+                    return;
+                }
+                resolve({ rtt: t1 - t0, offset: data.server_time - (t0 + t1) / 2 });
+            });
+        });
+    }
+
+    async function sync(socket) {
+        let best = null;
+        for (let i = 0; i < SAMPLES; i++) {
+            const s = await sample(socket);
+            if (s && (!best || s.rtt < best.rtt)) best = s;
+        }
+        if (best) {
+            offset = best.offset;
+            rtt = best.rtt;
+        }
+    }
+
+    function start(socket) {
+        socket.on('connect', () => sync(socket));
+        if (socket.connected) sync(socket);
+        clearInterval(resyncTimer);
+        resyncTimer = setInterval(() => {
+            if (socket.connected) sync(socket);
+        }, RESYNC_MS);
+    }
+
+    return {
+        start,
+        now: () => Date.now() / 1000 + offset,
+        // Preostale sekunde do roka faze (serversko vrijeme)
+        remaining: (deadline) => Math.max(0, deadline - (Date.now() / 1000 + offset)),
+        get offset() { return offset; },
+        get rtt() { return rtt; },
+    };
+})();
@@ -1,4 +1,5 @@
 const socket = io();
+ClockSync.start(socket);
 
 // --- GLOBALNE VARIJABLE ---
 let myName = "";
@@ -9,7 +10,7 @@ let wakeLock = null;  // Wake Lock API reference
 let isAnswerLocked = false;  // Anti-cheat: track if answers are locked
 let cheatDetected = false;  // Track if cheating was detected
 let countdownInterval = null;
-let countdownRemaining = 0;
+let countdownDeadline = null;  // kraj odbrojavanja prije runde (serversko vrijeme)
 
 
 // --- INICIJALIZACIJA (QR KOD LOGIN ILI LOKALNO SAČUVANA PRIJAVA) ---
@@ -120,10 +121,39 @@ socket.on('join_error', d => {
     document.getElementById('game-screen').classList.add('d-none');
 });
 
-socket.on('update_leaderboard', (allScores) => {
-    if (myName && allScores[myName] !== undefined) {
-        document.getElementById('my-score').innerText = allScores[myName];
+// Ljestvica: puni snapshot + verzionirani patchevi (igrač prati samo svoj rezultat)
+let leaderboardSeq = 0;
+
+socket.on('connect', () => {
+    // Novi socket nakon prekida veze mora ponovno ući u sobe tima
+    if (myName) {
+        socket.emit('player_rejoin', {
+            name: myName,
+            pin: localStorage.getItem('playerPin') || '0000'
+        });
+    }
+    socket.emit('leaderboard_request_snapshot');
+});
+
+function setMyScore(scores) {
+    if (myName && scores && scores[myName] !== undefined) {
+        document.getElementById('my-score').innerText = scores[myName];
+    }
+}
+
+socket.on('leaderboard_snapshot', (data) => {
+    leaderboardSeq = data.seq || 0;
+    setMyScore(data.scores);
+});
+
+socket.on('leaderboard_patch', (data) => {
+    if (data.seq <= leaderboardSeq) return;
+    if (data.seq !== leaderboardSeq + 1) {
+        socket.emit('leaderboard_request_snapshot');
+        return;
     }
+    leaderboardSeq = data.seq;
+    setMyScore(data.changes);
 });
 
 function stopPlayerCountdown() {
@@ -135,16 +165,17 @@ function stopPlayerCountdown() {
     if (wrap) wrap.classList.add('d-none');
 }
 
-function startPlayerCountdown(seconds, roundNum) {
+function startPlayerCountdown(seconds, roundNum, deadline = null) {
     stopPlayerCountdown();
-    countdownRemaining = Math.max(0, parseInt(seconds, 10) || 30);
+    countdownDeadline = deadline !== null ? deadline : ClockSync.now() + Math.max(0, parseInt(seconds, 10) || 30);
+    const countdownRemaining = () => Math.ceil(ClockSync.remaining(countdownDeadline) - 0.001);
 
     const wrap = document.getElementById('player-countdown');
     const val = document.getElementById('player-countdown-value');
     const round = document.getElementById('player-countdown-round');
 
     if (round) round.textContent = String(roundNum || 1);
-    if (val) val.textContent = String(countdownRemaining);
+    if (val) val.textContent = String(countdownRemaining());
     if (wrap) wrap.classList.remove('d-none');
 
     document.getElementById('answer-sheet').classList.add('d-none');
@@ -155,10 +186,10 @@ function startPlayerCountdown(seconds, roundNum) {
     document.getElementById('cheat-warning-overlay').classList.add('d-none');
 
     countdownInterval = setInterval(() => {
-        countdownRemaining -= 1;
-        if (val) val.textContent = String(Math.max(0, countdownRemaining));
+        const remaining = countdownRemaining();
+        if (val) val.textContent = String(Math.max(0, remaining));
 
-        if (countdownRemaining <= 0) {
+        if (remaining <= 0) {
             stopPlayerCountdown();
             const sheet = document.getElementById('answer-sheet');
             if (sheet) {
@@ -170,7 +201,7 @@ function startPlayerCountdown(seconds, roundNum) {
                     </div>`;
             }
         }
-    }, 1000);
+    }, 250);
 }
 
 function renderAnswerResult(data) {
@@ -221,10 +252,15 @@ function renderAnswerResult(data) {
 
 // 1. Nova pjesma počinje -> Otključaj i prikaži polja prema tipu pitanja
 socket.on('player_unlock_input', (data) => {
+    // Ponovno spajanje usred istog pitanja: zadrži već upisane odgovore
+    if (data.resume && data.question_id === currentQuestionId && !isAnswerLocked) {
+        questionStartTime = data.question_started_at || questionStartTime;
+        return;
+    }
     stopPlayerCountdown();
     currentQuestionId = data.question_id;
     currentQuestionType = data.question_type || "audio";  // Default to audio
-    questionStartTime = data.question_started_at || (Date.now() / 1000);  // Record start time in seconds
+    questionStartTime = data.question_started_at || ClockSync.now();  // Record start time in seconds (server clock)
     isAnswerLocked = false;  // Reset lock state for new question
     cheatDetected = false;  // Reset cheat detection
 
@@ -391,7 +427,7 @@ function submitAnswer(forceSubmit = false) {
     if (submitBtn && submitBtn.disabled) return; // Locked
 
     // Calculate submission time (in seconds from question start)
-    const submissionTime = (Date.now() / 1000) - questionStartTime;
+    const submissionTime = ClockSync.now() - questionStartTime;
 
     let answerData = {
         player_name: myName,
@@ -433,6 +469,14 @@ function submitAnswer(forceSubmit = false) {
     if (status) status.style.opacity = '1';
 }
 
+// Server potvrđuje predaju odmah (odgovor se u bazu zapisuje u pozadini)
+socket.on('answer_ack', (data) => {
+    if (data && data.accepted === false) {
+        const status = document.getElementById('save-status');
+        if (status) status.style.opacity = '0';
+    }
+});
+
 // --- LOGOUT FUNCTION ---
 function logout() {
     // Obriši sačuvane kredencijale
@@ -771,4 +815,14 @@ socket.on('round_countdown_start', (data) => {
     const seconds = data.seconds || 30;
     const roundNum = data.round || 1;
     startPlayerCountdown(seconds, roundNum);
+});
+
+// Rok odbrojavanja sa servera (stiže odmah nakon round_countdown_start i pri ponovnom spajanju)
+socket.on('quiz_phase', (data) => {
+    if (!data || data.state !== 'countdown' || data.deadline === null || data.deadline === undefined) return;
+    if (countdownInterval) {
+        countdownDeadline = data.deadline;
+    } else {
+        startPlayerCountdown(data.remaining, data.round || 1, data.deadline);
+    }
 });
\ No newline at end of file
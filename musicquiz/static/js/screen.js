@@ -1,15 +1,21 @@
 const socket = io();
+ClockSync.start(socket);
 
 // Stanje ekrana
 let timerInterval = null;
 let currentRemaining = 0;
 let currentTotal = 0;
 let isPaused = false;
+// Tajmer se iscrtava lokalno prema roku faze (serversko vrijeme, ClockSync)
+let phaseDeadline = null;
+let frozenRemaining = null;   // preostalo vrijeme dok faza stoji (pauza)
+let phaseFromServer = false;  // rok je iz quiz_phase (inače lokalni startTimer)
+const TIMER_FRAME_MS = 250;
+const TIMED_PHASES = ['countdown', 'question', 'answer'];
 let defaultGameAreaHtml = "";
 
 document.addEventListener("DOMContentLoaded", () => {
     console.log("📺 TV Screen Initialized");
-    socket.emit('screen_ready');
 
     const gameArea = document.getElementById('game-area');
     if (gameArea && !defaultGameAreaHtml) {
@@ -35,23 +41,43 @@ socket.on('quiz_pause_state', (data) => {
     if (isPaused) {
         console.log("⏸️ Kviz pauziran");
         if (vis) vis.classList.add('paused');
-        // Ne čistimo interval nego ga samo 'preskačemo' u startTimer logici
     } else {
         console.log("▶️ Kviz nastavljen");
         if (vis) vis.classList.remove('paused');
     }
+
+    // Rok iz quiz_phase već uključuje pauzu; lokalni tajmer stoji dok traje pauza
+    if (phaseFromServer) return;
+    if (isPaused && frozenRemaining === null && phaseDeadline !== null) {
+        frozenRemaining = ClockSync.remaining(phaseDeadline);
+    } else if (!isPaused && frozenRemaining !== null) {
+        phaseDeadline = ClockSync.now() + frozenRemaining;
+        frozenRemaining = null;
+    }
 });
 
-// --- TIMER SYNCHRONIZATION FROM SERVER ---
-socket.on('timer_update', (data) => {
-    if (data && data.phase === 'answer_display') {
+// --- FAZA RUNDE SA SERVERA (rok umjesto otkucaja svake sekunde) ---
+function applyPhase(data) {
+    if (!data || !TIMED_PHASES.includes(data.state)) {
+        if (phaseFromServer) clearInterval(timerInterval);
+        phaseFromServer = false;
         return;
     }
-    // Sync client timer with server time
-    currentRemaining = data.remaining;
-    currentTotal = data.total || currentTotal;
-    updateTimerUI();
-});
+    phaseFromServer = true;
+    currentTotal = data.duration || currentTotal;
+    if (data.deadline === null || data.deadline === undefined) {
+        // Pauzirana faza stoji - server šalje novi rok pri nastavku
+        phaseDeadline = null;
+        frozenRemaining = data.remaining || 0;
+    } else {
+        phaseDeadline = data.deadline;
+        frozenRemaining = null;
+    }
+    runTimer();
+}
+
+socket.on('quiz_phase', applyPhase);
+socket.on('quiz_state', applyPhase);
 
 // --- 1.5 PRE-ROUND COUNTDOWN (30 SECONDS) ---
 socket.on('round_countdown_start', (data) => {
@@ -209,28 +235,81 @@ socket.on('screen_show_correct', (data) => {
     ansContainer.classList.remove('d-none');
 });
 
-// --- 4. LEADERBOARD (Usklađeno sa screen_events.py) ---
-socket.on('update_leaderboard', (data) => {
+// --- 4. LEADERBOARD (verzionirani patchevi, vidi leaderboard_feed.py) ---
+let leaderboardSeq = 0;
+const leaderboardScores = {};
+const leaderboardRows = {};
+
+// Nakon (ponovnog) spajanja uvijek kreni od punog stanja
+// screen_ready ulazi u sobu "screens" (i na svakom ponovnom spajanju) i vraća snapshot ljestvice
+socket.on('connect', () => socket.emit('screen_ready'));
+
+socket.on('leaderboard_snapshot', (data) => {
+    leaderboardSeq = data.seq || 0;
+    Object.keys(leaderboardScores).forEach(name => {
+        if (!(name in data.scores)) removeLeaderboardRow(name);
+    });
+    Object.entries(data.scores || {}).forEach(([name, score]) => upsertLeaderboardRow(name, score));
+    sortLeaderboard();
+});
+
+socket.on('leaderboard_patch', (data) => {
+    if (data.seq <= leaderboardSeq) return; // Već primijenjeno
+    if (data.seq !== leaderboardSeq + 1) {
+        // Propušten patch - zatraži puno stanje
+        socket.emit('leaderboard_request_snapshot');
+        return;
+    }
+    leaderboardSeq = data.seq;
+    (data.removed || []).forEach(name => removeLeaderboardRow(name));
+    Object.entries(data.changes || {}).forEach(([name, score]) => upsertLeaderboardRow(name, score));
+    sortLeaderboard();
+});
+
+function upsertLeaderboardRow(name, score) {
     const container = document.getElementById('leaderboard-body');
     if (!container) return;
-    
-    container.innerHTML = "";
-    
-    // Pretvaramo objekt u array i sortiramo po bodovima
-    const players = Object.entries(data)
-        .map(([name, score]) => ({ name, score }))
-        .sort((a, b) => b.score - a.score);
+    leaderboardScores[name] = score;
 
-    players.forEach((player, index) => {
-        const row = document.createElement('div');
+    let row = leaderboardRows[name];
+    if (!row) {
+        row = document.createElement('div');
         row.className = "lb-row d-flex justify-content-between align-items-center animate__animated animate__fadeInUp";
         row.innerHTML = `
-            <span>${index + 1}. ${player.name}</span>
-            <span class="fw-bold text-warning">${player.score}</span>
+            <span><span class="lb-rank"></span> <span class="lb-name"></span></span>
+            <span class="lb-score fw-bold text-warning"></span>
         `;
+        row.querySelector('.lb-name').textContent = name;
+        leaderboardRows[name] = row;
         container.appendChild(row);
+    }
+    row.querySelector('.lb-score').textContent = score;
+}
+
+function removeLeaderboardRow(name) {
+    const row = leaderboardRows[name];
+    if (row) row.remove();
+    delete leaderboardRows[name];
+    delete leaderboardScores[name];
+}
+
+function sortLeaderboard() {
+    const container = document.getElementById('leaderboard-body');
+    if (!container) return;
+
+    const ordered = Object.keys(leaderboardScores)
+        .sort((a, b) => leaderboardScores[b] - leaderboardScores[a]);
+
+    // Premještamo postojeće elemente samo ako nisu već na svom mjestu
+    ordered.forEach((name, index) => {
+        const row = leaderboardRows[name];
+        if (!row) return;
+        row.querySelector('.lb-rank').textContent = `${index + 1}.`;
+        if (container.children[index] !== row) {
+            container.insertBefore(row, container.children[index] || null);
+        }
     });
-});
+}
 
 // --- 5. PRIJAVE (WELCOME SCREEN) ---
 socket.on('screen_show_welcome', (data) => {
@@ -294,24 +373,29 @@ socket.on('screen_show_round_summary', (data) => {
 
 // --- POMOĆNE FUNKCIJE ZA TAJMER ---
 
+// Lokalni rok dok ne stigne quiz_phase (i za ručno puštena pitanja)
 function startTimer(seconds) {
-    clearInterval(timerInterval);
-    currentRemaining = seconds;
+    phaseFromServer = false;
     currentTotal = seconds;
+    phaseDeadline = ClockSync.now() + seconds;
+    // AKO JE KVIZ PAUZIRAN, TAJMER STOJI
+    frozenRemaining = isPaused ? seconds : null;
+    runTimer();
+}
 
-    updateTimerUI();
-
-    timerInterval = setInterval(() => {
-        // AKO JE KVIZ PAUZIRAN, TAJMER STOJI
-        if (!isPaused) {
-            currentRemaining--;
-            updateTimerUI();
+function runTimer() {
+    clearInterval(timerInterval);
+    renderTimer();
+    timerInterval = setInterval(renderTimer, TIMER_FRAME_MS);
+}
 
-            if (currentRemaining <= 0) {
-                clearInterval(timerInterval);
-            }
-        }
-    }, 1000);
+function renderTimer() {
+    const remaining = frozenRemaining !== null ? frozenRemaining : ClockSync.remaining(phaseDeadline);
+    currentRemaining = Math.ceil(remaining - 0.001);
+    updateTimerUI();
+    if (frozenRemaining === null && remaining <= 0) {
+        clearInterval(timerInterval);
+    }
 }
 
 function updateTimerUI() {
@@ -0,0 +1,136 @@
+"""
+Benchmark: nalet predaja odgovora (player_submit_answer) u zadnjim sekundama pjesme.
+
+Uspoređuje stari handler (SELECT + izmjena + COMMIT po predaji) s
+write-behind spremnikom (submit u memoriju + jedan bulk flush pri
+zaključavanju). Predaje šalje WORKERS dretvi istovremeno, kao threading
+async mode; svaki tim redom predaje RESUBMITS puta (zadnja predaja vrijedi).
+
+Mjeri se latencija handlera (p50/p95) i ukupno vrijeme dok nisu svi
+odgovori u bazi.
+
+    python tests/bench_answer_burst.py
+"""
+import statistics
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
+from bench_utils import make_bench_app, print_table, reset_db, seed_quiz
+
+TEAM_COUNTS = (100, 300)
+RESUBMITS = 2
+WORKERS = 8
+
+
+def legacy_submit(question_id, player, data, submission_time):
+    """Kopija starog handlera bez socket emitova (tim traži po imenu)."""
+    from extensions import db
+    from musicquiz.models import Answer, Player, Question
+
+    question = Question.query.get(question_id)
+    player_id = db.session.query(Player.id).filter_by(name=player[1]).scalar()
+    ans = Answer.query.filter_by(player_id=player_id, question_id=question_id).first()
+    if not ans:
+        ans = Answer(player_id=player_id, question_id=question_id)
+        ans.round_number = question.round_number
+        db.session.add(ans)
+    ans.submission_time = float(submission_time)
+    ans.artist_guess = data.get("artist", "")
+    ans.title_guess = data.get("title", "")
+    ans.extra_guess = ""
+    ans.choice_selected = -1
+    db.session.commit()
+
+
+def buffered_submit(question_id, player, data, submission_time):
+    """Handler uz spremnik: player_id dolazi iz socket sesije."""
+    from musicquiz.services.answer_buffer import answer_buffer, answer_fields
+
+    question_type, round_number = answer_buffer.question_meta(question_id)
+    answer_buffer.submit(player[0], question_id, round_number, answer_fields(question_type, data, submission_time))
+
+
+def run_burst(app, submit, question_id, players):
+    from extensions import db
+
+    def _team(player):
+        # Jedan mobitel šalje svoje predaje redom; timovi međusobno paralelno
+        latencies = []
+        with app.app_context():
+            try:
+                for attempt in range(RESUBMITS):
+                    start = time.perf_counter()
+                    submit(question_id, player, {"artist": f"izvodjac {attempt}", "title": f"pjesma {player[1]}"},
+                           25.0 + attempt)
+                    latencies.append((time.perf_counter() - start) * 1000.0)
+            finally:
+                db.session.remove()
+        return latencies
+
+    with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+        return [ms for latencies in pool.map(_team, players) for ms in latencies]
+
+
+def p95(samples):
+    return sorted(samples)[max(0, int(len(samples) * 0.95) - 1)]
+
+
+def main():
+    warnings.filterwarnings("ignore", message=".*Query.get.*")
+    app = make_bench_app()
+    from extensions import db
+    from musicquiz.models import Answer, Player, Question
+    from musicquiz.services.answer_buffer import answer_buffer, flush_answer_buffer
+
+    rows = []
+    for n_teams in TEAM_COUNTS:
+        results = {}
+        for label, submit in (("legacy", legacy_submit), ("buffered", buffered_submit)):
+            with app.app_context():
+                reset_db()
+                seed_quiz(n_teams, rounds=1, questions_per_round=2, answered_ratio=0.0)
+                question_id = Question.query.order_by(Question.id).first().id
+                players = [tuple(row) for row in db.session.query(Player.id, Player.name).order_by(Player.name).all()]
+                answer_buffer.open_question(question_id)
+
+            start = time.perf_counter()
+            latencies = run_burst(app, submit, question_id, players)
+            with app.app_context():
+                if label == "buffered":
+                    # Flush pri zaključavanju (lock_question prije bodovanja)
+                    flush_answer_buffer(close_question_id=question_id)
+                total_ms = (time.perf_counter() - start) * 1000.0
+
+                stored = {
+                    a.player_id: a.artist_guess
+                    for a in Answer.query.filter_by(question_id=question_id).all()
+                }
+                assert len(stored) == n_teams, f"{label}: {len(stored)} odgovora umjesto {n_teams}"
+                assert set(stored.values()) == {f"izvodjac {RESUBMITS - 1}"}, f"{label}: nije spremljena zadnja predaja"
+                db.session.remove()
+            results[label] = (statistics.median(latencies), p95(latencies), total_ms)
+
+        legacy, buffered = results["legacy"], results["buffered"]
+        rows.append((
+            n_teams,
+            n_teams * RESUBMITS,
+            f"{legacy[0]:.2f}",
+            f"{buffered[0]:.3f}",
+            f"{legacy[1]:.2f}",
+            f"{buffered[1]:.3f}",
+            f"{legacy[2]:.0f}",
+            f"{buffered[2]:.0f}",
+            f"{legacy[2] / buffered[2]:.1f}x" if buffered[2] else "-",
+        ))
+
+    print_table((
+        "teams", "submits",
+        "legacy p50 ms", "buffered p50 ms",
+        "legacy p95 ms", "buffered p95 ms",
+        "legacy total ms", "buffered total ms", "speedup",
+    ), rows)
+
+
+if __name__ == "__main__":
+    main()
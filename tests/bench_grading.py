@@ -0,0 +1,406 @@
+"""
+Micro-benchmark bodovanja (grading_service) nad realističnim korpusom odgovora.
+
+Korpus: izvođači i naslovi u stilu imena datoteka iz songs/
+("04_-_Azra_-_Tko_to_tamo_pjeva.mp3" - čitaju se postojeće datoteke i
+ugrađeni popis ex-Yu pjesama s dijakritikom), a pokušaji timova su točni
+odgovori s tipfelerima, bez dijakritike, s "feat." i zagradama, skraćeni
+ili krivi.
+
+Mjeri _normalize (hladan i topao LRU), _sim, auto_grade_answer,
+grade_answer_for_question i finalize_round (privremena SQLite baza), za
+svaki backend sličnosti. Za svaku mjeru ispisuje ops/s (medijan) i
+alokacije iz zasebnog prolaza pod tracemallocom (vrh i zadržani bajtovi).
+
+    python tests/bench_grading.py --json grading.json
+    python tests/bench_grading.py --baseline grading.json    # izlaz 1 ako je nešto sporije
+
+--baseline uspoređuje ops/s s ranijim izvještajem; pad veći od --tolerance
+(zadano 25 %) je regresija.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import re
+import statistics
+import sys
+import time
+import tracemalloc
+import unicodedata
+import warnings
+
+from bench_utils import ROOT_DIR, make_bench_app, print_table, reset_db
+
+SONGS_DIR = os.path.join(ROOT_DIR, "songs")
+_FILENAME_RE = re.compile(r"^\d+_-_(?P<artist>.+?)_-_(?P<title>.+)\.(mp3|mp4|m4a|wav|ogg)$", re.IGNORECASE)
+
+# Isti stil kao songs/: redni broj, izvođač i naslov odvojeni s "_-_"
+BUILTIN_FILENAMES = (
+    "01_-_Đorđe_Balašević_-_Računajte_na_nas.mp3",
+    "02_-_Riblja_Čorba_-_Lutka_sa_naslovne_strane.mp3",
+    "03_-_Bijelo_dugme_-_Đurđevdan.mp3",
+    "04_-_Prljavo_kazalište_-_Mojoj_majci.mp3",
+    "05_-_Parni_valjak_-_Jesen_u_meni.mp3",
+    "06_-_Zabranjeno_pušenje_-_Zenica_blues.mp3",
+    "07_-_Električni_orgazam_-_Igra_rokenrol_cela_Jugoslavija.mp3",
+    "08_-_Haustor_-_Moja_prva_ljubav.mp3",
+    "09_-_Oliver_Dragojević_-_Cesarica.mp3",
+    "10_-_Gibonni_-_Činim_pravu_stvar.mp3",
+    "11_-_Crvena_jabuka_-_Tugo_nesrećo.mp3",
+    "12_-_Plavi_orkestar_-_Suada.mp3",
+    "13_-_Ekatarina_Velika_-_Zemlja.mp3",
+    "14_-_Film_-_Pun_mjesec_nad_Dubrovnikom.mp3",
+    "15_-_Idoli_-_Maljčiki.mp3",
+    "16_-_Šarlo_akrobata_-_Ona_se_budi.mp3",
+    "17_-_Leb_i_sol_-_Skopje.mp3",
+    "18_-_Novi_fosili_-_Šuti_moj_dječače_plavi.mp3",
+    "19_-_Doris_Dragović_-_Marija_Magdalena.mp3",
+    "20_-_Hladno_pivo_-_Šank.mp3",
+    "21_-_Let_3_-_Ero_s_onoga_svijeta.mp3",
+    "22_-_Dino_Merlin_&_Vesna_Zmijanac_-_Kad_zamirišu_jorgovani.mp3",
+    "23_-_Magazin_-_Ginem.mp3",
+    "24_-_Severina_-_Dalmatinka.mp3",
+    "25_-_Psihomodo_pop_-_Ja_volim_samo_sebe.mp3",
+    "26_-_Massimo_-_Lagano_umirem.mp3",
+    "27_-_Tony_Cetinski_-_Laku_noć_svima.mp3",
+    "28_-_Kemal_Monteno_-_Sarajevo_ljubavi_moja.mp3",
+    "29_-_Dubioza_kolektiv_feat._Manu_Chao_-_Cross_the_line.mp3",
+    "30_-_Vatra_-_Tko_je_tu_lud.mp3",
+)
+
+WRONG_GUESSES = ("ne znam", "nemam pojma", "queen", "abba", "nesto od azre", "?")
+BRACKET_NOISE = (" (live)", " (uživo 1989)", " (remix)", " [remaster]", " (radio edit)", " (akustično)")
+FEAT_NOISE = (" feat. Gibonni", " ft. Severina", " feat Massimo", " & Tony Cetinski")
+
+TEAMS = 120
+QUESTIONS = 12
+FINALIZE_TEAMS = 100
+FINALIZE_QUESTIONS = 10
+
+
+# ---------------------------
+# KORPUS
+# ---------------------------
+
+def parse_song_filename(filename):
+    """(izvođač, naslov) iz imena u stilu songs/ ili None."""
+    match = _FILENAME_RE.match(filename)
+    if not match:
+        return None
+    return match.group("artist").replace("_", " ").strip(), match.group("title").replace("_", " ").strip()
+
+
+def load_song_names():
+    filenames = list(BUILTIN_FILENAMES)
+    if os.path.isdir(SONGS_DIR):
+        filenames.extend(sorted(os.listdir(SONGS_DIR)))
+    names = []
+    for filename in filenames:
+        parsed = parse_song_filename(filename)
+        if parsed and parsed not in names:
+            names.append(parsed)
+    return names
+
+
+def strip_diacritics(text):
+    text = text.replace("đ", "dj").replace("Đ", "Dj")
+    return "".join(ch for ch in unicodedata.normalize("NFKD", text) if not unicodedata.combining(ch))
+
+
+def typo(rng, text):
+    if len(text) < 3:
+        return text
+    i = rng.randrange(1, len(text) - 1)
+    kind = rng.random()
+    if kind < 0.3:
+        return text[:i] + text[i + 1:]
+    if kind < 0.6:
+        return text[:i] + text[i + 1] + text[i] + text[i + 2:]
+    if kind < 0.8:
+        return text[:i] + rng.choice("aeioukrnst") + text[i + 1:]
+    return text[:i] + rng.choice("aeioukrnst") + text[i:]
+
+
+def noisy_guess(rng, correct, songs):
+    """Pokušaj tima za zadani točan odgovor."""
+    roll = rng.random()
+    if roll < 0.04:
+        return ""
+    if roll < 0.14:
+        if rng.random() < 0.5:
+            return rng.choice(WRONG_GUESSES)
+        return rng.choice(rng.choice(songs))
+    guess = correct
+    if rng.random() < 0.4:
+        guess = strip_diacritics(guess)
+    if rng.random() < 0.5:
+        guess = guess.lower()
+    for _ in range(rng.choice((0, 0, 1, 1, 2))):
+        guess = typo(rng, guess)
+    if rng.random() < 0.1:
+        guess = guess + rng.choice(FEAT_NOISE)
+    if rng.random() < 0.1:
+        guess = guess + rng.choice(BRACKET_NOISE)
+    if rng.random() < 0.08 and " " in guess:
+        guess = guess.split(" ", 1)[0]
+    if rng.random() < 0.05:
+        guess = f"  {guess.upper()}!! "
+    return guess
+
+
+class _Obj:
+    pass
+
+
+def build_corpus(songs, n_teams, n_questions, seed):
+    """Pitanja (audio, kao ORM objekti bez baze) i odgovori timova po pitanju."""
+    rng = random.Random(seed)
+    questions = []
+    answers = []
+    answer_id = 0
+    for question_id, (artist, title) in enumerate(rng.sample(songs, min(n_questions, len(songs))), start=1):
+        question = _Obj()
+        question.id = question_id
+        question.type = "audio"
+        question.duration = 30.0
+        question.song = _Obj()
+        question.song.artist = artist
+        question.song.title = title
+        questions.append(question)
+        for team in range(n_teams):
+            answer_id += 1
+            ans = _Obj()
+            ans.id = answer_id
+            ans.player_id = team
+            ans.round_number = 1
+            ans.question_id = question_id
+            ans.artist_guess = noisy_guess(rng, artist, songs)
+            ans.title_guess = noisy_guess(rng, title, songs)
+            ans.extra_guess = ""
+            ans.choice_selected = -1
+            ans.submission_time = rng.uniform(0, 30)
+            ans.artist_points = ans.title_points = ans.extra_points = 0.0
+            answers.append(ans)
+    return questions, answers
+
+
+def seed_finalize_round(songs, n_teams, n_questions, seed):
+    """Aktivni kviz s jednom rundom iz korpusa u privremenoj bazi (za finalize_round)."""
+    from extensions import db
+    from musicquiz.models import Answer, Player, Question, Quiz, Song
+
+    questions, answers = build_corpus(songs, n_teams, n_questions, seed)
+    quiz = Quiz(title="Grading Bench Quiz", is_active=True)
+    db.session.add(quiz)
+    db.session.flush()
+    ids = {}
+    for position, source in enumerate(questions, start=1):
+        question = Question(quiz_id=quiz.id, round_number=1, position=position, type="audio", duration=30.0)
+        db.session.add(question)
+        db.session.flush()
+        db.session.add(Song(question_id=question.id, filename=f"bench_{position}.mp3",
+                            artist=source.song.artist, title=source.song.title))
+        ids[source.id] = question.id
+    players = {}
+    for team in range(n_teams):
+        players[team] = Player(quiz_id=quiz.id, name=f"Tim {team:04d}", pin="0000")
+    db.session.add_all(players.values())
+    db.session.flush()
+    db.session.execute(Answer.__table__.insert(), [
+        {
+            "player_id": players[ans.player_id].id,
+            "question_id": ids[ans.question_id],
+            "round_number": 1,
+            "artist_guess": ans.artist_guess,
+            "title_guess": ans.title_guess,
+            "extra_guess": "",
+            "submission_time": ans.submission_time,
+        }
+        for ans in answers
+    ])
+    db.session.commit()
+    return len(answers)
+
+
+# ---------------------------
+# MJERENJE
+# ---------------------------
+
+def measure(fn, ops, setup=None, repeat=5):
+    """ops/s iz medijana `repeat` mjerenja i alokacije iz jednog prolaza pod tracemallocom."""
+    samples = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    median = statistics.median(samples)
+
+    if setup:
+        setup()
+    tracemalloc.start()
+    try:
+        fn()
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "ops": ops,
+        "median_ms": round(median * 1000.0, 3),
+        "ops_per_sec": round(ops / median, 1) if median else None,
+        "peak_alloc_bytes": peak,
+        "retained_bytes": retained,
+        "alloc_bytes_per_op": round(peak / ops, 1) if ops else None,
+    }
+
+
+def run_backend(backend, songs, args, app):
+    from extensions import db
+    from musicquiz.models import Answer
+    from musicquiz.services import grading_service
+    from musicquiz.services.score_ledger import rebuild_ledger
+    from musicquiz.sockets.admin_events import finalize_round
+
+    grading_service.set_similarity_backend(backend)
+    questions, answers = build_corpus(songs, args.teams, args.questions, args.seed)
+    songs_by_question = {question.id: question.song for question in questions}
+    question_by_id = {question.id: question for question in questions}
+    raw_strings = [s for ans in answers for s in (ans.artist_guess, ans.title_guess)]
+    raw_strings += [s for question in questions for s in (question.song.artist, question.song.title)]
+    pairs = [
+        (guess, gold)
+        for ans in answers
+        for guess, gold in (
+            (ans.artist_guess, songs_by_question[ans.question_id].artist),
+            (ans.title_guess, songs_by_question[ans.question_id].title),
+        )
+    ]
+
+    def normalize_all():
+        for s in raw_strings:
+            grading_service._normalize(s)
+
+    def sim_all():
+        for guess, gold in pairs:
+            grading_service._sim(guess, gold)
+
+    def auto_grade_all():
+        for ans in answers:
+            grading_service.auto_grade_answer(ans, songs_by_question[ans.question_id])
+
+    def grade_each():
+        for ans in answers:
+            grading_service.grade_answer_for_question(ans, question_by_id[ans.question_id])
+
+    def cold_caches():
+        grading_service.clear_normalize_cache()
+        grading_service.grade_cache.clear()
+
+    results = {
+        "_normalize (cold)": measure(normalize_all, len(raw_strings), setup=grading_service.clear_normalize_cache,
+                                     repeat=args.repeat),
+        "_normalize (warm)": measure(normalize_all, len(raw_strings), repeat=args.repeat),
+        "_sim": measure(sim_all, len(pairs), repeat=args.repeat),
+        "auto_grade_answer": measure(auto_grade_all, len(answers), setup=cold_caches, repeat=args.repeat),
+        "grade_answer_for_question": measure(grade_each, len(answers), setup=cold_caches, repeat=args.repeat),
+    }
+
+    with app.app_context():
+        reset_db()
+        n_answers = seed_finalize_round(songs, args.finalize_teams, args.finalize_questions, args.seed)
+
+        def reset_round():
+            # Nebodovana runda i hladni cachevi - kao finalize_round nakon restarta
+            db.session.remove()
+            Answer.query.update({"artist_points": 0.0, "title_points": 0.0, "extra_points": 0.0})
+            db.session.commit()
+            rebuild_ledger()
+            cold_caches()
+
+        results["finalize_round"] = measure(lambda: finalize_round(1), n_answers, setup=reset_round,
+                                            repeat=max(1, args.repeat // 2))
+        db.session.remove()
+    return results
+
+
+def compare(report, baseline, tolerance):
+    """[(backend, mjera, staro, novo, promjena)] za mjere sporije od tolerancije."""
+    regressions = []
+    for backend, results in report["results"].items():
+        for name, values in results.items():
+            old = baseline.get("results", {}).get(backend, {}).get(name, {}).get("ops_per_sec")
+            new = values.get("ops_per_sec")
+            if old and new and new < old * (1.0 - tolerance):
+                regressions.append((backend, name, old, new, f"{(new / old - 1.0) * 100:.1f}%"))
+    return regressions
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Micro-benchmark bodovanja s realističnim korpusom")
+    parser.add_argument("--backend", action="append", choices=("difflib", "indel"),
+                        help="backend sličnosti (može više puta; zadano oba)")
+    parser.add_argument("--teams", type=int, default=TEAMS)
+    parser.add_argument("--questions", type=int, default=QUESTIONS)
+    parser.add_argument("--finalize-teams", type=int, default=FINALIZE_TEAMS)
+    parser.add_argument("--finalize-questions", type=int, default=FINALIZE_QUESTIONS)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="spremi izvještaj u JSON datoteku")
+    parser.add_argument("--baseline", help="raniji JSON izvještaj za usporedbu")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="dopušteni pad ops/s (udio)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    warnings.filterwarnings("ignore", message=".*Query.get.*")
+    # App prije grading_service: Config čita DATABASE_URL pri importu
+    app = make_bench_app()
+
+    songs = load_song_names()
+    backends = args.backend or ["difflib", "indel"]
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "songs": len(songs),
+            "teams": args.teams,
+            "questions": args.questions,
+            "finalize_teams": args.finalize_teams,
+            "finalize_questions": args.finalize_questions,
+            "repeat": args.repeat,
+            "seed": args.seed,
+        },
+        "results": {},
+    }
+    for backend in backends:
+        report["results"][backend] = run_backend(backend, songs, args, app)
+
+    rows = [
+        (backend, name, values["ops"], f"{values['ops_per_sec']:.0f}", f"{values['median_ms']:.2f}",
+         f"{values['peak_alloc_bytes'] / 1024:.1f}", values["alloc_bytes_per_op"])
+        for backend, results in report["results"].items()
+        for name, values in results.items()
+    ]
+    print_table(("backend", "benchmark", "ops", "ops/s", "median ms", "peak KiB", "B/op"), rows)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        if regressions:
+            print_table(("backend", "benchmark", "baseline ops/s", "ops/s", "change"), regressions)
+            sys.exit(1)
+        print(f"OK: nema pada većeg od {args.tolerance:.0%} u odnosu na {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
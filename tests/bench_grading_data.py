@@ -0,0 +1,99 @@
+"""
+Benchmark: grading tablica za admina (nekadašnji broadcast_grading_data,
+danas snapshot iz grading_feed.get_grading_payload).
+
+Stara verzija radi Question.query.get po svakom odgovoru (N+1),
+nova jedan JOIN upit. Scenariji: 50x30, 100x60 i 200x60 (timova x pitanja).
+
+    python tests/bench_grading_data.py
+"""
+import warnings
+
+from bench_utils import count_queries, make_bench_app, print_table, reset_db, seed_quiz, time_call
+
+SCENARIOS = (
+    (50, 3, 10),
+    (100, 3, 20),
+    (200, 3, 20),
+)
+
+
+def legacy_grading_payload():
+    """Kopija stare implementacije (Question.query.get po odgovoru)."""
+    from extensions import db
+    from musicquiz.models import Answer, Player, Question
+    from musicquiz.services.quiz_service import get_active_quiz
+
+    quiz = get_active_quiz()
+    # Ime tima je nekad bilo stupac odgovora - ovdje jedan upit za sva imena
+    names = dict(db.session.query(Player.id, Player.name).filter(Player.quiz_id == quiz.id).all())
+    question_ids = [q.id for q in Question.query.filter_by(quiz_id=quiz.id).all()]
+    answers = Answer.query.filter(Answer.question_id.in_(question_ids)).all()
+    payload = []
+    for ans in answers:
+        question = Question.query.get(ans.question_id)
+        payload.append({
+            "id": ans.id,
+            "player_name": names.get(ans.player_id),
+            "artist_guess": ans.artist_guess,
+            "title_guess": ans.title_guess,
+            "extra_guess": ans.extra_guess,
+            "artist_points": float(ans.artist_points),
+            "title_points": float(ans.title_points),
+            "extra_points": float(ans.extra_points),
+            "question_id": ans.question_id,
+            "round_number": question.round_number if question else 0,
+            "position": question.position if question else 0,
+            "question_type": question.type if question else "",
+        })
+    return payload
+
+
+def main():
+    warnings.filterwarnings("ignore", message=".*Query.get.*")
+    app = make_bench_app()
+    from extensions import db
+    from musicquiz.services.quiz_service import get_active_quiz
+    from musicquiz.sockets.grading_feed import get_grading_payload
+
+    def joined_payload():
+        return get_grading_payload(get_active_quiz().id)
+
+    def fresh(fn):
+        # Prazna identity map, kao u novom socket handleru
+        def _run():
+            db.session.expunge_all()
+            return fn()
+        return _run
+
+    rows = []
+    with app.app_context():
+        for n_players, rounds, per_round in SCENARIOS:
+            reset_db()
+            seed_quiz(n_players, rounds=rounds, questions_per_round=per_round)
+
+            with count_queries() as legacy_q:
+                legacy = fresh(legacy_grading_payload)()
+            with count_queries() as joined_q:
+                joined = fresh(joined_payload)()
+            key = lambda r: r["id"]
+            assert sorted(legacy, key=key) == sorted(joined, key=key), "Payload se razlikuje!"
+
+            legacy_ms, _ = time_call(fresh(legacy_grading_payload), repeat=3)
+            joined_ms, _ = time_call(fresh(joined_payload), repeat=3)
+            rows.append((
+                f"{n_players}x{rounds * per_round}",
+                len(joined),
+                legacy_q["n"],
+                joined_q["n"],
+                f"{legacy_ms:.1f}",
+                f"{joined_ms:.1f}",
+                f"{legacy_ms / joined_ms:.1f}x" if joined_ms else "-",
+            ))
+
+    print_table(("teams x questions", "answers", "legacy queries", "joined queries",
+                 "legacy ms", "joined ms", "speedup"), rows)
+
+
+if __name__ == "__main__":
+    main()
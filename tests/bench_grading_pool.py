@@ -0,0 +1,181 @@
+"""
+Benchmark: bodovanje runde u procesu naspram process poola (finalize_round).
+
+Za rastuće runde (timovi x 15 pitanja) mjeri bodovanje grade_question po
+pitanju u jednom procesu i grade_questions_in_pool s POOL_WORKERS procesa.
+Svako mjerenje boduje novu varijantu runde (drugi točni odgovori), pa memo
+cache ne pomaže ni u glavnom ni u radnim procesima, a pokušaji su većinom
+različiti (tipfeleri) - najgori slučaj, npr. finalize_round nakon restarta.
+Ispisuje točku prijeloza za GRADING_POOL_MIN_ANSWERS: najmanju veličinu od
+koje je pool barem MIN_SPEEDUP puta brži na njoj i na svim većim veličinama.
+Ako takve nema, pool treba ostati isključen (GRADING_PROCESSES=0).
+
+Pool se pokreće prije mjerenja (start radnih procesa nije uključen).
+
+    python tests/bench_grading_pool.py
+"""
+import os
+import random
+
+from bench_utils import ROOT_DIR, print_table, time_call  # noqa: F401
+
+from musicquiz.services import grading_service
+from musicquiz.services.score_ledger import score_ledger
+
+TEAM_COUNTS = (20, 100, 300, 600)
+QUESTIONS = 15
+POOL_WORKERS = max(2, min(4, os.cpu_count() or 1))
+# Pool se isplati tek uz ovu marginu (šum mjerenja, start poslova u radnim procesima)
+MIN_SPEEDUP = 1.2
+
+SONGS = [
+    ("Azra", "Balkan"),
+    ("Zabranjeno Pušenje", "Zenica Blues"),
+    ("Riblja Čorba", "Lutka sa naslovne strane"),
+    ("Bijelo Dugme", "Đurđevdan"),
+    ("Prljavo Kazalište", "Mojoj majci"),
+    ("Parni Valjak", "Jesen u meni"),
+    ("Haustor", "Moja prva ljubav"),
+    ("Električni Orgazam", "Igra rokenrol cela Jugoslavija"),
+    ("Oliver Dragojević", "Cesarica"),
+    ("Queen & David Bowie", "Under Pressure"),
+    ("Red Hot Chili Peppers", "Californication"),
+    ("Guns N' Roses", "Sweet Child O' Mine"),
+    ("Nirvana", "Smells Like Teen Spirit"),
+    ("Led Zeppelin", "Stairway to Heaven"),
+    ("Dire Straits", "Sultans of Swing"),
+]
+
+
+class _Obj:
+    pass
+
+
+def _typo(rng, text):
+    if len(text) < 3:
+        return text
+    i = rng.randrange(1, len(text) - 1)
+    return text[:i] + rng.choice("aeioukrnst") + text[i + 1:]
+
+
+def build_round(n_teams, variant=0, seed=7):
+    """Runda s n_teams odgovora po pitanju; svaka varijanta ima druge točne odgovore (hladni cachevi)."""
+    rng = random.Random(seed + variant)
+    question_map = {}
+    answers_by_question = {}
+    answer_id = 0
+    for question_id, (artist, title) in enumerate(SONGS[:QUESTIONS], start=1):
+        title = f"{title} {variant}" if variant else title
+        question = _Obj()
+        question.id = question_id
+        question.type = "audio"
+        question.duration = 30
+        question.song = _Obj()
+        question.song.artist = artist
+        question.song.title = title
+        question_map[question_id] = question
+        answers = []
+        for team in range(n_teams):
+            answer_id += 1
+            ans = _Obj()
+            ans.id = answer_id
+            ans.player_id = team
+            ans.round_number = 1
+            ans.question_id = question_id
+            ans.artist_guess = _typo(rng, _typo(rng, artist.lower()))
+            ans.title_guess = _typo(rng, title.lower()) + rng.choice(["", " ", "!", f" {team % 7}"])
+            ans.extra_guess = ""
+            ans.choice_selected = -1
+            ans.submission_time = rng.uniform(0, 30)
+            ans.artist_points = ans.title_points = ans.extra_points = 0.0
+            answers.append(ans)
+        answers_by_question[question_id] = answers
+    return question_map, answers_by_question
+
+
+def grade_serial(question_map, answers_by_question):
+    for question_id, answers in answers_by_question.items():
+        grading_service.grade_question(question_map[question_id], answers)
+
+
+def time_cold(grade, n_teams, variants, repeat=3):
+    """Median ms; svako ponavljanje boduje novu varijantu runde (memo cache ne pomaže)."""
+    samples = []
+    for _ in range(repeat):
+        question_map, answers_by_question = build_round(n_teams, variant=next(variants))
+        ms, _ = time_call(lambda: grade(question_map, answers_by_question), repeat=1)
+        samples.append(ms)
+    return sorted(samples)[len(samples) // 2]
+
+
+def find_crossover(speedups):
+    """
+    Najmanji broj odgovora od kojeg je pool barem MIN_SPEEDUP puta brži na toj
+    i svim većim izmjerenim veličinama; None ako ga nema.
+    """
+    crossover = None
+    for n_answers, speedup in reversed(sorted(speedups)):
+        if speedup < MIN_SPEEDUP:
+            break
+        crossover = n_answers
+    return crossover
+
+
+def main():
+    # Ledger nije predmet mjerenja
+    score_ledger.apply_delta = lambda *args, **kwargs: None
+
+    from concurrent.futures import ProcessPoolExecutor
+    import multiprocessing
+
+    pool = ProcessPoolExecutor(max_workers=POOL_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+    # Zagrijavanje: pokreni sve radne procese i importe prije mjerenja
+    warm_map, warm_answers = build_round(POOL_WORKERS)
+    for _ in range(POOL_WORKERS):
+        grading_service.grade_questions_in_pool(warm_map, warm_answers, pool=pool)
+
+    def grade_pool(question_map, answers_by_question):
+        grading_service.grade_questions_in_pool(question_map, answers_by_question, pool=pool)
+
+    variants = iter(range(1, 10_000))
+    rows = []
+    speedups = []
+    try:
+        for n_teams in TEAM_COUNTS:
+            n_answers = n_teams * QUESTIONS
+
+            # Provjera ispravnosti: isti bodovi iz oba načina
+            question_map, answers_by_question = build_round(n_teams, variant=next(variants))
+            grade_serial(question_map, answers_by_question)
+            expected = {a.id: (a.artist_points, a.title_points) for q in answers_by_question.values() for a in q}
+            grade_pool(question_map, answers_by_question)
+            got = {a.id: (a.artist_points, a.title_points) for q in answers_by_question.values() for a in q}
+            assert got == expected, "Pool i serijsko bodovanje se ne podudaraju!"
+
+            serial_med = time_cold(grade_serial, n_teams, variants)
+            pool_med = time_cold(grade_pool, n_teams, variants)
+
+            speedups.append((n_answers, serial_med / pool_med if pool_med else 0.0))
+            rows.append((
+                n_teams,
+                n_answers,
+                f"{serial_med:.1f}",
+                f"{pool_med:.1f}",
+                f"{serial_med / pool_med:.2f}x" if pool_med else "-",
+            ))
+    finally:
+        pool.shutdown()
+
+    crossover = find_crossover(speedups)
+    print(f"CPU cores: {os.cpu_count()}, pool workers: {POOL_WORKERS}")
+    print_table(("teams", "answers", "serial ms", "pool ms", "speedup"), rows)
+    if crossover:
+        print(f"Pool is at least {MIN_SPEEDUP:.1f}x faster from {crossover} answers at every larger size; "
+              f"set GRADING_POOL_MIN_ANSWERS={crossover}.")
+    else:
+        print(f"Pool is not consistently {MIN_SPEEDUP:.1f}x faster at any size here; "
+              "keep the pool disabled (GRADING_PROCESSES=0) on this machine.")
+
+
+if __name__ == "__main__":
+    main()
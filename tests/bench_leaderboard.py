@@ -0,0 +1,59 @@
+"""
+Benchmark: izračun ljestvice (calculate_and_broadcast_leaderboard).
+
+Uspoređuje stari pristup (SUM upit po igraču + commit svakog Player.score)
+s jednim GROUP BY upitom i bulk UPDATE-om, za 50 / 200 / 1000 timova.
+
+    python tests/bench_leaderboard.py
+"""
+from bench_utils import make_bench_app, print_table, reset_db, seed_quiz, time_call
+
+PLAYER_COUNTS = (50, 200, 1000)
+
+
+def legacy_leaderboard():
+    """Kopija stare implementacije (jedan SUM upit po igraču)."""
+    from extensions import db
+    from musicquiz.models import Answer, Player
+
+    leaderboard = {}
+    for p in Player.query.all():
+        pts = db.session.query(db.func.sum(Answer.artist_points + Answer.title_points + Answer.extra_points)) \
+            .filter(Answer.player_id == p.id).scalar() or 0
+        p.score = float(pts)
+        leaderboard[p.name] = p.score
+    db.session.commit()
+    return leaderboard
+
+
+def main():
+    app = make_bench_app()
+    from musicquiz.services.score_ledger import rebuild_ledger
+    from musicquiz.sockets.admin_events import calculate_and_broadcast_leaderboard
+
+    rows = []
+    with app.app_context():
+        for n_players in PLAYER_COUNTS:
+            reset_db()
+            seed_quiz(n_players)
+            # Ledger se puni iz baze samo pri startu - seed ide direktno u bazu
+            rebuild_ledger()
+
+            legacy_med, legacy_min = time_call(legacy_leaderboard)
+            new_med, new_min = time_call(calculate_and_broadcast_leaderboard)
+
+            new_board, _ = calculate_and_broadcast_leaderboard()
+            assert new_board == legacy_leaderboard(), "Rezultati se ne podudaraju!"
+
+            rows.append((
+                n_players,
+                f"{legacy_med:.1f}",
+                f"{new_med:.1f}",
+                f"{legacy_med / new_med:.1f}x" if new_med else "-",
+            ))
+
+    print_table(("players", "legacy ms (median)", "grouped ms (median)", "speedup"), rows)
+
+
+if __name__ == "__main__":
+    main()
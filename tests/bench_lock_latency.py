@@ -0,0 +1,127 @@
+"""
+Benchmark: vrijeme od zaključavanja pitanja do player_show_answer.
+
+Mjeri blok iz lock_question (admin_events) nakon screen_show_correct: flush spremnika
+odgovora, učitavanje odgovora, bodovanje pitanja, player_show_answer
+payloadi i commit. Uspoređuje:
+
+- lock:        sve se boduje pri zaključavanju (PROVISIONAL_GRADING=0),
+- provisional: predaje su privremeno bodovane pri predaji, pri
+               zaključavanju se samo prepisuju bodovi,
+- +N% late:    kao provisional, ali N% timova promijeni odgovor u zadnjem
+               trenutku (prije nego ih pozadinska dretva stigne bodovati).
+
+Svaka varijanta kreće s praznim cachevima bodovanja; pokušaji su različiti
+(tipfeleri), pa bodovanje pri zaključavanju stvarno računa sličnost. Svaka
+varijanta se ponavlja REPEAT puta i ispisuje se median: jedno mjerenje od
+desetak ms je preosjetljivo na GC i raspored dretvi.
+
+Prepisivanje privremenih bodova ne ubrzava flush, učitavanje odgovora,
+payloade ni commit, pa je dobitak ograničen na izračun sličnosti (oko 1.3x
+na 600 timova); provisional ne smije biti sporiji od lock.
+
+    python tests/bench_lock_latency.py
+"""
+import random
+import time
+import warnings
+
+from bench_utils import make_bench_app, print_table, reset_db, seed_quiz
+
+TEAM_COUNTS = (100, 300, 600)
+LATE_RATIO = 0.1
+REPEAT = 5
+
+
+def _typo(rng, text):
+    i = rng.randrange(1, len(text) - 1)
+    return text[:i] + rng.choice("aeioukrnst") + text[i + 1:]
+
+
+def median_variant(app, n_teams, provisional, late_ratio=0.0):
+    """(median ms, broj ponovno bodovanih) za REPEAT ponavljanja."""
+    samples = [run_variant(app, n_teams, provisional, late_ratio) for _ in range(REPEAT)]
+    return sorted(ms for ms, _ in samples)[len(samples) // 2], samples[-1][1]
+
+
+def run_variant(app, n_teams, provisional, late_ratio=0.0):
+    """Vraća (ms od zaključavanja do bodovanih odgovora, broj ponovno bodovanih)."""
+    from extensions import db
+    from musicquiz.models import Answer, Player, Question
+    from musicquiz.services.answer_buffer import answer_buffer, answer_fields, flush_answer_buffer
+    from musicquiz.services.grading_service import clear_normalize_cache, grade_cache, grade_question
+    from musicquiz.services.provisional_grading import provisional_grader
+    from musicquiz.services.round_payloads import compile_round
+    from musicquiz.sockets.admin_events import player_answer_payloads
+
+    rng = random.Random(n_teams)
+    with app.app_context():
+        reset_db()
+        seed_quiz(n_teams, rounds=1, questions_per_round=1, answered_ratio=0.0)
+        question = Question.query.first()
+        compiled = compile_round(question.quiz_id, question.round_number).get(question.id)
+        players = db.session.query(Player.id, Player.name).order_by(Player.name).all()
+        artist, title = question.song.artist, question.song.title
+        grade_cache.clear()
+        clear_normalize_cache()
+        provisional_grader.enabled = provisional
+        answer_buffer.open_question(question.id, meta=compiled.answer_meta)
+        provisional_grader.open_question(question.id, spec=compiled.spec)
+        question_type, round_number = answer_buffer.question_meta(question.id)
+
+        def submit(player_id, data):
+            fields = answer_fields(question_type, data, rng.uniform(5, 30))
+            answer_buffer.submit(player_id, question.id, round_number, fields)
+            provisional_grader.submit(player_id, question.id, fields)
+
+        for player_id, name in players:
+            submit(player_id, {"artist": _typo(rng, artist.lower()), "title": _typo(rng, title.lower()) + f" {name[-3:]}"})
+        # Tijekom pitanja: pozadinski flush (ANSWER_FLUSH_MS) i privremeno bodovanje
+        flush_answer_buffer()
+        if provisional:
+            provisional_grader.grade_pending()
+        for player_id, _ in players[:int(len(players) * late_ratio)]:
+            submit(player_id, {"artist": artist, "title": _typo(rng, title) + " kasno"})
+
+        start = time.perf_counter()
+        flush_answer_buffer(close_question_id=question.id)
+        graded = provisional_grader.take(question.id, compiled.spec)
+        answers = Answer.query.filter_by(question_id=question.id).all()
+        grader = grade_question(compiled, answers, provisional=graded, spec=compiled.spec)
+        payloads = player_answer_payloads(compiled, answers)
+        db.session.commit()
+        elapsed_ms = (time.perf_counter() - start) * 1000.0
+
+        assert len(payloads) == n_teams
+        provisional_grader.enabled = False
+        db.session.remove()
+        return elapsed_ms, len(answers) - grader.reused
+
+
+def main():
+    warnings.filterwarnings("ignore", message=".*Query.get.*")
+    app = make_bench_app()
+    from musicquiz.services.score_ledger import score_ledger
+
+    # Ledger nije predmet mjerenja
+    score_ledger.apply_delta = lambda *args, **kwargs: None
+
+    late_label = f"+{int(LATE_RATIO * 100)}% late"
+    rows = []
+    for n_teams in TEAM_COUNTS:
+        lock_ms, _ = median_variant(app, n_teams, provisional=False)
+        provisional_ms, _ = median_variant(app, n_teams, provisional=True)
+        late_ms, late_regraded = median_variant(app, n_teams, provisional=True, late_ratio=LATE_RATIO)
+        rows.append((
+            n_teams,
+            f"{lock_ms:.1f}",
+            f"{provisional_ms:.1f}",
+            f"{late_ms:.1f} ({late_regraded} regraded)",
+            f"{lock_ms / provisional_ms:.1f}x" if provisional_ms else "-",
+        ))
+
+    print_table(("teams", "lock ms", "provisional ms", late_label + " ms", "speedup"), rows)
+
+
+if __name__ == "__main__":
+    main()
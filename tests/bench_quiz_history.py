@@ -0,0 +1,89 @@
+"""
+Benchmark: bodovanje i ljestvica aktivnog kviza uz sve veću povijest kvizova u bazi.
+
+Baza drži HISTORY_WEEKS starih kvizova (isti timovi, isti broj odgovora) i
+večerašnji aktivni kviz. Uspoređuje stari GROUP BY preko cijele Answer
+tablice sa zbrajanjem ograničenim na timove aktivnog kviza te mjeri
+rebuild_ledger, finalize_round i listu timova za admina. Vremena novih
+funkcija trebaju ostati ista bez obzira na broj tjedana povijesti.
+
+    python tests/bench_quiz_history.py
+"""
+from bench_utils import make_bench_app, print_table, reset_db, seed_quiz, time_call
+
+HISTORY_WEEKS = (0, 10, 40)
+TEAMS = 100
+
+
+def legacy_aggregate_scores():
+    """Kopija stare implementacije (GROUP BY preko svih odgovora u bazi)."""
+    from sqlalchemy import func
+
+    from extensions import db
+    from musicquiz.models import Answer
+
+    points = (
+        func.coalesce(Answer.artist_points, 0.0)
+        + func.coalesce(Answer.title_points, 0.0)
+        + func.coalesce(Answer.extra_points, 0.0)
+    )
+    return db.session.query(Answer.player_id, Answer.round_number, func.sum(points)) \
+        .group_by(Answer.player_id, Answer.round_number).all()
+
+
+def seed_history(weeks):
+    """weeks starih kvizova + aktivni kviz; vraća id aktivnog kviza."""
+    from extensions import db
+    from musicquiz.models import Quiz
+
+    for week in range(weeks):
+        seed_quiz(TEAMS, seed=week)
+        Quiz.query.filter_by(is_active=True).update({Quiz.is_active: False})
+        db.session.commit()
+    return seed_quiz(TEAMS, seed=weeks).id
+
+
+def main():
+    app = make_bench_app()
+    from extensions import db
+    from musicquiz.models import Answer
+    from musicquiz.services.player_status import get_all_players_data
+    from musicquiz.services.quiz_service import aggregate_scores
+    from musicquiz.services.score_ledger import rebuild_ledger
+    from musicquiz.sockets.admin_events import finalize_round
+
+    rows = []
+    with app.app_context():
+        for weeks in HISTORY_WEEKS:
+            reset_db()
+            seed_history(weeks)
+            total_answers = db.session.query(Answer.id).count()
+
+            legacy_med, _ = time_call(legacy_aggregate_scores)
+            scoped_med, _ = time_call(aggregate_scores)
+            rebuild_med, _ = time_call(rebuild_ledger)
+            finalize_med, _ = time_call(lambda: finalize_round(1), repeat=3)
+            players_med, _ = time_call(get_all_players_data)
+
+            board = rebuild_ledger()
+            assert len(board) == TEAMS, f"ljestvica ima {len(board)} timova umjesto {TEAMS}"
+
+            rows.append((
+                weeks,
+                total_answers,
+                f"{legacy_med:.1f}",
+                f"{scoped_med:.1f}",
+                f"{rebuild_med:.1f}",
+                f"{finalize_med:.1f}",
+                f"{players_med:.1f}",
+            ))
+
+    print(f"{TEAMS} teams, 3 rounds x 10 questions per quiz")
+    print_table((
+        "history weeks", "answers in db", "legacy aggregate ms", "scoped aggregate ms",
+        "rebuild_ledger ms", "finalize_round ms", "player list ms",
+    ), rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Benchmark: osobni sažeci runde (player_show_round_summary) na kraju runde.
+
+Uspoređuje stari pristup (Answer upit po timu + emit_to po timu, koji svaki
+put prebrojava sve spojene klijente) s jednim upitom za sve odgovore runde
+grupiranim u memoriji i emit_to_teams. Timovi su spojeni Socket.IO test
+klijenti u svojim team sobama, pa se mjeri i stvarno slanje.
+
+    python tests/bench_round_summary.py
+"""
+import warnings
+
+from bench_utils import count_queries, make_bench_app, print_table, reset_db, seed_quiz, time_call
+
+TEAM_COUNTS = (50, 200, 500)
+
+
+def legacy_round_summary(compiled, round_num):
+    """Kopija stare petlje iz finish_round."""
+    from extensions import socketio
+    from musicquiz.models import Answer, Player
+    from musicquiz.sockets.rooms import emit_to, team_room
+
+    for player in Player.query.all():
+        player_round_answers = []
+        for ans in Answer.query.filter_by(player_id=player.id, round_number=round_num).all():
+            q = compiled.get(ans.question_id)
+            if q:
+                player_round_answers.append({
+                    "question_position": q.position or 1,
+                    "artist_guess": ans.artist_guess or "",
+                    "title_guess": ans.title_guess or "",
+                    "extra_guess": ans.extra_guess or "",
+                    "correct_artist": q.answer_key.get("artist", ""),
+                    "correct_title": q.display_title,
+                    "correct_extra": q.answer_key.get("extra", ""),
+                    "artist_points": float(ans.artist_points or 0),
+                    "title_points": float(ans.title_points or 0),
+                    "extra_points": float(ans.extra_points or 0),
+                    "max_points": q.max_points,
+                    "question_type": q.type
+                })
+        emit_to(socketio, "player_show_round_summary", {
+            "round": round_num,
+            "answers": player_round_answers
+        }, to=team_room(player.id))
+
+
+def batched_round_summary(compiled, round_num):
+    from extensions import socketio
+    from musicquiz.sockets.admin_events import round_summary_payloads
+    from musicquiz.sockets.rooms import emit_to_teams
+
+    emit_to_teams(socketio, "player_show_round_summary", round_summary_payloads(compiled, round_num))
+
+
+def connect_teams(app, player_ids):
+    """Test klijent po timu, ubačen u svoju team sobu."""
+    from extensions import socketio
+    from musicquiz.sockets.rooms import team_room
+
+    manager = socketio.server.manager
+    clients = []
+    for player_id in player_ids:
+        client = socketio.test_client(app)
+        sid = manager.sid_from_eio_sid(client.eio_sid, "/")
+        manager.enter_room(sid, "/", team_room(player_id))
+        clients.append(client)
+    return clients
+
+
+def received_summaries(clients):
+    summaries = []
+    for client in clients:
+        summaries.extend(
+            packet["args"][0]
+            for packet in client.get_received()
+            if packet["name"] == "player_show_round_summary"
+        )
+    return summaries
+
+
+def main():
+    warnings.filterwarnings("ignore", message=".*Query.get.*")
+    app = make_bench_app()
+    from extensions import db
+    from musicquiz.models import Player
+    from musicquiz.services.round_payloads import compile_round
+
+    rows = []
+    with app.app_context():
+        for n_teams in TEAM_COUNTS:
+            reset_db()
+            quiz = seed_quiz(n_teams, rounds=1, questions_per_round=10)
+            compiled = compile_round(quiz.id, 1)
+            player_ids = [player_id for (player_id,) in db.session.query(Player.id).all()]
+            clients = connect_teams(app, player_ids)
+
+            # Isti sadržaj za svaki tim
+            legacy_round_summary(compiled, 1)
+            legacy = sorted(received_summaries(clients), key=repr)
+            batched_round_summary(compiled, 1)
+            batched = sorted(received_summaries(clients), key=repr)
+            assert legacy == batched, "Sažeci se ne podudaraju!"
+            assert len(batched) == n_teams
+
+            with count_queries() as legacy_queries:
+                legacy_round_summary(compiled, 1)
+            with count_queries() as batched_queries:
+                batched_round_summary(compiled, 1)
+            received_summaries(clients)
+
+            legacy_med, _ = time_call(lambda: legacy_round_summary(compiled, 1), repeat=3)
+            received_summaries(clients)
+            batched_med, _ = time_call(lambda: batched_round_summary(compiled, 1), repeat=3)
+            for client in clients:
+                client.disconnect()
+
+            rows.append((
+                n_teams,
+                legacy_queries["n"],
+                batched_queries["n"],
+                f"{legacy_med:.1f}",
+                f"{batched_med:.1f}",
+                f"{legacy_med / batched_med:.1f}x" if batched_med else "-",
+            ))
+
+    print_table(("teams", "legacy queries", "batched queries", "legacy ms", "batched ms", "speedup"), rows)
+
+
+if __name__ == "__main__":
+    main()
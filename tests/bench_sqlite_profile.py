@@ -0,0 +1,215 @@
+"""
+Benchmark: nalet predaja s commitom po predaji uz pozadinske pisače, prije i
+nakon SQLite profila (sqlite_profile).
+
+Socket dretve (WORKERS) svaka za svoj tim rade SELECT + INSERT/UPDATE +
+COMMIT (kao player_join, admin izmjene i stari handler predaje), a uz njih
+pozadinska dretva svakih FLUSH_MS zapisuje bodove svih timova jednim bulk
+UPDATE-om (kao flush_ledger) i čitač računa ljestvicu (SUM po timu).
+Varijante rade nad zasebnim datotekama baze:
+
+- default:      stare opcije enginea (Config.SQLALCHEMY_ENGINE_OPTIONS), rollback journal
+- wal+pragmas:  engine_options + PRAGMA-e (WAL, synchronous=NORMAL, ...), bez writer locka
+- +writer lock: kao gore, pisanja serijalizirana procesnim lockom
+
+Ispisuje latenciju commita (p50/p95/p99), greške "database is locked",
+ukupno vrijeme i koliko su puta čitač i pozadinski pisač uspjeli.
+
+    python tests/bench_sqlite_profile.py
+"""
+import os
+import statistics
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from bench_utils import ROOT_DIR, print_table  # noqa: F401
+
+from sqlalchemy import create_engine, func, update
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from config import Config
+from extensions import db
+from musicquiz.models import Answer, Player, Question, Quiz, Song
+from musicquiz.services.sqlite_profile import configure_engine, current_pragmas, engine_options, writer_lock
+
+TEAM_COUNTS = (100, 300)
+RESUBMITS = 3
+WORKERS = 16
+FLUSH_MS = 100
+READ_MS = 50
+
+
+def make_engine(path, profile, serialize_writes):
+    url = "sqlite:///" + path.replace("\\", "/")
+    options = dict(Config.SQLALCHEMY_ENGINE_OPTIONS)
+    options["pool_size"] = WORKERS + 4
+    if not profile:
+        return create_engine(url, **options)
+    engine = create_engine(url, **engine_options(url, options))
+    configure_engine(engine, serialize_writes=serialize_writes)
+    return engine
+
+
+def seed(Session, n_teams):
+    with Session() as session:
+        quiz = Quiz(title="SQLite Bench", is_active=True)
+        session.add(quiz)
+        session.flush()
+        question = Question(quiz_id=quiz.id, round_number=1, position=1, type="audio", duration=30.0)
+        session.add(question)
+        session.flush()
+        session.add(Song(question_id=question.id, filename="bench.mp3", artist="Azra", title="Balkan"))
+        session.add_all(Player(quiz_id=quiz.id, name=f"Tim {i:04d}", pin="0000") for i in range(n_teams))
+        session.commit()
+        return question.id
+
+
+def submit(Session, question_id, name, attempt):
+    """SELECT + upis + COMMIT jedne predaje (stari handler bez emitova)."""
+    with Session() as session:
+        player_id = session.query(Player.id).filter_by(name=name).scalar()
+        ans = session.query(Answer).filter_by(player_id=player_id, question_id=question_id).first()
+        if ans is None:
+            ans = Answer(player_id=player_id, question_id=question_id, round_number=1)
+            session.add(ans)
+        ans.artist_guess = f"azra {attempt}"
+        ans.title_guess = f"balkan {name}"
+        ans.extra_guess = ""
+        ans.choice_selected = -1
+        ans.submission_time = 20.0 + attempt
+        session.commit()
+
+
+def background(Session, stop, counters):
+    """Pozadinski pisač bodova i čitač ljestvice dok traje nalet."""
+    def writer():
+        tick = 0
+        while not stop.is_set():
+            tick += 1
+            try:
+                with Session() as session:
+                    ids = [player_id for (player_id,) in session.query(Player.id).all()]
+                    session.execute(update(Player), [{"id": player_id, "score": float(tick)} for player_id in ids])
+                    session.commit()
+                counters["flushes"] += 1
+            except OperationalError:
+                counters["flush_errors"] += 1
+            stop.wait(FLUSH_MS / 1000.0)
+
+    def reader():
+        while not stop.is_set():
+            try:
+                with Session() as session:
+                    session.query(Answer.player_id, func.sum(Answer.artist_points)).group_by(Answer.player_id).all()
+                counters["reads"] += 1
+            except OperationalError:
+                counters["read_errors"] += 1
+            stop.wait(READ_MS / 1000.0)
+
+    threads = [threading.Thread(target=writer, daemon=True), threading.Thread(target=reader, daemon=True)]
+    for thread in threads:
+        thread.start()
+    return threads
+
+
+def percentile(samples, p):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, max(0, int(round(p / 100.0 * len(ordered))) - 1))]
+
+
+def run_variant(tmp_dir, label, n_teams, profile, serialize_writes):
+    path = os.path.join(tmp_dir, f"{label.replace('+', '').replace(' ', '_')}_{n_teams}.db")
+    engine = make_engine(path, profile, serialize_writes)
+    db.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine, expire_on_commit=False)
+    question_id = seed(Session, n_teams)
+    journal = engine.connect().exec_driver_sql("PRAGMA journal_mode").scalar()
+    if profile:
+        assert current_pragmas(engine)["journal_mode"].lower() == "wal"
+
+    counters = {"flushes": 0, "flush_errors": 0, "reads": 0, "read_errors": 0}
+    lock_before = writer_lock.stats()
+    stop = threading.Event()
+    threads = background(Session, stop, counters)
+
+    def team(index):
+        name = f"Tim {index:04d}"
+        latencies, errors = [], 0
+        for attempt in range(RESUBMITS):
+            start = time.perf_counter()
+            try:
+                submit(Session, question_id, name, attempt)
+            except OperationalError as e:
+                if "locked" not in str(e):
+                    raise
+                errors += 1
+                continue
+            latencies.append((time.perf_counter() - start) * 1000.0)
+        return latencies, errors
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+        results = list(pool.map(team, range(n_teams)))
+    total_ms = (time.perf_counter() - start) * 1000.0
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    latencies = [ms for team_latencies, _ in results for ms in team_latencies]
+    errors = sum(team_errors for _, team_errors in results)
+    with Session() as session:
+        stored = session.query(func.count(Answer.id)).scalar()
+    engine.dispose()
+    lock_after = writer_lock.stats()
+    return {
+        "journal": journal,
+        "p50": statistics.median(latencies) if latencies else 0.0,
+        "p95": percentile(latencies, 95) if latencies else 0.0,
+        "p99": percentile(latencies, 99) if latencies else 0.0,
+        "errors": errors + counters["flush_errors"] + counters["read_errors"],
+        "total_ms": total_ms,
+        "stored": stored,
+        "flushes": counters["flushes"],
+        "reads": counters["reads"],
+        "lock_wait_ms": lock_after["wait_ms"] - lock_before["wait_ms"],
+    }
+
+
+def main():
+    tmp_dir = tempfile.mkdtemp(prefix="mq_sqlite_bench_")
+    variants = (
+        ("default", False, False),
+        ("wal+pragmas", True, False),
+        ("+writer lock", True, True),
+    )
+    rows = []
+    for n_teams in TEAM_COUNTS:
+        for label, profile, serialize_writes in variants:
+            result = run_variant(tmp_dir, label, n_teams, profile, serialize_writes)
+            rows.append((
+                n_teams,
+                label,
+                result["journal"],
+                f"{result['p50']:.1f}",
+                f"{result['p95']:.1f}",
+                f"{result['p99']:.1f}",
+                result["errors"],
+                f"{result['stored']}/{n_teams}",
+                f"{result['total_ms']:.0f}",
+                result["flushes"],
+                result["reads"],
+            ))
+
+    print(f"{WORKERS} socket threads, {RESUBMITS} commits per team, score flush every {FLUSH_MS} ms, "
+          f"leaderboard read every {READ_MS} ms")
+    print_table((
+        "teams", "variant", "journal", "p50 ms", "p95 ms", "p99 ms", "locked errors",
+        "stored", "total ms", "flushes", "reads",
+    ), rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Zajednički pomoćnici za benchmark skripte u tests/.
+
+Svaki benchmark radi nad privremenom SQLite bazom, nikad nad kviz.db.
+Pokretanje iz korijena repozitorija, npr.: python tests/bench_leaderboard.py
+"""
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+
+def make_bench_app():
+    """Kreira Flask app nad praznom privremenom bazom (postavlja DATABASE_URL prije importa configa)."""
+    tmp_dir = tempfile.mkdtemp(prefix="mq_bench_")
+    os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tmp_dir, "bench.db").replace("\\", "/")
+
+    from app import create_app
+
+    return create_app()
+
+
+def reset_db():
+    from extensions import db
+
+    db.session.remove()
+    db.drop_all()
+    db.create_all()
+
+
+def seed_quiz(n_players, rounds=3, questions_per_round=10, answered_ratio=1.0, seed=42):
+    """Kreira aktivni kviz s audio pitanjima, n_players timova i njihove (nebodovane) odgovore."""
+    from extensions import db
+    from musicquiz.models import Answer, Player, Question, Quiz, Song
+
+    rng = random.Random(seed)
+    quiz = Quiz(title="Bench Quiz", is_active=True)
+    db.session.add(quiz)
+    db.session.flush()
+
+    questions = []
+    for round_number in range(1, rounds + 1):
+        for position in range(1, questions_per_round + 1):
+            question = Question(
+                quiz_id=quiz.id,
+                round_number=round_number,
+                position=position,
+                type="audio",
+                duration=30.0,
+            )
+            db.session.add(question)
+            db.session.flush()
+            db.session.add(Song(
+                question_id=question.id,
+                filename=f"bench_{round_number}_{position}.mp3",
+                artist=f"Izvodjac {round_number}{position}",
+                title=f"Pjesma broj {round_number}{position}",
+            ))
+            questions.append(question)
+
+    players = [Player(quiz_id=quiz.id, name=f"Tim {i:04d}", pin="0000") for i in range(n_players)]
+    db.session.add_all(players)
+    db.session.flush()
+
+    answers = []
+    for player in players:
+        for question in questions:
+            if rng.random() > answered_ratio:
+                continue
+            answers.append({
+                "player_id": player.id,
+                "question_id": question.id,
+                "round_number": question.round_number,
+                "artist_guess": f"izvodjac {question.round_number}{question.position}",
+                "title_guess": f"pjesma {rng.randint(0, 99)}",
+                "extra_guess": "",
+                "artist_points": rng.choice([0.0, 0.5, 1.0]),
+                "title_points": rng.choice([0.0, 0.5, 1.0]),
+                "extra_points": 0.0,
+            })
+    if answers:
+        db.session.execute(Answer.__table__.insert(), answers)
+    db.session.commit()
+    return quiz
+
+
+def time_call(fn, repeat=5):
+    """Vraća (median, min) u milisekundama za `repeat` poziva funkcije."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000.0)
+    return statistics.median(samples), min(samples)
+
+
+@contextmanager
+def count_queries():
+    """Broji SQL naredbe izvršene unutar bloka: `with count_queries() as counter: ...; counter["n"]`."""
+    from sqlalchemy import event
+
+    from extensions import db
+
+    counter = {"n": 0}
+
+    def _on_execute(*_args, **_kwargs):
+        counter["n"] += 1
+
+    engine = db.engine
+    event.listen(engine, "before_cursor_execute", _on_execute)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", _on_execute)
+
+
+def print_table(headers, rows):
+    widths = [max(len(str(h)), *(len(str(r[i])) for r in rows)) for i, h in enumerate(headers)]
+    print("  ".join(str(h).rjust(w) for h, w in zip(headers, widths)))
+    for row in rows:
+        print("  ".join(str(v).rjust(w) for v, w in zip(row, widths)))
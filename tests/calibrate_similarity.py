@@ -0,0 +1,212 @@
+"""
+Kalibracija: slažu li se backendi sličnosti oko bodova (0 / 0.5 / 1)?
+
+Za korpus odgovora kakve timovi stvarno upisuju (tipfeleri, bez dijakritike,
+skraćeni naslovi, krivi izvođač, "ft." dodaci) boduje izvođača i naslov
+referentnim difflib backendom i svakim drugim backendom, s istim pragovima
+(0.82/0.55 izvođač, 0.84/0.58 naslov). Ispisuje postotak slaganja i sva
+neslaganja. Backend smije zamijeniti difflib samo ako daje iste bodove, pa
+je izlazni kod 1 već uz jedno neslaganje.
+
+    python tests/calibrate_similarity.py
+"""
+import random
+import sys
+
+from bench_utils import ROOT_DIR  # noqa: F401  (dodaje korijen repozitorija u sys.path)
+
+from musicquiz.services.grading_service import (
+    SIMILARITY_BACKENDS,
+    QuestionGrader,
+    get_similarity_backend,
+)
+
+SYNTHETIC_TYPOS_PER_ANSWER = 6
+
+# (izvođač, naslov, [(pokušaj izvođača, pokušaj naslova), ...])
+CORPUS = [
+    ("Azra", "Balkan", [
+        ("azra", "balkan"), ("Azra", "Balkan!"), ("azara", "balakn"), ("Ajra", "Balken"),
+        ("Johnny Štulić", "Balkan"), ("azra", ""), ("", "balkan"), ("Parni valjak", "Balkan"),
+    ]),
+    ("Zabranjeno Pušenje", "Zenica Blues", [
+        ("zabranjeno pusenje", "zenica blues"), ("Zabranjeno pušenje", "Zenica"), ("zabranjeno", "zenica bluz"),
+        ("pusenje", "blues"), ("Zabranjeno Pušenje", "Zenica Bluse"), ("Bijelo Dugme", "Zenica blues"),
+    ]),
+    ("Riblja Čorba", "Lutka sa naslovne strane", [
+        ("riblja corba", "lutka sa naslovne strane"), ("Riblja čorba", "Lutka s naslovne strane"),
+        ("ribja corba", "lutka"), ("Bora Čorba", "Lutka sa naslovnice"), ("riblja", "lutka sa naslove strane"),
+        ("Riblja Corba", "Naslovna strana"),
+    ]),
+    ("Bijelo Dugme", "Đurđevdan", [
+        ("bijelo dugme", "djurdjevdan"), ("Bijelo dugme", "Đurđevdan"), ("bjelo dugme", "durdevdan"),
+        ("Goran Bregović", "Đurđevdan je"), ("dugme", "jurjevdan"), ("Bijelo Dugme", "Djurdjevdan je"),
+    ]),
+    ("Prljavo Kazalište", "Mojoj majci", [
+        ("prljavo kazaliste", "mojoj majci"), ("Prljavo kazalište", "Majci"), ("prljavo kazalište", "mojoj majki"),
+        ("Prljavo", "Mojoj majci (Ruža hrvatska)"), ("Parni Valjak", "mojoj majci"),
+    ]),
+    ("Parni Valjak", "Jesen u meni", [
+        ("parni valjak", "jesen u meni"), ("Parni valjak", "Jesen"), ("parni valjek", "jesen u mene"),
+        ("Aki Rahimovski", "Jesen u meni"), ("Parni Valjak", "Ljeto u meni"),
+    ]),
+    ("Daleka Obala", "Ruzinavi brod", [
+        ("daleka obala", "ruzinavi brod"), ("Daleka obala", "Hrđavi brod"), ("daleka obal", "ruzinav brod"),
+        ("Obala", "Ruzinavi"), ("Daleka Obala", "Ružinavi brod"),
+    ]),
+    ("Haustor", "Moja prva ljubav", [
+        ("haustor", "moja prva ljubav"), ("Haustor", "Prva ljubav"), ("haustr", "moja prva lubav"),
+        ("Darko Rundek", "Moja prva ljubav"), ("Haustor", "Moja zadnja ljubav"),
+    ]),
+    ("Idoli", "Maljčiki", [
+        ("idoli", "maljciki"), ("Idoli", "Malčiki"), ("Idoli", "Maljčiki"), ("VIS Idoli", "maljcki"),
+        ("Idol", "malciki"), ("Ekatarina Velika", "maljciki"),
+    ]),
+    ("Električni Orgazam", "Igra rokenrol cela Jugoslavija", [
+        ("elektricni orgazam", "igra rokenrol cela jugoslavija"), ("Električni orgazam", "Igra rock and roll cela Jugoslavija"),
+        ("elektricni orgazam", "igra rokenrol"), ("Orgazam", "cela jugoslavija"),
+        ("Električni Orgazam", "Igra rokenrol cijela Jugoslavija"),
+    ]),
+    ("Oliver Dragojević", "Cesarica", [
+        ("oliver dragojevic", "cesarica"), ("Oliver", "Cesarica"), ("Oliver Dragojevič", "Česarica"),
+        ("oliver dragojevich", "cezarica"), ("Gibonni", "Cesarica"),
+    ]),
+    ("Gibonni", "Život je lijep", [
+        ("gibonni", "zivot je lijep"), ("Giboni", "Život je lep"), ("Gibboni", "Zivot je lijepa"),
+        ("Zlatan Stipišić Gibonni", "Zivot je lijep"), ("gibonni", "lijep zivot"),
+    ]),
+    ("Queen & David Bowie", "Under Pressure", [
+        ("queen", "under pressure"), ("David Bowie", "Under Pressure"), ("Queen and Bowie", "under presure"),
+        ("queen ft. david bowie", "pressure"), ("Quen", "Under Presser"), ("Freddie Mercury", "Under pressure"),
+    ]),
+    ("Red Hot Chili Peppers", "Californication", [
+        ("red hot chili peppers", "californication"), ("RHCP", "Californication"), ("Red Hot Chilli Peppers", "Californiacation"),
+        ("chili peppers", "california"), ("Red hot chilli pepers", "Kalifornikejšn"),
+    ]),
+    ("Guns N' Roses", "Sweet Child O' Mine", [
+        ("guns n roses", "sweet child o mine"), ("Guns and Roses", "Sweet Child of Mine"), ("GnR", "sweet child"),
+        ("guns n' roses", "Sweet child o'mine"), ("Guns N Rosses", "Sweet Chil O Mine"),
+    ]),
+    ("Nirvana", "Smells Like Teen Spirit", [
+        ("nirvana", "smells like teen spirit"), ("Nirvana", "Smells like a teen spirit"), ("Nirvanna", "Teen Spirit"),
+        ("nirvana", "smels like ten spirit"), ("Kurt Cobain", "Smells Like Teen Spirit"), ("Foo Fighters", "Spirit"),
+    ]),
+    ("AC/DC", "Highway to Hell", [
+        ("ac dc", "highway to hell"), ("ACDC", "Highway To Hell"), ("AC/DC", "Hiway to hell"),
+        ("acdc", "stairway to heaven"), ("AC-DC", "Highway 2 hell"),
+    ]),
+    ("Led Zeppelin", "Stairway to Heaven", [
+        ("led zeppelin", "stairway to heaven"), ("Led Zepelin", "Stairway to heven"), ("Led Zeppelin", "Stairway"),
+        ("zeppelin", "highway to heaven"), ("Lead Zeppelin", "Stairs to Heaven"),
+    ]),
+    ("Eurythmics", "Sweet Dreams (Are Made of This)", [
+        ("eurythmics", "sweet dreams"), ("Eurithmics", "Sweet dreams are made of this"), ("Annie Lennox", "Sweet Dreams"),
+        ("Eurytmics", "sweet dream"), ("Euritmiks", "Swet dreams"),
+    ]),
+    ("The Police", "Every Breath You Take", [
+        ("police", "every breath you take"), ("The Police", "Every breath"), ("Sting", "Every Breath You Take"),
+        ("the polis", "every breth you take"), ("Police", "Every move you make"),
+    ]),
+    ("Dire Straits", "Sultans of Swing", [
+        ("dire straits", "sultans of swing"), ("Dire Strait", "Sultan of swing"), ("Mark Knopfler", "Sultans of Swing"),
+        ("dire straights", "sultans of swimg"), ("Dire Straits", "Money for nothing"),
+    ]),
+    ("Massimo", "Lagano umiram", [
+        ("massimo", "lagano umiram"), ("Masimo", "Lagano"), ("Massimo Savić", "Lagano umirem"),
+        ("Massimo", "Polako umiram"), ("massimo savic", "lagano umiran"),
+    ]),
+    ("Film", "Zamisli život u ritmu muzike za ples", [
+        ("film", "zamisli zivot u ritmu muzike za ples"), ("Film", "Zamisli život"), ("Jura Stublić", "u ritmu muzike za ples"),
+        ("film", "zamisli zivot u ritmu muzike"), ("Film", "Zamisli zivot u ritmu glazbe za ples"),
+    ]),
+    ("Psihomodo Pop", "Ja volim samo sebe", [
+        ("psihomodo pop", "ja volim samo sebe"), ("Psihomodo", "Volim samo sebe"), ("Psiho modo pop", "ja volim sebe"),
+        ("Psihomodopop", "Ja volim samo tebe"), ("psihomodo pp", "ja volim samo sebi"),
+    ]),
+]
+
+RNG = random.Random(2026)
+
+
+def _typo(text):
+    """Jedna tipična tipkarska greška: izostavljen, udvostručen ili zamijenjen znak."""
+    if len(text) < 3:
+        return text
+    i = RNG.randrange(1, len(text) - 1)
+    kind = RNG.choice(("drop", "double", "swap", "replace"))
+    if kind == "drop":
+        return text[:i] + text[i + 1:]
+    if kind == "double":
+        return text[:i] + text[i] + text[i:]
+    if kind == "swap":
+        return text[:i - 1] + text[i] + text[i - 1] + text[i + 1:]
+    return text[:i] + RNG.choice("aeioukrnst") + text[i + 1:]
+
+
+class _Obj:
+    pass
+
+
+def _question(artist, title):
+    question = _Obj()
+    question.type = "audio"
+    question.duration = 30
+    question.song = _Obj()
+    question.song.artist = artist
+    question.song.title = title
+    return question
+
+
+def build_corpus():
+    rows = []
+    for artist, title, guesses in CORPUS:
+        for artist_guess, title_guess in guesses:
+            rows.append((artist, title, artist_guess, title_guess))
+            for _ in range(SYNTHETIC_TYPOS_PER_ANSWER):
+                rows.append((artist, title, _typo(artist_guess), _typo(title_guess)))
+    return rows
+
+
+def grade_corpus(rows, backend_name):
+    backend = get_similarity_backend(backend_name)
+    graders = {}
+    points = []
+    for artist, title, artist_guess, title_guess in rows:
+        key = (artist, title)
+        if key not in graders:
+            graders[key] = QuestionGrader(_question(artist, title), backend=backend)
+        grader = graders[key]
+        points.append((grader.artist_points(artist_guess), grader.title_points(title_guess)))
+    return points
+
+
+def main():
+    rows = build_corpus()
+    reference = grade_corpus(rows, "difflib")
+    failed = []
+    for name in SIMILARITY_BACKENDS:
+        if name == "difflib":
+            continue
+        points = grade_corpus(rows, name)
+        disagreements = [
+            (row, ref, got)
+            for row, ref, got in zip(rows, reference, points)
+            if ref != got
+        ]
+        fields = 2 * len(rows)
+        field_mismatches = sum((ref[0] != got[0]) + (ref[1] != got[1]) for _, ref, got in disagreements)
+        agreement = 1.0 - field_mismatches / fields
+        if disagreements:
+            failed.append(name)
+        print(f"{name}: {len(rows)} answers, {fields} graded fields, agreement {agreement * 100:.2f}%")
+        for (artist, title, artist_guess, title_guess), ref, got in disagreements:
+            print(f"  {artist} - {title} | {artist_guess!r} / {title_guess!r}: difflib {ref} vs {name} {got}")
+
+    if failed:
+        print(f"FAIL: {', '.join(failed)} disagree with difflib on thresholded points")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
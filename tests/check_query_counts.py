@@ -0,0 +1,121 @@
+"""
+Provjera broja SQL upita za liste pitanja (question_repository).
+
+Za kvizove od 10 i 100 pitanja (mješoviti tipovi) broji upite za:
+setup listu (_get_question_list), listu runde (launcher / live playlist),
+prevođenje runde (compile_round) i cijelu /admin/setup stranicu. Broj
+upita ne smije rasti s brojem pitanja; lazy-load varijanta je za usporedbu.
+Izlazi s greškom (AssertionError) ako neka lista radi N+1 upita.
+
+    python tests/check_query_counts.py
+"""
+import warnings
+
+from bench_utils import count_queries, make_bench_app, print_table, reset_db
+
+QUESTION_COUNTS = (10, 100)
+ROUNDS = 5
+
+
+def seed_mixed_quiz(n_questions):
+    """Aktivni kviz s n_questions pitanja svih tipova, raspoređenih po ROUNDS rundi."""
+    from extensions import db
+    from musicquiz.models import Question, Quiz, SimultaneousQuestion, Song, TextMultiple, TextQuestion, Video
+
+    quiz = Quiz(title="Query Count Quiz", is_active=True)
+    db.session.add(quiz)
+    db.session.flush()
+    kinds = ("audio", "video", "text", "text_multiple", "simultaneous")
+    per_round = max(1, n_questions // ROUNDS)
+    for i in range(n_questions):
+        kind = kinds[i % len(kinds)]
+        question = Question(
+            quiz_id=quiz.id,
+            round_number=i // per_round % ROUNDS + 1,
+            position=i % per_round + 1,
+            type=kind,
+            duration=30.0,
+        )
+        db.session.add(question)
+        db.session.flush()
+        if kind == "audio":
+            db.session.add(Song(question_id=question.id, filename=f"q{i}.mp3", artist=f"Izvodjac {i}", title=f"Pjesma {i}"))
+        elif kind == "video":
+            db.session.add(Video(question_id=question.id, filename=f"q{i}.mp4", artist=f"Izvodjac {i}", title=f"Spot {i}"))
+        elif kind == "text":
+            db.session.add(TextQuestion(question_id=question.id, question_text=f"Pitanje {i}?", answer_text=f"Odgovor {i}"))
+        elif kind == "text_multiple":
+            row = TextMultiple(question_id=question.id, question_text=f"Izbor {i}?", correct_index=1)
+            row.set_choices(["A", "B", "C"])
+            db.session.add(row)
+        else:
+            db.session.add(SimultaneousQuestion(
+                question_id=question.id, filename=f"q{i}.mp3", artist=f"Izvodjac {i}", title=f"Pjesma {i}",
+                extra_question="Godina?", extra_answer="1984",
+            ))
+    db.session.commit()
+    return quiz.id
+
+
+def legacy_question_list(quiz_id):
+    """Stari _get_question_list: veze se lazy-loadaju po pitanju."""
+    from musicquiz.models import Question
+    from musicquiz.services.question_service import get_question_display
+
+    questions = Question.query.filter_by(quiz_id=quiz_id).order_by(Question.round_number, Question.position).all()
+    return [get_question_display(q) for q in questions]
+
+
+def measure(fn):
+    from extensions import db
+
+    # Prazna identity mapa - inače bi veze već bile učitane
+    db.session.expire_all()
+    with count_queries() as counter:
+        fn()
+    return counter["n"]
+
+
+def main():
+    warnings.filterwarnings("ignore", message=".*Query.get.*")
+    app = make_bench_app()
+    from musicquiz.routes.admin_routes import _get_question_list
+    from musicquiz.services.question_repository import questions_for_round
+    from musicquiz.services.question_service import get_question_display
+    from musicquiz.services.round_payloads import compile_round
+
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session["logged_in"] = True
+
+    checks = (
+        ("setup list", lambda quiz_id: _get_question_list(quiz_id)),
+        ("round list", lambda quiz_id: [get_question_display(q) for q in questions_for_round(quiz_id, 1)]),
+        ("compile_round", lambda quiz_id: compile_round(quiz_id, 1)),
+        ("GET /admin/setup", lambda quiz_id: client.get("/admin/setup")),
+    )
+    counts = {}
+    rows = []
+    for n_questions in QUESTION_COUNTS:
+        with app.app_context():
+            reset_db()
+            quiz_id = seed_mixed_quiz(n_questions)
+            legacy = measure(lambda: legacy_question_list(quiz_id))
+            for name, fn in checks:
+                counts[(name, n_questions)] = measure(lambda: fn(quiz_id))
+            rows.append((n_questions, legacy, *(counts[(name, n_questions)] for name, _ in checks)))
+
+    print_table(("questions", "legacy list", *(name for name, _ in checks)), rows)
+
+    small, large = QUESTION_COUNTS
+    for name, _ in checks:
+        assert counts[(name, large)] == counts[(name, small)], (
+            f"{name}: {counts[(name, small)]} upita za {small} pitanja, {counts[(name, large)]} za {large}"
+        )
+    assert counts[("setup list", large)] == 1
+    assert counts[("round list", large)] == 1
+    print("OK: broj upita ne ovisi o broju pitanja")
+
+
+if __name__ == "__main__":
+    main()
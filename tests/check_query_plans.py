@@ -0,0 +1,217 @@
+"""
+Provjera planova upita (EXPLAIN QUERY PLAN) za admin_events.py,
+player_events.py i admin_routes.py.
+
+Skripta prolazi stvarne tokove nad privremenom SQLite bazom: admin i TV
+se spajaju, timovi se prijavljuju i predaju odgovore, odigra se automatska
+runda (skraćena), admin mijenja bodove, briše tim i pitanje, a setup rute
+se učitavaju. Svaka SQL naredba čiji stack prolazi kroz jednu od tri
+datoteke (i kroz servise koje one zovu) se bilježi i za nju se radi
+EXPLAIN QUERY PLAN s istim parametrima.
+
+Upit s WHERE koji ijednu tablicu čita punim skeniranjem ("SCAN t" bez
+indeksa) je greška, kao i JOIN čija unutarnja tablica nema indeks; čitanja
+cijele tablice bez filtra (lista svih kvizova, vanjska petlja JOIN-a bez
+WHERE i sl.) su dopuštena. Privremeni B-tree za ORDER BY/GROUP BY se
+samo ispisuje.
+
+    python tests/check_query_plans.py
+"""
+import os
+import re
+import threading
+import time
+import traceback
+import warnings
+
+from bench_utils import make_bench_app, print_table
+
+TARGET_FILES = ("admin_events.py", "player_events.py", "admin_routes.py")
+TEAMS = ("Tim A", "Tim B", "Tim C")
+
+_BARE_SCAN = re.compile(r"^SCAN (\w+)$")
+_WHERE = re.compile(r"\bWHERE\b", re.IGNORECASE)
+
+
+class StatementLog:
+    """Bilježi (SQL, parametri, mjesto poziva) za naredbe pozvane iz TARGET_FILES."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.statements = {}
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        if not statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE", "WITH")):
+            return
+        caller = None
+        for frame in reversed(traceback.extract_stack()):
+            if os.path.basename(frame.filename) in TARGET_FILES:
+                caller = f"{os.path.basename(frame.filename)}:{frame.lineno} {frame.name}"
+                break
+        if caller is None:
+            return
+        if executemany and parameters:
+            parameters = parameters[0]
+        with self._lock:
+            self.statements.setdefault(statement, (parameters, set()))[1].add(caller)
+
+
+def explain(engine, statement, parameters):
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        cursor.execute("EXPLAIN QUERY PLAN " + statement, parameters or ())
+        return [row[3] for row in cursor.fetchall()]
+    finally:
+        raw.close()
+
+
+def check_plan(statement, plan):
+    """(greške, napomene) za jedan plan."""
+    errors, notes = [], []
+    filtered = bool(_WHERE.search(statement))
+    for index, detail in enumerate(plan):
+        match = _BARE_SCAN.match(detail)
+        # Bez WHERE prva (vanjska) tablica se smije čitati cijela, unutarnje ne
+        if match and (filtered or index > 0):
+            errors.append(f"full scan of {match.group(1)}")
+        elif detail.startswith("USE TEMP B-TREE"):
+            notes.append(detail.lower())
+    return errors, notes
+
+
+def drive_flows(app):
+    """Tokovi kroz admin/player evente i admin rute (kao roundtest, ali skraćeno)."""
+    from extensions import db, socketio
+    from musicquiz.models import Answer, Question
+    from musicquiz.services.round_scheduler import round_scheduler
+    from musicquiz.sockets import admin_events
+
+    admin_events.ANSWER_DISPLAY_SECONDS = 0.3
+    with app.app_context():
+        quiz_id = Question.query.first().quiz_id
+        round_questions = Question.query.filter_by(quiz_id=quiz_id, round_number=1) \
+            .order_by(Question.position).all()
+        for question in round_questions:
+            question.duration = 0.6
+        db.session.commit()
+        first_id = round_questions[0].id
+        audio = Question.query.filter_by(quiz_id=quiz_id, type="audio").order_by(Question.id).first()
+        audio_id, audio_round = audio.id, audio.round_number
+
+    web = app.test_client()
+    with web.session_transaction() as session:
+        session["logged_in"] = True
+    admin = socketio.test_client(app, flask_test_client=web)
+    admin.emit("admin_join")
+    tv = app.test_client()
+    with tv.session_transaction() as session:
+        session["screen_access"] = True
+    screen = socketio.test_client(app, flask_test_client=tv)
+    screen.emit("screen_ready")
+    admin.emit("admin_toggle_registrations", {"open": True})
+
+    players = []
+    for name in TEAMS:
+        player = socketio.test_client(app)
+        player.emit("player_join", {"name": name, "pin": "1234"})
+        players.append(player)
+    players[0].emit("player_rejoin", {"name": TEAMS[0], "pin": "1234"})
+    admin.emit("admin_get_players")
+
+    # Automatska runda: predaje tijekom prvog pitanja, ostatak se odvrti sam
+    assert round_scheduler.begin(1)
+    runner = threading.Thread(target=admin_events.run_round, args=(first_id, 1, app),
+                              kwargs={"countdown_seconds": 0})
+    runner.start()
+    time.sleep(0.2)
+    for name, player in zip(TEAMS, players):
+        player.emit("player_submit_answer", {
+            "player_name": name, "question_id": first_id,
+            "artist": "izvodjac", "title": f"pjesma {name}", "extra": "", "choice": 1,
+        })
+    runner.join(30)
+    assert not runner.is_alive(), "runda nije završila"
+
+    # Pojedinačno puštanje, ručni bodovi, grading i provjera ledgera
+    admin.emit("admin_play_song", {"id": audio_id})
+    players[1].emit("player_submit_answer", {
+        "player_name": TEAMS[1], "question_id": audio_id, "artist": "x", "title": "y",
+    })
+    with app.app_context():
+        compiled = admin_events.round_payloads.get(quiz_id, audio_round)
+        admin_events.lock_question(compiled.get(audio_id), audio_round)
+        answer_id = Answer.query.order_by(Answer.id).first().id
+    admin.emit("admin_update_score", {"answer_id": answer_id, "type": "artist", "value": 1.0})
+    admin.emit("admin_request_grading", {"round": 1})
+    admin.emit("admin_get_grading_data")
+    admin.emit("admin_verify_scores", {})
+    admin.emit("admin_finalize_round", {"round": 1})
+    admin.emit("admin_lock_player", {"player_name": TEAMS[2]})
+    admin.emit("request_quiz_state")
+
+    # Admin rute
+    web.get("/admin/setup")
+    web.get("/admin/live")
+    web.post("/admin/api/update_score", json={"answer_id": answer_id, "type": "title", "value": 0.5})
+    with app.app_context():
+        song = Question.query.get(audio_id).song
+        song_fields = {"artist": song.artist, "title": song.title, "start": song.start_time}
+        round_ids = [q.id for q in Question.query.filter_by(quiz_id=quiz_id, round_number=2)
+                     .order_by(Question.position.desc()).all()]
+    web.post("/admin/update_song", json={"id": audio_id, "duration": 30, **song_fields})
+    web.post("/admin/reorder_songs", json={"ids": round_ids})
+    web.post("/admin/remove_song", json={"id": round_ids[0]})
+    web.post("/admin/switch_quiz", json={"id": quiz_id})
+
+    admin.emit("admin_delete_player", {"player_name": TEAMS[2]})
+    for client in (*players, screen, admin):
+        client.disconnect()
+
+
+def main():
+    warnings.filterwarnings("ignore", message=".*Query.get.*")
+    app = make_bench_app()
+    from sqlalchemy import event
+
+    from check_query_counts import seed_mixed_quiz
+    from extensions import db
+
+    with app.app_context():
+        seed_mixed_quiz(20)
+        engine = db.engine
+
+    log = StatementLog()
+    event.listen(engine, "before_cursor_execute", log)
+    try:
+        drive_flows(app)
+    finally:
+        event.remove(engine, "before_cursor_execute", log)
+
+    rows, failures, notes = [], [], []
+    for statement, (parameters, callers) in sorted(log.statements.items(), key=lambda item: sorted(item[1][1])[0]):
+        plan = explain(engine, statement, parameters)
+        errors, plan_notes = check_plan(statement, plan)
+        caller = sorted(callers)[0]
+        uses = "; ".join(detail for detail in plan if detail.startswith(("SEARCH", "SCAN")))
+        rows.append((caller[:48], "FAIL" if errors else "ok", uses[:90]))
+        if errors:
+            failures.append((caller, statement, plan))
+        if plan_notes:
+            notes.append((caller, ", ".join(plan_notes)))
+
+    print_table(("caller", "plan", "tables"), rows)
+    if notes:
+        print("\nTemp B-tree (sortiranje bez indeksa):")
+        for caller, note in notes:
+            print(f"  {caller}: {note}")
+    if failures:
+        print()
+        for caller, statement, plan in failures:
+            print(f"FAIL {caller}\n  {' '.join(statement.split())}\n  " + "\n  ".join(plan))
+    assert not failures, f"{len(failures)} upita bez indeksa"
+    print(f"\nOK: {len(rows)} upita, svi filtrirani upiti koriste indeks")
+
+
+if __name__ == "__main__":
+    main()
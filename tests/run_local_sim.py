@@ -1,116 +1,567 @@
+"""
+Load test: N simuliranih timova kroz cijelu automatsku rundu na lokalnom serveru.
+
+Jedan admin, jedan TV ekran i N timova (svaki svoj Socket.IO klijent) se
+spajaju na server. Admin otvara prijave i pokreće rundu kroz
+admin_start_auto_run, a timovi odgovaraju kao na pravoj večeri: vrijeme
+razmišljanja po log-normalnoj razdiobi, dio odgovora s tipfelerima ili
+krivih, dio timova se predomisli, a dio izgubi vezu usred pitanja i vrati
+se kroz player_rejoin.
+
+Na kraju se ispisuju p50/p95/p99 latencije (ms, mjereno na klijentu):
+
+- join               player_join -> join_success
+- submit-ack         player_submit_answer -> answer_ack
+- player_show_answer player_lock_input -> player_show_answer
+- leaderboard        player_lock_input -> prvi sljedeći leaderboard_patch
+- rejoin             player_rejoin -> player_unlock_input (resume)
+
+Pitanja i točne odgovore skripta čita iz iste baze kao server (DATABASE_URL),
+pa se pokreće na istom računalu, iz korijena repozitorija. Admin klijent
+se prijavljuje launcher tokenom (MQ_LAUNCHER_TOKEN, isti za oba procesa):
+
+    MQ_LAUNCHER_TOKEN=sim python app.py                                        # server
+    MQ_LAUNCHER_TOKEN=sim python tests/run_local_sim.py --teams 200 --prepare  # drugi terminal
+
+--prepare kreira (ili ponovno koristi) kviz "Load Sim Quiz" s kratkim
+pitanjima i postavlja ga kao aktivni - samo nad testnom bazom, ne nad kviz.db
+prave večeri. Bez --prepare koristi se zadana runda aktivnog kviza.
+"""
+import argparse
+import json
+import math
+import os
+import random
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+
 import socketio
 
-SERVER = 'http://127.0.0.1:5000'
-CONNECT_TIMEOUT = 5
+from bench_utils import print_table
 
-# create three clients
-admin = socketio.Client(logger=True, engineio_logger=True)
-screen = socketio.Client(logger=True, engineio_logger=True)
-player = socketio.Client(logger=True, engineio_logger=True)
+SERVER = "http://127.0.0.1:5000"
+CONNECT_TIMEOUT = 10
+EVENT_TIMEOUT = 10
+SIM_QUIZ_TITLE = "Load Sim Quiz"
+SIM_QUESTION_KINDS = ("audio", "text", "text_multiple", "simultaneous")
+METRICS = ("join", "submit-ack", "player_show_answer", "leaderboard", "rejoin")
 
-@screen.event
-def connect_screen():
-    print('[SCREEN] connected')
 
-@screen.on('tv_start_timer')
-def on_tv_start(d):
-    print('[SCREEN] tv_start_timer', d)
+# ---------------------------
+# PITANJA RUNDE (iz baze servera)
+# ---------------------------
 
-@screen.on('screen_show_answers')
-def on_answers(d):
-    print('[SCREEN] screen_show_answers', d)
+def _db_app():
+    """Flask app samo za čitanje baze - bez socketa i pozadinskih dretvi servera."""
+    from flask import Flask
 
-@screen.on('update_leaderboard')
-def on_lb(d):
-    print('[SCREEN] leaderboard', d)
+    from config import Config
+    from extensions import db
 
-@player.event
-def connect_player():
-    print('[PLAYER] connected')
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    db.init_app(app)
+    return app
 
-@player.on('player_unlock_input')
-def on_unlock(d):
-    print('[PLAYER] unlocked for question', d)
-    # submit an answer after a short delay
-    time.sleep(1)
-    player.emit('player_submit_answer', {
-        'player_name': 'TeamA',
-        'question_id': d.get('question_id'),
-        'artist': 'CorrectArtist',
-        'title': 'WrongTitle'
-    })
-    # second player
-    player.emit('player_submit_answer', {
-        'player_name': 'TeamB',
-        'question_id': d.get('question_id'),
-        'artist': 'WrongArtist',
-        'title': 'CorrectTitle'
-    })
 
-@player.on('player_lock_input')
-def on_lock():
-    print('[PLAYER] locked')
+def prepare_quiz(round_num, n_questions, duration):
+    """Aktivni "Load Sim Quiz" sa n_questions kratkih pitanja u rundi round_num."""
+    from extensions import db
+    from musicquiz.models import Question, Quiz, SimultaneousQuestion, Song, TextMultiple, TextQuestion
 
-@admin.event
-def connect_admin():
-    print('[ADMIN] connected')
+    quiz = Quiz.query.filter_by(title=SIM_QUIZ_TITLE).first()
+    if quiz is None:
+        quiz = Quiz(title=SIM_QUIZ_TITLE)
+        db.session.add(quiz)
+        db.session.flush()
+    Quiz.query.filter(Quiz.id != quiz.id).update({"is_active": False})
+    quiz.is_active = True
 
+    existing = Question.query.filter_by(quiz_id=quiz.id, round_number=round_num).count()
+    for i in range(existing, n_questions):
+        kind = SIM_QUESTION_KINDS[i % len(SIM_QUESTION_KINDS)]
+        question = Question(quiz_id=quiz.id, round_number=round_num, position=i + 1, type=kind, duration=duration)
+        db.session.add(question)
+        db.session.flush()
+        if kind == "audio":
+            db.session.add(Song(question_id=question.id, filename=f"sim_{i}.mp3",
+                                artist=f"Izvodjac Broj {i}", title=f"Pjesma Za Test {i}"))
+        elif kind == "text":
+            db.session.add(TextQuestion(question_id=question.id, question_text=f"Pitanje {i}?",
+                                        answer_text=f"Odgovor {i}"))
+        elif kind == "text_multiple":
+            row = TextMultiple(question_id=question.id, question_text=f"Izbor {i}?", correct_index=i % 3)
+            row.set_choices(["Prvi", "Drugi", "Treci"])
+            db.session.add(row)
+        else:
+            db.session.add(SimultaneousQuestion(
+                question_id=question.id, filename=f"sim_{i}.mp3",
+                artist=f"Izvodjac Broj {i}", title=f"Pjesma Za Test {i}",
+                extra_question="Godina?", extra_answer=str(1970 + i),
+            ))
+    db.session.commit()
 
-@admin.event
-def connect_error_admin(data):
-    print('[ADMIN] connect_error', data)
 
+def load_round(round_num, prepare=False, n_questions=5, duration=10.0):
+    """[{id, type, duration, artist, title, extra, choice, n_choices}] po poziciji."""
+    from musicquiz.services.question_repository import questions_for_round
+    from musicquiz.services.question_service import get_question_answer_key
+    from musicquiz.services.quiz_service import get_active_quiz
 
-@screen.event
-def connect_error_screen(data):
-    print('[SCREEN] connect_error', data)
+    with _db_app().app_context():
+        if prepare:
+            prepare_quiz(round_num, n_questions, duration)
+        quiz = get_active_quiz()
+        if quiz is None:
+            raise SystemExit("Nema aktivnog kviza (pokreni s --prepare nad testnom bazom)")
+        questions = []
+        for question in questions_for_round(quiz.id, round_num):
+            key = get_question_answer_key(question)
+            choices = question.text_multiple.get_choices() if question.text_multiple else []
+            questions.append({
+                "id": question.id,
+                "type": question.type or "audio",
+                "duration": float(question.duration or 30.0),
+                "artist": key.get("artist") or "",
+                "title": key.get("title") or "",
+                "extra": key.get("extra") or "",
+                "choice": int(question.text_multiple.correct_index or 0) if question.text_multiple else -1,
+                "n_choices": len(choices),
+            })
+    if not questions:
+        raise SystemExit(f"Runda {round_num} aktivnog kviza nema pitanja")
+    return questions
 
 
-@player.event
-def connect_error_player(data):
-    print('[PLAYER] connect_error', data)
+# ---------------------------
+# ODGOVORI
+# ---------------------------
 
+def typo(rng, text):
+    """Jedna ili dvije tipkarske greške i mala slova, kao s mobitela."""
+    text = text.lower()
+    for _ in range(rng.choice((1, 1, 2))):
+        if len(text) < 3:
+            break
+        i = rng.randrange(1, len(text) - 1)
+        kind = rng.random()
+        if kind < 0.3:
+            text = text[:i] + text[i + 1:]
+        elif kind < 0.6:
+            text = text[:i] + text[i + 1] + text[i] + text[i + 2:]
+        elif kind < 0.8:
+            text = text[:i] + rng.choice("aeioukrnst") + text[i + 1:]
+        else:
+            text = text[:i] + rng.choice("aeioukrnst") + text[i:]
+    return text
 
-def connect_client(name, client):
-    try:
-        client.connect(SERVER, wait=True, wait_timeout=CONNECT_TIMEOUT)
-        print(f'{name} connected')
-    except Exception as e:
-        print(f'{name} connect error', e)
 
+class AnswerProfile:
+    """Udio točnih, tipfelera i krivih odgovora po polju."""
+
+    def __init__(self, typo_ratio, wrong_ratio):
+        self.typo_ratio = typo_ratio
+        self.wrong_ratio = wrong_ratio
+
+    def guess(self, rng, correct):
+        if not correct:
+            return ""
+        roll = rng.random()
+        if roll < self.wrong_ratio:
+            return rng.choice(("ne znam", "nemam pojma", "queen", "abba"))
+        if roll < self.wrong_ratio + self.typo_ratio:
+            return typo(rng, correct)
+        return correct
+
+    def answer(self, rng, question):
+        """Payload player_submit_answer bez player_name/question_id."""
+        if question["type"] == "text_multiple":
+            if rng.random() < self.wrong_ratio + self.typo_ratio or question["choice"] < 0:
+                return {"choice": rng.randrange(max(1, question["n_choices"]))}
+            return {"choice": question["choice"]}
+        data = {"title": self.guess(rng, question["title"])}
+        if question["type"] in ("audio", "video", "simultaneous"):
+            data["artist"] = self.guess(rng, question["artist"])
+        if question["type"] == "simultaneous":
+            data["extra"] = self.guess(rng, question["extra"])
+        return data
+
+
+# ---------------------------
+# MJERENJA
+# ---------------------------
+
+class Latencies:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._samples = {metric: [] for metric in METRICS}
+        self.counters = {}
+
+    def add(self, metric, seconds):
+        with self._lock:
+            self._samples.setdefault(metric, []).append(seconds * 1000.0)
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    @staticmethod
+    def percentile(values, p):
+        """Nearest-rank percentil nad sortiranom listom."""
+        if not values:
+            return None
+        rank = max(1, math.ceil(p / 100.0 * len(values)))
+        return values[rank - 1]
+
+    def summary(self):
+        with self._lock:
+            samples = {metric: sorted(values) for metric, values in self._samples.items()}
+            counters = dict(self.counters)
+        metrics = {}
+        for metric, values in samples.items():
+            metrics[metric] = {
+                "n": len(values),
+                "p50": self.percentile(values, 50),
+                "p95": self.percentile(values, 95),
+                "p99": self.percentile(values, 99),
+                "max": values[-1] if values else None,
+            }
+        return {"metrics": metrics, "counters": counters}
+
+
+# ---------------------------
+# SIMULIRANI TIM
+# ---------------------------
+
+class SimTeam:
+    def __init__(self, index, sim):
+        self.sim = sim
+        self.name = f"Sim {index:03d}"
+        self.pin = f"{index % 10000:04d}"
+        self.rng = random.Random(sim.args.seed * 100003 + index)
+        self.client = socketio.Client(reconnection=False)
+        self._lock = threading.Lock()
+        self._joined = threading.Event()
+        # Očišćen dok traje ponovno spajanje - predaja čeka novi socket
+        self._online = threading.Event()
+        self._online.set()
+        self._sent_at = {}
+        self._join_sent = None
+        self._rejoin_sent = None
+        self._lock_at = None
+        self._leaderboard_pending = False
+        self._question_id = None
+        self._register_handlers()
+
+    def _register_handlers(self):
+        client = self.client
+        client.on("join_success", self._on_join_success)
+        client.on("join_error", self._on_join_error)
+        client.on("player_unlock_input", self._on_unlock)
+        client.on("answer_ack", self._on_answer_ack)
+        client.on("player_lock_input", self._on_lock)
+        client.on("player_show_answer", self._on_show_answer)
+        client.on("leaderboard_patch", self._on_leaderboard_patch)
+        client.on("player_show_round_summary", self._on_round_summary)
+
+    def _connect(self):
+        self.client.connect(self.sim.args.server, transports=["websocket"], wait_timeout=CONNECT_TIMEOUT)
+
+    def emit(self, event, data):
+        try:
+            self.client.emit(event, data)
+            return True
+        except Exception:
+            self.sim.stats.count("emit_errors")
+            return False
+
+    # --- prijava ---
+
+    def join(self):
+        try:
+            self._connect()
+        except Exception as e:
+            self.sim.stats.count("connect_errors")
+            print(f"[{self.name}] connect error: {e}")
+            return False
+        self._join_sent = time.perf_counter()
+        self.emit("player_join", {"name": self.name, "pin": self.pin})
+        if not self._joined.wait(EVENT_TIMEOUT):
+            self.sim.stats.count("join_timeouts")
+            return False
+        return True
+
+    def _on_join_success(self, data):
+        self.sim.stats.add("join", time.perf_counter() - self._join_sent)
+        self.sim.stats.count("joined")
+        self._joined.set()
+
+    def _on_join_error(self, data):
+        self.sim.stats.count("join_errors")
+        print(f"[{self.name}] join_error: {(data or {}).get('msg')}")
+
+    def rejoin(self):
+        """Prekid veze usred pitanja: novi socket i player_rejoin kao na mobitelu."""
+        self._online.clear()
+        try:
+            self.client.disconnect()
+            self._connect()
+        except Exception as e:
+            self.sim.stats.count("connect_errors")
+            print(f"[{self.name}] reconnect error: {e}")
+            return
+        finally:
+            self._online.set()
+        self.sim.stats.count("reconnects")
+        self._rejoin_sent = time.perf_counter()
+        self.emit("player_rejoin", {"name": self.name, "pin": self.pin})
+
+    # --- pitanje ---
+
+    def _on_unlock(self, data):
+        question_id = data.get("question_id")
+        if data.get("resume"):
+            if self._rejoin_sent is not None:
+                self.sim.stats.add("rejoin", time.perf_counter() - self._rejoin_sent)
+                self._rejoin_sent = None
+            if question_id == self._question_id:
+                return
+        self._question_id = question_id
+        with self._lock:
+            self._lock_at = None
+            self._leaderboard_pending = False
+        question = self.sim.questions_by_id.get(question_id)
+        if question is None:
+            return
+        self.sim.plan_question(self, question, float(data.get("question_duration") or question["duration"]))
 
-def run():
-    print('Connecting clients...')
-    connect_client('screen', screen)
-    connect_client('player', player)
-    connect_client('admin', admin)
+    def submit(self, question):
+        self._online.wait(EVENT_TIMEOUT)
+        if self._question_id != question["id"]:
+            return
+        payload = self.sim.profile.answer(self.rng, question)
+        payload.update({"player_name": self.name, "question_id": question["id"]})
+        with self._lock:
+            self._sent_at.setdefault(question["id"], []).append(time.perf_counter())
+        if self.emit("player_submit_answer", payload):
+            self.sim.stats.count("submits")
 
-    time.sleep(1)
+    def _on_answer_ack(self, data):
+        with self._lock:
+            pending = self._sent_at.get(data.get("question_id")) or []
+            sent = pending.pop(0) if pending else None
+        if sent is None:
+            return
+        self.sim.stats.add("submit-ack", time.perf_counter() - sent)
+        if not data.get("accepted"):
+            self.sim.stats.count("rejected")
 
-    # find question id via a quick REST call? Instead, request server for questions isn't available.
-    # Hardcode id assuming setup_db printed it; use 1 as common case.
-    question_id = None
+    def _on_lock(self, data=None):
+        with self._lock:
+            self._lock_at = time.perf_counter()
+            self._leaderboard_pending = True
+
+    def _on_show_answer(self, data):
+        with self._lock:
+            lock_at = self._lock_at
+        if lock_at is not None:
+            self.sim.stats.add("player_show_answer", time.perf_counter() - lock_at)
+
+    def _on_leaderboard_patch(self, data):
+        with self._lock:
+            if not self._leaderboard_pending:
+                return
+            self._leaderboard_pending = False
+            lock_at = self._lock_at
+        self.sim.stats.add("leaderboard", time.perf_counter() - lock_at)
+
+    def _on_round_summary(self, data):
+        self.sim.stats.count("round_summaries")
+
+    def disconnect(self):
+        try:
+            self.client.disconnect()
+        except Exception:
+            pass
+
+
+# ---------------------------
+# SIMULACIJA
+# ---------------------------
+
+class Simulation:
+    def __init__(self, args, questions):
+        self.args = args
+        self.questions = questions
+        self.questions_by_id = {question["id"]: question for question in questions}
+        self.profile = AnswerProfile(args.typo_ratio, args.wrong_ratio)
+        self.stats = Latencies()
+        self.rng = random.Random(args.seed)
+        self.round_done = threading.Event()
+        self.teams = [SimTeam(i + 1, self) for i in range(args.teams)]
+        self.admin = socketio.Client(reconnection=False)
+        self.screen = socketio.Client(reconnection=False)
+        self._phase = None
+        self._admin_ack = threading.Event()
+        self._auto_run_ack = threading.Event()
+        self._register_admin()
+
+    def _register_admin(self):
+        @self.admin.on("admin_join_ack")
+        def on_admin_join_ack(data):
+            if not (data or {}).get("ok"):
+                print("[ADMIN] server ne prihvaća admina (postavi isti MQ_LAUNCHER_TOKEN serveru i simulaciji)")
+            self._admin_ack.set()
+
+        @self.admin.on("admin_auto_run_ack")
+        def on_auto_run_ack(data):
+            print(f"[ADMIN] auto run: {data.get('status')}")
+            self._auto_run_ack.set()
+
+        @self.admin.on("quiz_phase")
+        def on_quiz_phase(data):
+            self._on_phase(data)
+
+        @self.admin.on("admin_round_finished")
+        def on_round_finished(data):
+            self.round_done.set()
+
+    def _on_phase(self, phase):
+        state = phase.get("state")
+        key = (state, phase.get("question_id"), phase.get("deadline"))
+        self._phase = key
+        if state == "countdown" and self.args.skip_countdown:
+            self.admin.emit("admin_skip_phase")
+        elif state == "answer" and self.args.answer_seconds is not None:
+            timer = threading.Timer(self.args.answer_seconds, self._skip_if_phase, args=(key,))
+            timer.daemon = True
+            timer.start()
+
+    def _skip_if_phase(self, key):
+        # Prikaz odgovora je još isti - inače bi skip prekinuo sljedeće pitanje
+        if self._phase == key:
+            self.admin.emit("admin_skip_phase")
+
+    def plan_question(self, team, question, duration):
+        """Vrijeme razmišljanja, eventualna promjena odgovora i prekid veze za jedan tim."""
+        args = self.args
+        rng = team.rng
+        if rng.random() < args.no_answer_ratio:
+            return
+        latest = max(0.2, duration - 0.5)
+        think = min(latest, max(0.2, rng.lognormvariate(math.log(duration * args.think_median), args.think_sigma)))
+        self._later(think, team.submit, question)
+        if rng.random() < args.change_ratio:
+            self._later(rng.uniform(think, latest), team.submit, question)
+        if rng.random() < args.reconnect_ratio:
+            self._later(rng.uniform(0.1, think), team.rejoin)
+
+    @staticmethod
+    def _later(delay, fn, *fn_args):
+        timer = threading.Timer(delay, fn, args=fn_args)
+        timer.daemon = True
+        timer.start()
+
+    def connect_control(self):
+        self.admin.connect(self.args.server, transports=["websocket"], wait_timeout=CONNECT_TIMEOUT,
+                           auth={"launcher_token": self.args.launcher_token})
+        self.admin.emit("admin_join")
+        if not self._admin_ack.wait(EVENT_TIMEOUT):
+            raise SystemExit("admin_join_ack nije stigao")
+        self.admin.emit("admin_toggle_registrations", {"open": True})
+        # Soba "screens" traži ključ ekrana ili admina; ekran simulacije koristi isti launcher token
+        self.screen.connect(self.args.server, transports=["websocket"], wait_timeout=CONNECT_TIMEOUT,
+                            auth={"launcher_token": self.args.launcher_token})
+        self.screen.emit("screen_ready")
+
+    def join_teams(self):
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.args.connect_concurrency) as pool:
+            joined = sum(1 for ok in pool.map(lambda team: team.join(), self.teams) if ok)
+        print(f"Joined {joined}/{len(self.teams)} teams in {time.perf_counter() - start:.1f}s")
+
+    def run_round(self):
+        first = self.questions[0]
+        self.admin.emit("admin_start_auto_run", {"id": first["id"], "round": self.args.round})
+        if not self._auto_run_ack.wait(EVENT_TIMEOUT):
+            raise SystemExit("admin_auto_run_ack nije stigao")
+        answer_seconds = self.args.answer_seconds if self.args.answer_seconds is not None else 15.0
+        budget = 30.0 + sum(q["duration"] + answer_seconds for q in self.questions) + 30.0
+        started = time.perf_counter()
+        if not self.round_done.wait(budget):
+            print(f"Runda nije završila u {budget:.0f}s")
+        else:
+            print(f"Round finished in {time.perf_counter() - started:.1f}s")
+        # Osobni sažeci runde stižu odmah nakon admin_round_finished
+        time.sleep(1.0)
+
+    def close(self):
+        with ThreadPoolExecutor(max_workers=self.args.connect_concurrency) as pool:
+            list(pool.map(lambda team: team.disconnect(), self.teams))
+        for client in (self.screen, self.admin):
+            try:
+                client.disconnect()
+            except Exception:
+                pass
+
+
+def _fmt(value):
+    return "-" if value is None else f"{value:.1f}"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Load test automatske runde sa simuliranim timovima")
+    parser.add_argument("--server", default=SERVER)
+    parser.add_argument("--launcher-token", default=os.getenv("MQ_LAUNCHER_TOKEN", ""),
+                        help="admin token servera (zadano MQ_LAUNCHER_TOKEN)")
+    parser.add_argument("--teams", type=int, default=200)
+    parser.add_argument("--round", type=int, default=1)
+    parser.add_argument("--prepare", action="store_true", help="kreiraj/aktiviraj Load Sim Quiz (testna baza)")
+    parser.add_argument("--questions", type=int, default=5, help="broj pitanja uz --prepare")
+    parser.add_argument("--duration", type=float, default=10.0, help="trajanje pitanja (s) uz --prepare")
+    parser.add_argument("--skip-countdown", action="store_true", help="admin preskače odbrojavanje prije runde")
+    parser.add_argument("--answer-seconds", type=float, default=None,
+                        help="prikaz odgovora traje ovoliko (admin_skip_phase) umjesto punog trajanja")
+    parser.add_argument("--think-median", type=float, default=0.4, help="medijan razmišljanja (udio trajanja)")
+    parser.add_argument("--think-sigma", type=float, default=0.6)
+    parser.add_argument("--typo-ratio", type=float, default=0.3)
+    parser.add_argument("--wrong-ratio", type=float, default=0.15)
+    parser.add_argument("--no-answer-ratio", type=float, default=0.05)
+    parser.add_argument("--change-ratio", type=float, default=0.1, help="udio timova koji promijene odgovor")
+    parser.add_argument("--reconnect-ratio", type=float, default=0.05, help="udio timova koji izgube vezu po pitanju")
+    parser.add_argument("--connect-concurrency", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="spremi rezultate u JSON datoteku")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    questions = load_round(args.round, prepare=args.prepare, n_questions=args.questions, duration=args.duration)
+    print(f"Round {args.round}: {len(questions)} questions, {args.teams} teams -> {args.server}")
+
+    sim = Simulation(args, questions)
     try:
-        # try to fetch via simple socket request to admin_get_players (dummy) then read db not possible
-        pass
-    except Exception:
-        pass
-
-    # fallback: request admin to play seeded question id 3 (created by setup_db)
-    question_id = 3
-    print(f'Admin emitting admin_play_song for id={question_id}')
-    if admin.connected:
-        admin.emit('admin_play_song', {'id': question_id})
-    else:
-        print('Admin client not connected. Skipping admin_play_song emit.')
-
-    # wait long enough for timer, grading and finalization
-    time.sleep(20)
-
-    screen.disconnect()
-    player.disconnect()
-    admin.disconnect()
-
-if __name__ == '__main__':
-    run()
+        sim.connect_control()
+        sim.join_teams()
+        sim.run_round()
+    finally:
+        sim.close()
+
+    summary = sim.stats.summary()
+    rows = [
+        (metric, values["n"], _fmt(values["p50"]), _fmt(values["p95"]), _fmt(values["p99"]), _fmt(values["max"]))
+        for metric, values in summary["metrics"].items()
+    ]
+    print_table(("metric", "n", "p50 ms", "p95 ms", "p99 ms", "max ms"), rows)
+    print("counters:", ", ".join(f"{name}={value}" for name, value in sorted(summary["counters"].items())))
+
+    if args.json:
+        summary["config"] = {key: value for key, value in vars(args).items() if key != "json"}
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
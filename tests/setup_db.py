@@ -18,10 +18,10 @@ with app.app_context():
         db.session.commit()
 
     # Create players
-    if not Player.query.filter_by(name='TeamA').first():
-        db.session.add(Player(name='TeamA', pin='0000'))
-    if not Player.query.filter_by(name='TeamB').first():
-        db.session.add(Player(name='TeamB', pin='0001'))
+    if not Player.query.filter_by(quiz_id=q.id, name='TeamA').first():
+        db.session.add(Player(quiz_id=q.id, name='TeamA', pin='0000'))
+    if not Player.query.filter_by(quiz_id=q.id, name='TeamB').first():
+        db.session.add(Player(quiz_id=q.id, name='TeamB', pin='0001'))
 
     db.session.commit()
 
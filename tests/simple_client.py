@@ -1,3 +1,4 @@
+import os
 import time
 import socketio
 
@@ -22,7 +23,7 @@ def on_status(d):
 
 print('connecting')
 try:
-    cli.connect(SERVER)
+    cli.connect(SERVER, auth={'launcher_token': os.getenv('MQ_LAUNCHER_TOKEN', '')})
     print('connected ok')
     time.sleep(1)
     print('emit admin_play_song id=3')